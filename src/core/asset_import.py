@@ -0,0 +1,196 @@
+"""Importing asset files into a project.
+
+This module provides the AssetImporter class, which validates, hashes and
+copies files into a project's content-addressed asset store on a pool of
+worker threads. Each file is stored once under a name derived from a hash
+of its contents, so importing the same image twice, or an animation whose
+frames repeat, does not copy the same bytes again.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+# The file extensions of the images that can be imported.
+SUPPORTED_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+
+# The content-addressed asset store, relative to the project directory.
+CONTENT_DIR = os.path.join("Assets", "Content")
+
+
+@dataclass
+class ImportedFile:
+    """Describes a file that was imported into the asset store.
+
+    Attributes:
+        source (str): The path the file was imported from.
+        file_path (str): The path of the stored file, relative to the
+            project directory.
+        reused (bool): True if the store already held a file with the same
+            contents, so nothing was copied.
+    """
+
+    source: str
+    file_path: str
+    reused: bool = False
+
+
+def is_supported_image_file(path: str) -> bool:
+    """Checks if a file is a supported image type based on its extension.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        bool: True if the file is a supported image, False otherwise.
+    """
+    return path.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)
+
+
+def new_asset_id(data, prefix: str) -> str:
+    """Creates an asset ID that is not used by any asset yet.
+
+    Args:
+        data (ProjectData): The project data.
+        prefix (str): The start of the ID, e.g. "asset".
+
+    Returns:
+        str: The new ID.
+    """
+    number = len(data.assets)
+    while data.get_by_id("assets", f"{prefix}_{number}") is not None:
+        number += 1
+    return f"{prefix}_{number}"
+
+
+class AssetImporter:
+    """Copies files into a project's content-addressed asset store.
+
+    Attributes:
+        project_path (str): The path of the project directory.
+        workers (int): The number of worker threads.
+    """
+
+    def __init__(self, project_path: str, workers: int = None):
+        """Initializes a new AssetImporter instance.
+
+        Args:
+            project_path (str): The path of the project directory.
+            workers (int, optional): The number of worker threads. Defaults
+                to the number of CPUs, up to eight.
+        """
+        self.project_path = project_path
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self._lock = threading.Lock()
+        self._stored = {}
+
+    def import_files(
+        self, sources: list, progress: callable = None, cancelled: callable = None
+    ) -> tuple:
+        """Imports files, several at a time.
+
+        This blocks until every file has been imported, so it should be
+        called from a worker thread when importing from the UI.
+
+        Args:
+            sources (list[str]): The paths of the files to import.
+            progress (callable, optional): Called with the number of files
+                processed so far and the total number of files, from the
+                worker threads. Defaults to None.
+            cancelled (callable, optional): Returns True if the import should
+                stop. Files that have not been started yet are skipped.
+                Defaults to None.
+
+        Returns:
+            tuple: A list with an ImportedFile, or None, for each source in
+            order, and a list of error messages for the files that could not
+            be imported.
+        """
+        total = len(sources)
+        done = 0
+        errors = []
+
+        def run(source):
+            nonlocal done
+            result = None
+            if cancelled is None or not cancelled():
+                try:
+                    result = self.import_file(source)
+                except (OSError, ValueError) as e:
+                    with self._lock:
+                        errors.append(f"{os.path.basename(source)}: {e}")
+            with self._lock:
+                done += 1
+                count = done
+            if progress:
+                progress(count, total)
+            return result
+
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="advengine-import"
+        ) as executor:
+            imported = list(executor.map(run, sources))
+        return imported, errors
+
+    def import_file(self, source: str) -> ImportedFile:
+        """Imports a single file.
+
+        Args:
+            source (str): The path of the file to import.
+
+        Returns:
+            ImportedFile: The stored file.
+
+        Raises:
+            ValueError: If the file is not a supported image.
+            OSError: If the file cannot be read or copied.
+        """
+        if not is_supported_image_file(source):
+            raise ValueError("Unsupported file type")
+        digest = self._hash_file(source)
+        extension = os.path.splitext(source)[1].lower()
+        file_path = os.path.join(CONTENT_DIR, digest[:2], digest + extension)
+        destination = os.path.join(self.project_path, file_path)
+
+        with self._lock:
+            # Identical files in the same import are copied only once.
+            copying = self._stored.get(file_path)
+            if copying is None:
+                copying = threading.Event()
+                self._stored[file_path] = copying
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            copying.wait()
+            if not os.path.exists(destination):
+                raise OSError(f"Failed to store {os.path.basename(source)}")
+            return ImportedFile(source, file_path, reused=True)
+
+        try:
+            if os.path.exists(destination):
+                return ImportedFile(source, file_path, reused=True)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            temp_path = f"{destination}.{threading.get_ident()}.tmp"
+            try:
+                shutil.copyfile(source, temp_path)
+                os.replace(temp_path, destination)
+            except OSError:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            return ImportedFile(source, file_path)
+        finally:
+            copying.set()
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        """Returns a hash of a file's contents."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
@@ -0,0 +1,396 @@
+"""Micro-benchmarks for the project data pipeline.
+
+Each benchmark builds synthetic project data in memory, so no project is
+needed. Run them from the directory that contains the advengine package:
+
+    python3 -m advengine.core.benchmarks codecs --graphs 200 --nodes 500
+    python3 -m advengine.core.benchmarks csv --rows 200000
+    python3 -m advengine.core.benchmarks export --graphs 200 --nodes 500
+    python3 -m advengine.core.benchmarks bundle --graphs 200 --nodes 500
+
+The bundle benchmark also checks that every record read back from a
+binary bundle matches the JSON export.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from dataclasses import asdict
+from types import SimpleNamespace
+
+from .bundle_reader import BundleReader
+from .schema_codec import decode, decode_csv, encode, encode_row, field_names
+from .schemas import (
+    ActionNode,
+    Attribute,
+    Character,
+    ConditionNode,
+    DialogueNode,
+    Interaction,
+    Item,
+    LogicGraph,
+    LogicNode,
+    ProjectData,
+)
+from .ue_exporter import BUNDLE_PATH, ExportOptions, export_project
+
+
+def _best_time(function: callable, repeat: int) -> float:
+    """Returns the fastest of several timed calls of a function, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_graphs(graph_count: int, nodes_per_graph: int) -> list:
+    """Builds logic graphs with a realistic mix of connected nodes.
+
+    Args:
+        graph_count (int): The number of graphs to build.
+        nodes_per_graph (int): The number of nodes in each graph.
+
+    Returns:
+        list[LogicGraph]: The graphs.
+    """
+    graphs = []
+    for g in range(graph_count):
+        graph = LogicGraph(id=f"graph_{g}", name=f"Graph {g}")
+        previous = None
+        for n in range(nodes_per_graph):
+            node_id = f"g{g}_n{n}"
+            kind = n % 3
+            if kind == 0:
+                node = DialogueNode(
+                    id=node_id,
+                    node_type="Dialogue",
+                    x=n * 40,
+                    y=n * 25,
+                    character_id="narrator",
+                    dialogue_text=f"Line {n} of graph {g}.",
+                )
+            elif kind == 1:
+                node = ConditionNode(
+                    id=node_id,
+                    node_type="Condition",
+                    x=n * 40,
+                    y=n * 25,
+                    condition_type="HAS_ITEM",
+                    parameters={"ItemID": f"item_{n}", "Amount": 1},
+                )
+            else:
+                node = ActionNode(
+                    id=node_id,
+                    node_type="Action",
+                    x=n * 40,
+                    y=n * 25,
+                    action_command="SET_VARIABLE",
+                    parameters={"VarName": f"var_{n}", "Value": "True"},
+                )
+            graph.add_node(node)
+            if previous is not None:
+                graph.connect(previous, node)
+            previous = node
+        graphs.append(graph)
+    return graphs
+
+
+def benchmark_codecs(graph_count: int = 200, nodes_per_graph: int = 500, repeat=3):
+    """Compares the schema codecs with `dataclasses.asdict`.
+
+    Args:
+        graph_count (int, optional): The number of graphs. Defaults to 200.
+        nodes_per_graph (int, optional): The number of nodes in each graph.
+            Defaults to 500.
+        repeat (int, optional): The number of timed runs; the fastest is
+            reported. Defaults to 3.
+
+    Returns:
+        dict: The timings in seconds, keyed by operation.
+    """
+    graphs = make_graphs(graph_count, nodes_per_graph)
+    encoded = [encode(graph) for graph in graphs]
+    if encoded != [asdict(graph) for graph in graphs]:
+        raise AssertionError("encode() and asdict() disagree")
+    text = json.dumps(encoded)
+
+    def decode_with_constructors():
+        # The per-node dispatch the graph loader used before the codecs.
+        classes = {
+            "Dialogue": DialogueNode,
+            "Condition": ConditionNode,
+            "Action": ActionNode,
+        }
+        for data in json.loads(text):
+            nodes = []
+            for node_data in data["nodes"]:
+                node_class = classes.get(node_data["node_type"], LogicNode)
+                if node_class in (ConditionNode, ActionNode):
+                    nodes.append(node_class.from_data(node_data))
+                else:
+                    nodes.append(node_class(**node_data))
+            data["nodes"] = nodes
+            LogicGraph(**data)
+
+    def decode_with_codec():
+        for data in json.loads(text):
+            decode(LogicGraph, data)
+
+    return {
+        "asdict": _best_time(lambda: [asdict(g) for g in graphs], repeat),
+        "encode": _best_time(lambda: [encode(g) for g in graphs], repeat),
+        "asdict + json.dumps": _best_time(
+            lambda: json.dumps([asdict(g) for g in graphs]), repeat
+        ),
+        "encode + json.dumps": _best_time(
+            lambda: json.dumps([encode(g) for g in graphs]), repeat
+        ),
+        "json.loads + constructors": _best_time(decode_with_constructors, repeat),
+        "json.loads + decode": _best_time(decode_with_codec, repeat),
+    }
+
+
+def benchmark_csv(row_count: int = 200000, repeat: int = 3) -> dict:
+    """Times loading an ItemData.csv file.
+
+    Args:
+        row_count (int, optional): The number of items in the file. Defaults
+            to 200000.
+        repeat (int, optional): The number of timed runs; the fastest is
+            reported. Defaults to 3.
+
+    Returns:
+        dict: The timings in seconds, keyed by operation.
+    """
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer)
+    writer.writerow(field_names(Item))
+    for i in range(row_count):
+        item = Item(f"item_{i}", f"Item {i}", "consumable", i % 500, i % 250)
+        writer.writerow(encode_row(item))
+    text = buffer.getvalue()
+
+    def load_with_dict_reader():
+        # The per-cell conversion the CSV loader used before row converters.
+        items = []
+        for row in csv.DictReader(io.StringIO(text, newline="")):
+            for key, value in row.items():
+                field_type = Item.__annotations__.get(key)
+                if field_type == int:
+                    row[key] = int(value) if value else 0
+                elif field_type == bool:
+                    row[key] = value.lower() in ["true", "1"]
+            items.append(Item(**row))
+        return items
+
+    def load_with_decode_csv():
+        items, errors = decode_csv(csv.reader(io.StringIO(text, newline="")), Item)
+        if errors or len(items) != row_count:
+            raise AssertionError("decode_csv() failed to load every row")
+        return items
+
+    return {
+        "csv.DictReader + constructors": _best_time(load_with_dict_reader, repeat),
+        "decode_csv": _best_time(load_with_decode_csv, repeat),
+    }
+
+
+def benchmark_export(graph_count: int = 200, nodes_per_graph: int = 500) -> dict:
+    """Times a full export in each export mode.
+
+    Args:
+        graph_count (int, optional): The number of graphs. Defaults to 200.
+        nodes_per_graph (int, optional): The number of nodes in each graph.
+            Defaults to 500.
+
+    Returns:
+        dict: The ExportReport of each mode, keyed by mode.
+    """
+    data = ProjectData(logic_graphs=make_graphs(graph_count, nodes_per_graph))
+    reports = {}
+    for mode in ("readable", "performance"):
+        with tempfile.TemporaryDirectory() as project_path:
+            project = SimpleNamespace(project_path=project_path, data=data)
+            reports[mode] = export_project(project, force=True, mode=mode)
+    return reports
+
+
+def make_bundle_data(graph_count: int, nodes_per_graph: int) -> ProjectData:
+    """Builds project data covering every kind of record a bundle holds.
+
+    Besides the graphs of `make_graphs`, this adds items, characters,
+    attributes and interactions.
+
+    Args:
+        graph_count (int): The number of graphs to build.
+        nodes_per_graph (int): The number of nodes in each graph.
+
+    Returns:
+        ProjectData: The project data.
+    """
+    data = ProjectData(logic_graphs=make_graphs(graph_count, nodes_per_graph))
+    for i in range(nodes_per_graph):
+        data.items.append(
+            Item(f"item_{i}", f"Item {i}", "consumable", i % 500, i % 250)
+        )
+        data.attributes.append(Attribute(f"attr_{i}", f"Attribute {i}", i, i * 2))
+        data.interactions.append(
+            Interaction(
+                f"interaction_{i}",
+                "verb_use",
+                f"graph_{i % max(graph_count, 1)}",
+                primary_item_id=f"item_{i}",
+            )
+        )
+    data.characters.append(Character("narrator", "Narrator", "", False, None))
+    data.characters.append(
+        Character(
+            "merchant",
+            "Merchant",
+            "g0_n0",
+            True,
+            "shop_1",
+            portrait_asset_id="portrait_merchant",
+            animations={"idle": {"frames": [0, 1, 2], "fps": 8}},
+        )
+    )
+    return data
+
+
+def benchmark_bundle(
+    graph_count: int = 200, nodes_per_graph: int = 500, lookups: int = 20
+) -> dict:
+    """Checks a binary bundle against the JSON export and times loading both.
+
+    Args:
+        graph_count (int, optional): The number of graphs. Defaults to 200.
+        nodes_per_graph (int, optional): The number of nodes in each graph.
+            Defaults to 500.
+        lookups (int, optional): The number of graphs, and of items, read
+            from the bundle by ID. Defaults to 20.
+
+    Returns:
+        dict: The timings in seconds, keyed by operation.
+
+    Raises:
+        AssertionError: If a record in the bundle differs from the export.
+    """
+    data = make_bundle_data(graph_count, nodes_per_graph)
+    options = ExportOptions(json_style="minified", bundle=True)
+    with tempfile.TemporaryDirectory() as project_path:
+        project = SimpleNamespace(project_path=project_path, data=data)
+        export_project(project, force=True, options=options)
+        graphs_path = os.path.join(project_path, "Logic", "LogicGraphs.json")
+        interactions_path = os.path.join(project_path, "Logic", "Interactions.json")
+        with open(graphs_path, "rb") as f:
+            graphs_json = f.read()
+        with open(interactions_path, "rb") as f:
+            interactions = json.loads(f.read())
+        bundle_path = os.path.join(project_path, BUNDLE_PATH)
+
+        with BundleReader(bundle_path) as bundle:
+            graphs = json.loads(graphs_json)
+            if [bundle.graph_data(i) for i in range(len(graphs))] != graphs:
+                raise AssertionError("Bundle graphs differ from LogicGraphs.json")
+            if list(bundle.table("INTR")) != interactions:
+                raise AssertionError("Bundle interactions differ from the export")
+            for tag, objects in (
+                ("ITEM", data.items),
+                ("CHAR", data.characters),
+                ("ATTR", data.attributes),
+            ):
+                table = bundle.table(tag)
+                if list(table) != [encode(obj) for obj in objects]:
+                    raise AssertionError(f"Bundle {tag} records differ")
+                for index, obj in enumerate(objects):
+                    if table.find(obj.id) != index:
+                        raise AssertionError(f"Bundle {tag} index misses {obj.id}")
+                if table.find("missing") != -1:
+                    raise AssertionError(f"Bundle {tag} index finds a missing ID")
+
+        # A game parses the whole JSON file at start, but only reads the
+        # bundle records it needs, such as the graph of an interaction.
+        random_ids = random.Random(0).choices
+        graph_ids = random_ids([graph.id for graph in data.logic_graphs], k=lookups)
+        item_ids = random_ids([item.id for item in data.items], k=lookups)
+
+        def read_graphs():
+            with BundleReader(bundle_path) as bundle:
+                table = bundle.table("GRPH")
+                for graph_id in graph_ids:
+                    bundle.graph_data(table.find(graph_id))
+
+        def read_items():
+            with BundleReader(bundle_path) as bundle:
+                table = bundle.table("ITEM")
+                for item_id in item_ids:
+                    table.get(table.find(item_id))
+
+        return {
+            "json.loads LogicGraphs.json": _best_time(
+                lambda: json.loads(graphs_json), 3
+            ),
+            f"bundle open + {lookups} graph reads": _best_time(read_graphs, 3),
+            f"bundle open + {lookups} item lookups": _best_time(read_items, 3),
+        }
+
+
+def _print_timings(title: str, timings: dict):
+    """Prints a table of benchmark timings."""
+    print(title)
+    width = max(len(name) for name in timings)
+    for name, seconds in timings.items():
+        print(f"  {name:<{width}}  {seconds * 1000:9.1f} ms")
+
+
+def main(argv: list = None):
+    """Runs the benchmarks named on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    codecs_parser = subparsers.add_parser("codecs", help="schema encoders/decoders")
+    codecs_parser.add_argument("--graphs", type=int, default=200)
+    codecs_parser.add_argument("--nodes", type=int, default=500)
+    codecs_parser.add_argument("--repeat", type=int, default=3)
+    csv_parser = subparsers.add_parser("csv", help="CSV row converters")
+    csv_parser.add_argument("--rows", type=int, default=200000)
+    csv_parser.add_argument("--repeat", type=int, default=3)
+    export_parser = subparsers.add_parser("export", help="export modes")
+    export_parser.add_argument("--graphs", type=int, default=200)
+    export_parser.add_argument("--nodes", type=int, default=500)
+    bundle_parser = subparsers.add_parser("bundle", help="binary bundle")
+    bundle_parser.add_argument("--graphs", type=int, default=200)
+    bundle_parser.add_argument("--nodes", type=int, default=500)
+    bundle_parser.add_argument("--lookups", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.benchmark == "codecs":
+        nodes = args.graphs * args.nodes
+        _print_timings(
+            f"Schema codecs: {args.graphs} graphs, {nodes} nodes",
+            benchmark_codecs(args.graphs, args.nodes, args.repeat),
+        )
+    elif args.benchmark == "csv":
+        _print_timings(
+            f"ItemData.csv: {args.rows} rows",
+            benchmark_csv(args.rows, args.repeat),
+        )
+    elif args.benchmark == "export":
+        for mode, report in benchmark_export(args.graphs, args.nodes).items():
+            print(f"Export, {mode} mode:")
+            print(report.summary())
+    elif args.benchmark == "bundle":
+        _print_timings(
+            f"Binary bundle: {args.graphs} graphs, {args.graphs * args.nodes} nodes",
+            benchmark_bundle(args.graphs, args.nodes, args.lookups),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+"""Reads packed binary game data bundles.
+
+A bundle holds the items, characters, attributes, interactions and logic
+graphs of a project in fixed-width records, so a game runtime can map the
+file into memory and read any record directly, without parsing the whole
+file. This module only uses the standard library, so it can be shipped with
+a runtime as it is; `bundle_writer` creates bundles.
+
+Layout (all values little-endian):
+
+    header      magic "AEGB", version (u16), reserved (u16),
+                section count (u32), directory offset (u32)
+    directory   one entry per section: tag (4 bytes), record size (u32),
+                record count (u32), offset of the first record (u64)
+    sections    the records of each section, starting on 8-byte boundaries
+
+Strings are stored once each in the STRI and SDAT sections and referenced
+by their index in STRI; NO_STRING marks a missing (None) value. The ITMX,
+CHRX, ATRX, INTX and GRPX sections index the records of the matching table
+by ID, sorted by the UTF-8 bytes of the ID, for binary search. Logic graph
+nodes are stored in one NODE table, with their parameters in PARM and their
+connections in LINK.
+"""
+
+import json
+import mmap
+import struct
+
+MAGIC = b"AEGB"
+
+# Version 2 widened item prices and attribute values to 64 bits.
+FORMAT_VERSION = 2
+
+HEADER = struct.Struct("<4sHHII")
+
+DIRECTORY_ENTRY = struct.Struct("<4sIIQ")
+
+# The string index of a missing value.
+NO_STRING = 0xFFFFFFFF
+
+# The layout of the records of each table: their struct format and a
+# (name, kind) pair for each value. Kinds are "s" for a string, "j" for a
+# JSON-encoded string, "b" for a bool, "i" for an int and "f" for a number
+# that is read back as an int when it is whole.
+TABLES = {
+    "ITEM": (
+        "<4I2q",
+        [
+            ("id", "s"),
+            ("name", "s"),
+            ("type", "s"),
+            ("description", "s"),
+            ("buy_price", "i"),
+            ("sell_price", "i"),
+        ],
+    ),
+    "CHAR": (
+        "<6IB3xI",
+        [
+            ("id", "s"),
+            ("display_name", "s"),
+            ("dialogue_start_id", "s"),
+            ("shop_id", "s"),
+            ("portrait_asset_id", "s"),
+            ("sprite_sheet_asset_id", "s"),
+            ("is_merchant", "b"),
+            ("animations", "j"),
+        ],
+    ),
+    "ATTR": (
+        "<2I2q",
+        [("id", "s"), ("name", "s"), ("initial_value", "i"), ("max_value", "i")],
+    ),
+    "INTR": (
+        "<6I",
+        [
+            ("id", "s"),
+            ("verb_id", "s"),
+            ("logic_graph_id", "s"),
+            ("primary_item_id", "s"),
+            ("secondary_item_id", "s"),
+            ("target_hotspot_id", "s"),
+        ],
+    ),
+    "GRPH": (
+        "<4I",
+        [("id", "s"), ("name", "s"), ("first_node", "i"), ("node_count", "i")],
+    ),
+    "NODE": (
+        "<5I4x4d7I4x",
+        [
+            ("id", "s"),
+            ("node_type", "s"),
+            ("command", "s"),
+            ("text", "s"),
+            ("extra", "j"),
+            ("x", "f"),
+            ("y", "f"),
+            ("width", "f"),
+            ("height", "f"),
+            ("kind", "i"),
+            ("first_parameter", "i"),
+            ("parameter_count", "i"),
+            ("first_input", "i"),
+            ("input_count", "i"),
+            ("first_output", "i"),
+            ("output_count", "i"),
+        ],
+    ),
+    "PARM": ("<IB3xq", [("name", "s"), ("type", "i"), ("value", "i")]),
+    "LINK": ("<I", [("node_id", "s")]),
+}
+
+# The ID index of each table that can be searched by ID.
+ID_INDEXES = {
+    "ITEM": "ITMX",
+    "CHAR": "CHRX",
+    "ATTR": "ATRX",
+    "INTR": "INTX",
+    "GRPH": "GRPX",
+}
+
+# An ID index entry: the string index of the ID and the record number.
+ID_INDEX_ENTRY = struct.Struct("<II")
+
+# A string index entry: the offset and length of the string in SDAT.
+STRING_ENTRY = struct.Struct("<II")
+
+# The kind of each node record.
+NODE_BASE, NODE_DIALOGUE, NODE_CONDITION, NODE_ACTION = range(4)
+
+# The type of each parameter value: a string index, an int, a bool, the bits
+# of a float, or the string index of any other value encoded as JSON.
+PARAM_STRING, PARAM_INT, PARAM_BOOL, PARAM_FLOAT, PARAM_JSON = range(5)
+
+_FLOAT = struct.Struct("<d")
+_INT64 = struct.Struct("<q")
+
+
+class BundleError(Exception):
+    """Raised when a file is not a bundle this reader understands."""
+
+
+class Table:
+    """The fixed-width records of one section of a bundle.
+
+    Attributes:
+        tag (str): The section's tag, e.g. "ITEM".
+        fields (list[str]): The name of each value in a record.
+    """
+
+    def __init__(self, bundle: "BundleReader", tag: str, count: int, offset: int):
+        """Initializes a new Table instance.
+
+        Args:
+            bundle (BundleReader): The bundle the table belongs to.
+            tag (str): The section's tag.
+            count (int): The number of records.
+            offset (int): The offset of the first record in the file.
+        """
+        record_format, layout = TABLES[tag]
+        self.tag = tag
+        self.fields = [name for name, _ in layout]
+        self._kinds = [kind for _, kind in layout]
+        self._bundle = bundle
+        self._struct = struct.Struct(record_format)
+        self._count = count
+        self._offset = offset
+
+    def __len__(self) -> int:
+        """Returns the number of records."""
+        return self._count
+
+    def raw(self, index: int) -> tuple:
+        """Reads a record's values without resolving its strings.
+
+        Args:
+            index (int): The record number.
+
+        Returns:
+            tuple: The record's values, with strings as string indices.
+        """
+        if not 0 <= index < self._count:
+            raise IndexError(f"{self.tag} record {index} out of range")
+        return self._struct.unpack_from(
+            self._bundle.buffer, self._offset + index * self._struct.size
+        )
+
+    def get(self, index: int) -> dict:
+        """Reads a record, resolving its strings.
+
+        Args:
+            index (int): The record number.
+
+        Returns:
+            dict: The record's values, keyed by field name.
+        """
+        record = {}
+        for name, kind, value in zip(self.fields, self._kinds, self.raw(index)):
+            if kind == "s":
+                value = self._bundle.string(value)
+            elif kind == "j":
+                value = self._bundle.json_value(value)
+            elif kind == "b":
+                value = bool(value)
+            elif kind == "f" and value.is_integer():
+                value = int(value)
+            record[name] = value
+        return record
+
+    def find(self, record_id: str) -> int:
+        """Finds a record by its ID.
+
+        Args:
+            record_id (str): The ID to find.
+
+        Returns:
+            int: The record number, or -1 if there is no such record.
+        """
+        return self._bundle.find_id(ID_INDEXES[self.tag], record_id)
+
+    def __iter__(self):
+        """Iterates over every record, resolving strings."""
+        for index in range(self._count):
+            yield self.get(index)
+
+
+class BundleReader:
+    """Reads a bundle file through a read-only memory map.
+
+    Records are only read when they are asked for, so opening a bundle
+    takes the same time however much data it holds.
+
+    Attributes:
+        path (str): The path of the bundle file.
+        version (int): The format version of the bundle.
+    """
+
+    def __init__(self, path: str):
+        """Opens a bundle.
+
+        Args:
+            path (str): The path of the bundle file.
+
+        Raises:
+            BundleError: If the file is not a bundle, or was written in
+                another format version.
+            OSError: If the file cannot be opened.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise BundleError(f"{path} is empty") from e
+        try:
+            self._read_directory()
+        except (BundleError, struct.error) as e:
+            self.buffer.close()
+            raise BundleError(f"{path} is not a valid bundle: {e}") from e
+        self._strings = {}
+        self._tables = {}
+
+    def close(self):
+        """Closes the bundle."""
+        self.buffer.close()
+
+    def __enter__(self) -> "BundleReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _read_directory(self):
+        """Reads the header and the section directory."""
+        magic, version, _, count, offset = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise BundleError("bad magic number")
+        if version != FORMAT_VERSION:
+            raise BundleError(f"unsupported format version {version}")
+        self.version = version
+        self._sections = {}
+        for i in range(count):
+            tag, record_size, records, start = DIRECTORY_ENTRY.unpack_from(
+                self.buffer, offset + i * DIRECTORY_ENTRY.size
+            )
+            tag = tag.decode("ascii")
+            if tag in TABLES and record_size != struct.calcsize(TABLES[tag][0]):
+                raise BundleError(f"unexpected {tag} record size {record_size}")
+            if start + record_size * records > len(self.buffer):
+                raise BundleError(f"section {tag} is truncated")
+            self._sections[tag] = (record_size, records, start)
+        self._string_count, self._string_offset = self._section("STRI")
+        self._data_offset = self._section("SDAT")[1]
+
+    def _section(self, tag: str) -> tuple:
+        """Gets the record count and offset of a section."""
+        if tag not in self._sections:
+            raise BundleError(f"missing section {tag}")
+        _, count, offset = self._sections[tag]
+        return count, offset
+
+    def table(self, tag: str) -> Table:
+        """Gets a table of records.
+
+        Args:
+            tag (str): The table's tag, e.g. "ITEM".
+
+        Returns:
+            Table: The table.
+        """
+        table = self._tables.get(tag)
+        if table is None:
+            count, offset = self._section(tag)
+            table = self._tables[tag] = Table(self, tag, count, offset)
+        return table
+
+    def string(self, index: int) -> str:
+        """Gets a string from the string table.
+
+        Args:
+            index (int): The string index.
+
+        Returns:
+            str: The string, or None for NO_STRING.
+        """
+        if index == NO_STRING:
+            return None
+        value = self._strings.get(index)
+        if value is None:
+            value = self.string_bytes(index).decode("utf-8")
+            self._strings[index] = value
+        return value
+
+    def string_bytes(self, index: int) -> bytes:
+        """Gets the UTF-8 bytes of a string without decoding them."""
+        if not 0 <= index < self._string_count:
+            raise IndexError(f"string {index} out of range")
+        offset, length = STRING_ENTRY.unpack_from(
+            self.buffer, self._string_offset + index * STRING_ENTRY.size
+        )
+        start = self._data_offset + offset
+        return self.buffer[start : start + length]
+
+    def json_value(self, index: int):
+        """Gets a value that was stored as a JSON-encoded string."""
+        text = self.string(index)
+        return None if text is None else json.loads(text)
+
+    def find_id(self, index_tag: str, record_id: str) -> int:
+        """Finds a record number by ID with a binary search of an ID index.
+
+        Args:
+            index_tag (str): The tag of the ID index, e.g. "ITMX".
+            record_id (str): The ID to find.
+
+        Returns:
+            int: The record number, or -1 if there is no such record.
+        """
+        count, offset = self._section(index_tag)
+        key = record_id.encode("utf-8")
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            string_index, record = ID_INDEX_ENTRY.unpack_from(
+                self.buffer, offset + middle * ID_INDEX_ENTRY.size
+            )
+            found = self.string_bytes(string_index)
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return record
+        return -1
+
+    def parameters(self, node: dict) -> dict:
+        """Reads the parameters of a node record.
+
+        Args:
+            node (dict): The node record, as returned by `Table.get`.
+
+        Returns:
+            dict: The parameter values, keyed by name.
+        """
+        table = self.table("PARM")
+        parameters = {}
+        start = node["first_parameter"]
+        for index in range(start, start + node["parameter_count"]):
+            name, value_type, value = table.raw(index)
+            if value_type == PARAM_STRING:
+                value = self.string(value)
+            elif value_type == PARAM_BOOL:
+                value = bool(value)
+            elif value_type == PARAM_FLOAT:
+                value = _FLOAT.unpack(_INT64.pack(value))[0]
+            elif value_type == PARAM_JSON:
+                value = self.json_value(value)
+            parameters[self.string(name)] = value
+        return parameters
+
+    def links(self, first: int, count: int) -> list:
+        """Reads a run of node IDs from the LINK table."""
+        table = self.table("LINK")
+        return [
+            self.string(table.raw(index)[0]) for index in range(first, first + count)
+        ]
+
+    def node_data(self, index: int) -> dict:
+        """Reads a node in the form the JSON export uses.
+
+        Args:
+            index (int): The node's record number in the NODE table.
+
+        Returns:
+            dict: The node's data.
+        """
+        node = self.table("NODE").get(index)
+        data = {
+            "id": node["id"],
+            "node_type": node["node_type"],
+            "x": node["x"],
+            "y": node["y"],
+            "width": node["width"],
+            "height": node["height"],
+            "inputs": self.links(node["first_input"], node["input_count"]),
+            "outputs": self.links(node["first_output"], node["output_count"]),
+        }
+        kind = node["kind"]
+        if kind == NODE_DIALOGUE:
+            data["character_id"] = node["command"]
+            data["dialogue_text"] = node["text"]
+            data["action_node"] = node["extra"]
+        elif kind == NODE_CONDITION:
+            data["condition_type"] = node["command"]
+            data["parameters"] = self.parameters(node)
+        elif kind == NODE_ACTION:
+            data["action_command"] = node["command"]
+            data["parameters"] = self.parameters(node)
+        return data
+
+    def graph_data(self, index: int) -> dict:
+        """Reads a logic graph in the form the JSON export uses.
+
+        Args:
+            index (int): The graph's record number in the GRPH table.
+
+        Returns:
+            dict: The graph's data, including its nodes.
+        """
+        graph = self.table("GRPH").get(index)
+        first = graph["first_node"]
+        return {
+            "id": graph["id"],
+            "name": graph["name"],
+            "nodes": [
+                self.node_data(node)
+                for node in range(first, first + graph["node_count"])
+            ],
+        }
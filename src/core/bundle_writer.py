@@ -0,0 +1,277 @@
+"""Writes packed binary game data bundles.
+
+This module provides `build_bundle`, which packs the runtime data of a
+project into the bundle format described in `bundle_reader`.
+"""
+
+import json
+import struct
+
+from .bundle_reader import (
+    DIRECTORY_ENTRY,
+    FORMAT_VERSION,
+    HEADER,
+    ID_INDEX_ENTRY,
+    ID_INDEXES,
+    MAGIC,
+    NO_STRING,
+    NODE_ACTION,
+    NODE_BASE,
+    NODE_CONDITION,
+    NODE_DIALOGUE,
+    PARAM_BOOL,
+    PARAM_FLOAT,
+    PARAM_INT,
+    PARAM_JSON,
+    PARAM_STRING,
+    STRING_ENTRY,
+    TABLES,
+)
+from .schema_codec import encode
+from .schemas.logic import ActionNode, ConditionNode, DialogueNode
+
+_FLOAT = struct.Struct("<d")
+_INT64 = struct.Struct("<q")
+
+_INT64_RANGE = range(-(2**63), 2**63)
+
+
+class _StringTable:
+    """Collects the strings of a bundle, storing each one once."""
+
+    def __init__(self):
+        """Initializes a new, empty string table."""
+        self._indexes = {}
+        self._entries = []
+        self._data = bytearray()
+
+    def add(self, value) -> int:
+        """Adds a string, returning its index, or NO_STRING for None."""
+        if value is None:
+            return NO_STRING
+        value = str(value)
+        index = self._indexes.get(value)
+        if index is None:
+            encoded = value.encode("utf-8")
+            index = len(self._entries)
+            self._indexes[value] = index
+            self._entries.append((len(self._data), len(encoded)))
+            self._data += encoded
+        return index
+
+    def add_json(self, value) -> int:
+        """Adds a value encoded as JSON, or NO_STRING for None."""
+        if value is None:
+            return NO_STRING
+        return self.add(json.dumps(value, separators=(",", ":")))
+
+    def encoded(self, index: int) -> bytes:
+        """Returns the UTF-8 bytes of the string with the given index."""
+        offset, length = self._entries[index]
+        return bytes(self._data[offset : offset + length])
+
+    def sections(self) -> list:
+        """Returns the STRI and SDAT sections."""
+        index = b"".join(STRING_ENTRY.pack(*entry) for entry in self._entries)
+        return [
+            ("STRI", STRING_ENTRY.size, len(self._entries), index),
+            ("SDAT", 1, len(self._data), bytes(self._data)),
+        ]
+
+
+def _int64(value, name: str) -> int:
+    """Converts a value for a 64-bit integer field.
+
+    Args:
+        value: The value.
+        name (str): What the value is, for the error message.
+
+    Returns:
+        int: The value.
+
+    Raises:
+        ValueError: If the value does not fit in 64 bits.
+    """
+    value = int(value)
+    if value not in _INT64_RANGE:
+        raise ValueError(f"{name} {value} does not fit in a 64-bit bundle field")
+    return value
+
+
+def _node_kind(node) -> int:
+    """Returns the kind of a node's record."""
+    if isinstance(node, DialogueNode):
+        return NODE_DIALOGUE
+    if isinstance(node, ConditionNode):
+        return NODE_CONDITION
+    if isinstance(node, ActionNode):
+        return NODE_ACTION
+    return NODE_BASE
+
+
+def _pack_parameter(strings: _StringTable, value) -> tuple:
+    """Returns the type and packed value of a node parameter."""
+    if isinstance(value, bool):
+        return PARAM_BOOL, int(value)
+    if isinstance(value, int) and value in _INT64_RANGE:
+        return PARAM_INT, value
+    if isinstance(value, float):
+        return PARAM_FLOAT, _INT64.unpack(_FLOAT.pack(value))[0]
+    if isinstance(value, str):
+        return PARAM_STRING, strings.add(value)
+    return PARAM_JSON, strings.add_json(value)
+
+
+def build_bundle(data) -> bytes:
+    """Packs the runtime data of a project into a bundle.
+
+    Args:
+        data (ProjectData): The project data.
+
+    Returns:
+        bytes: The bundle.
+
+    Raises:
+        ValueError: If an item price or attribute value does not fit in 64
+            bits.
+    """
+    strings = _StringTable()
+    records = {tag: [] for tag in TABLES}
+
+    for item in data.items:
+        records["ITEM"].append(
+            (
+                strings.add(item.id),
+                strings.add(item.name),
+                strings.add(item.type),
+                strings.add(item.description),
+                _int64(item.buy_price, f"Buy price of item {item.id}"),
+                _int64(item.sell_price, f"Sell price of item {item.id}"),
+            )
+        )
+    for character in data.characters:
+        records["CHAR"].append(
+            (
+                strings.add(character.id),
+                strings.add(character.display_name),
+                strings.add(character.dialogue_start_id),
+                strings.add(character.shop_id),
+                strings.add(character.portrait_asset_id),
+                strings.add(character.sprite_sheet_asset_id),
+                bool(character.is_merchant),
+                strings.add_json(character.animations),
+            )
+        )
+    for attribute in data.attributes:
+        records["ATTR"].append(
+            (
+                strings.add(attribute.id),
+                strings.add(attribute.name),
+                _int64(
+                    attribute.initial_value,
+                    f"Initial value of attribute {attribute.id}",
+                ),
+                _int64(attribute.max_value, f"Maximum of attribute {attribute.id}"),
+            )
+        )
+    for interaction in data.interactions:
+        records["INTR"].append(
+            (
+                strings.add(interaction.id),
+                strings.add(interaction.verb_id),
+                strings.add(interaction.logic_graph_id),
+                strings.add(interaction.primary_item_id),
+                strings.add(interaction.secondary_item_id),
+                strings.add(interaction.target_hotspot_id),
+            )
+        )
+    nodes, parameters, links = records["NODE"], records["PARM"], records["LINK"]
+    for graph in data.logic_graphs:
+        records["GRPH"].append(
+            (
+                strings.add(graph.id),
+                strings.add(graph.name),
+                len(nodes),
+                len(graph.nodes),
+            )
+        )
+        for node in graph.nodes:
+            kind = _node_kind(node)
+            command = text = extra = None
+            first_parameter = len(parameters)
+            if kind == NODE_DIALOGUE:
+                command, text = node.character_id, node.dialogue_text
+                if node.action_node is not None:
+                    extra = encode(node.action_node)
+            elif kind == NODE_CONDITION or kind == NODE_ACTION:
+                if kind == NODE_CONDITION:
+                    command = node.condition_type
+                else:
+                    command = node.action_command
+                for name, value in node.parameters.items():
+                    parameters.append(
+                        (strings.add(name), *_pack_parameter(strings, value))
+                    )
+            first_input = len(links)
+            links.extend((strings.add(node_id),) for node_id in node.inputs)
+            first_output = len(links)
+            links.extend((strings.add(node_id),) for node_id in node.outputs)
+            nodes.append(
+                (
+                    strings.add(node.id),
+                    strings.add(node.node_type),
+                    strings.add(command),
+                    strings.add(text),
+                    strings.add_json(extra),
+                    float(node.x),
+                    float(node.y),
+                    float(node.width),
+                    float(node.height),
+                    kind,
+                    first_parameter,
+                    len(parameters) - first_parameter,
+                    first_input,
+                    len(node.inputs),
+                    first_output,
+                    len(node.outputs),
+                )
+            )
+
+    sections = []
+    for tag, rows in records.items():
+        packer = struct.Struct(TABLES[tag][0])
+        body = b"".join(packer.pack(*row) for row in rows)
+        sections.append((tag, packer.size, len(rows), body))
+        if tag in ID_INDEXES:
+            # Sort by the UTF-8 bytes of the ID, as the reader compares them.
+            order = sorted(range(len(rows)), key=lambda i: strings.encoded(rows[i][0]))
+            index = b"".join(ID_INDEX_ENTRY.pack(rows[i][0], i) for i in order)
+            sections.append(
+                (ID_INDEXES[tag], ID_INDEX_ENTRY.size, len(rows), index)
+            )
+    sections.extend(strings.sections())
+    return _pack_sections(sections)
+
+
+def _pack_sections(sections: list) -> bytes:
+    """Lays out the header, section directory and sections of a bundle."""
+    directory_offset = HEADER.size
+    offset = _align(directory_offset + DIRECTORY_ENTRY.size * len(sections))
+    directory = []
+    bodies = []
+    for tag, record_size, count, body in sections:
+        directory.append(
+            DIRECTORY_ENTRY.pack(tag.encode("ascii"), record_size, count, offset)
+        )
+        padding = _align(len(body)) - len(body)
+        bodies.append(body + b"\0" * padding)
+        offset += len(body) + padding
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(sections), directory_offset)
+    head = header + b"".join(directory)
+    head += b"\0" * (_align(len(head)) - len(head))
+    return head + b"".join(bodies)
+
+
+def _align(offset: int) -> int:
+    """Rounds an offset up to the next multiple of 8."""
+    return (offset + 7) & ~7
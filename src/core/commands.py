@@ -0,0 +1,71 @@
+"""Definitions of the commands available to logic nodes.
+
+This module defines COMMAND_DEFINITIONS, the schema for every condition and
+action a logic node can perform. Each command lists its parameters by their
+PascalCase names, mapped to a type name ("str", "int", "bool" or "any") or to
+a list of allowed values. The schema drives the node properties editor, the
+node data classes and the exporter.
+"""
+
+COMMAND_DEFINITIONS = {
+    "actions": {
+        "SET_VARIABLE": {"params": {"VarName": "str", "Value": "any"}},
+        "INVENTORY_ADD": {"params": {"ItemID": "str", "Amount": "int"}},
+        "INVENTORY_REMOVE": {"params": {"ItemID": "str", "Amount": "int"}},
+        "SCENE_TRANSITION": {"params": {"SceneID": "str", "SpawnPoint": "str"}},
+        "SHOP_OPEN": {"params": {"ShopID": "str"}},
+        "MODIFY_ATTRIBUTE": {"params": {"AttributeID": "str", "Value": "int"}},
+        "PLAY_CINEMATIC": {"params": {"CinematicID": "str"}},
+        "PLAY_SFX": {"params": {"SoundID": "str"}},
+        "UNLOCK_HOTSPOT": {"params": {"HotspotID": "str"}},
+        "LOCK_HOTSPOT": {"params": {"HotspotID": "str"}},
+        "SET_ANIMATION": {
+            "params": {"TargetID": "str", "AnimationKey": "str", "Loop": "bool"}
+        },
+        "HIDE_ENTITY": {"params": {"EntityID": "str"}},
+        "SHOW_ENTITY": {"params": {"EntityID": "str", "X": "int", "Y": "int"}},
+        "SET_CURSOR_MODE": {"params": {"Mode": ["Contextual", "Classic"]}},
+        "SET_WALK_MESH": {"params": {"SceneID": "str", "MeshID": "str"}},
+        # Extended Actions:
+        "SET_PLAYER_POS": {"params": {"X": "int", "Y": "int"}},
+        "GIVE_CURRENCY": {"params": {"Amount": "int"}},
+        "TAKE_CURRENCY": {"params": {"Amount": "int"}},
+        "PLAY_SOUND_2D": {"params": {"SoundID": "str"}},
+        "SHOW_DIALOGUE_CHOICES": {"params": {"DialogueNodeID": "str"}},
+        "FORCE_SAVE": {"params": {}},
+        # Quest Actions:
+        "START_QUEST": {"params": {"QuestID": "str"}},
+        "COMPLETE_OBJECTIVE": {"params": {"QuestID": "str", "ObjectiveID": "str"}},
+    },
+    "conditions": {
+        "VARIABLE_EQUALS": {"params": {"VarName": "str", "Value": "any"}},
+        "HAS_ITEM": {"params": {"ItemID": "str", "Amount": "int"}},
+        "ATTRIBUTE_CHECK": {
+            "params": {
+                "AttributeID": "str",
+                "Value": "int",
+                "Comparison": ["==", ">", "<", ">=", "<="],
+            }
+        },
+        "HOTSPOT_LOCKED": {"params": {"HotspotID": "str", "State": "bool"}},
+        "ENTITY_VISIBLE": {"params": {"EntityID": "str", "Visible": "bool"}},
+        "SCENE_VISITED": {"params": {"SceneID": "str", "Times": "int"}},
+        # Extended Conditions:
+        "CURRENCY_GE": {"params": {"Amount": "int"}},
+        "HAS_FAILED_CHECK": {"params": {"CheckID": "str"}},
+        "ENTITY_HAS_ITEM": {"params": {"EntityID": "str", "ItemID": "str"}},
+        "WALK_MESH_ACTIVE": {"params": {"MeshID": "str", "State": "bool"}},
+        "TIME_OF_DAY_IS": {
+            "params": {"TimeState": ["Night", "Morning", "Day", "Evening"]}
+        },
+    },
+}
+
+
+def get_command_definitions():
+    """Returns the definitions of all conditions and actions.
+
+    Returns:
+        dict: The command definitions, keyed by "conditions" and "actions".
+    """
+    return COMMAND_DEFINITIONS
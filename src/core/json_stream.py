@@ -0,0 +1,264 @@
+"""Incremental parsing of large JSON array files.
+
+This module provides iter_json_array, which reads a JSON file whose top level
+is an array and yields its elements one at a time. Only the element being
+decoded and one read chunk are held in memory, so files far larger than a
+single element can be processed without reading them into memory whole.
+
+It also provides FileSpanReader, which reads back the raw bytes of individual
+elements later on.
+"""
+
+import codecs
+import json
+import os
+import threading
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = " \t\n\r"
+
+_NUMBER_CHARACTERS = "0123456789+-.eE"
+
+
+class _TextWindow:
+    """A sliding window of decoded text over a binary file.
+
+    Attributes:
+        text (str): The decoded text that has not been discarded yet.
+        pos (int): The current parse position within `text`.
+        eof (bool): True once the whole file has been read.
+    """
+
+    def __init__(self, file, chunk_size: int, progress: callable):
+        """Initializes a new _TextWindow instance.
+
+        Args:
+            file: A file object opened in binary mode.
+            chunk_size (int): The number of bytes to read at a time.
+            progress (callable): A progress callback, or None.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+        self.total_bytes = _remaining_size(file)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        # The file offset of text[0], and a position in the text whose file
+        # offset is known, for converting positions to byte offsets.
+        self._base_offset = _tell(file)
+        self._mark = (0, self._base_offset)
+
+    def read_more(self, size: int = None) -> bool:
+        """Reads another chunk of the file into the window.
+
+        Text before the current position is discarded first.
+
+        Args:
+            size (int, optional): The number of bytes to read. Defaults to
+                the window's chunk size.
+
+        Returns:
+            bool: False if the end of the file had already been reached.
+        """
+        if self.eof:
+            return False
+        data = self.file.read(size or self.chunk_size)
+        self.bytes_read += len(data)
+        self.eof = not data
+        if self._base_offset is not None:
+            self._base_offset = self.byte_offset(self.pos)
+            self._mark = (0, self._base_offset)
+        self.text = self.text[self.pos :] + self._decoder.decode(data, final=self.eof)
+        self.pos = 0
+        if self.progress:
+            self.progress(self.bytes_read, self.total_bytes)
+        return True
+
+    def byte_offset(self, pos: int) -> int:
+        """Returns the file offset, in bytes, of a position in the window.
+
+        Conversion is incremental, so it is cheapest when positions are
+        converted in increasing order.
+
+        Args:
+            pos (int): A position within `text`.
+
+        Returns:
+            int: The offset in the file, or None if the file's starting
+            offset is unknown.
+        """
+        if self._base_offset is None:
+            return None
+        mark_pos, mark_offset = self._mark
+        if pos < mark_pos:
+            mark_pos, mark_offset = 0, self._base_offset
+        offset = mark_offset + len(self.text[mark_pos:pos].encode("utf-8"))
+        self._mark = (pos, offset)
+        return offset
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character.
+
+        Returns:
+            str: The next non-whitespace character, or an empty string at the
+            end of the file.
+        """
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.read_more():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """Consumes the next character, which must be one of `characters`.
+
+        Args:
+            characters (str): The acceptable characters.
+
+        Returns:
+            str: The consumed character.
+
+        Raises:
+            json.JSONDecodeError: If the next character is not acceptable.
+        """
+        char = self.peek()
+        if not char or char not in characters:
+            expected = " or ".join(repr(c) for c in characters)
+            raise json.JSONDecodeError(f"Expecting {expected}", self.text, self.pos)
+        self.pos += 1
+        return char
+
+
+def _tell(file) -> int:
+    """Returns the current offset of a file, or None if unknown."""
+    try:
+        return file.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _remaining_size(file) -> int:
+    """Returns the number of bytes left in a file, or None if unknown."""
+    try:
+        return os.fstat(file.fileno()).st_size - file.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def iter_json_array(
+    file,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: callable = None,
+    with_offsets: bool = False,
+):
+    """Yields the elements of a top-level JSON array one at a time.
+
+    Each element is decoded as soon as it has been read completely, and the
+    text before it is discarded. An element larger than the read chunk is
+    read with progressively larger reads, so it is decoded at most a few
+    times. An empty JSON object is accepted as an empty array.
+
+    Args:
+        file: A UTF-8 encoded file object opened in binary mode.
+        chunk_size (int, optional): The number of bytes to read at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+        progress (callable, optional): Called after each read with the number
+            of bytes read so far and the total number of bytes, which is None
+            if the size of the file is unknown. Defaults to None.
+        with_offsets (bool, optional): If True, yield the location of each
+            element in the file along with its value. Defaults to False.
+
+    Yields:
+        The decoded value of each element, in order. If `with_offsets` is
+        True, a (value, start, end) tuple is yielded instead, where `start`
+        and `end` are the byte offsets of the element's text in the file.
+
+    Raises:
+        json.JSONDecodeError: If the file is not a valid JSON array.
+    """
+    decoder = json.JSONDecoder()
+    window = _TextWindow(file, chunk_size, progress)
+    if window.expect("[{") == "{":
+        # Empty collections are sometimes stored as an empty object.
+        window.expect("}")
+    elif window.peek() == "]":
+        window.pos += 1
+    else:
+        while True:
+            window.peek()
+            read_size = chunk_size
+            while True:
+                try:
+                    value, end = decoder.raw_decode(window.text, window.pos)
+                except json.JSONDecodeError:
+                    if not window.read_more(read_size):
+                        raise
+                    read_size *= 2
+                    continue
+                # A number that runs to the end of the window may continue
+                # in the next chunk.
+                if (
+                    isinstance(value, (int, float))
+                    and window.text[end:].lstrip(_NUMBER_CHARACTERS) == ""
+                    and window.read_more(read_size)
+                ):
+                    continue
+                break
+            if with_offsets:
+                start = window.byte_offset(window.pos)
+                yield value, start, window.byte_offset(end)
+            else:
+                yield value
+            window.pos = end
+            if window.expect(",]") == "]":
+                break
+
+    if window.peek():
+        raise json.JSONDecodeError("Extra data", window.text, window.pos)
+
+
+class FileSpanReader:
+    """Reads byte ranges from a file that was parsed earlier.
+
+    The file is kept open, so on platforms where an open file survives
+    being replaced, such as Linux, the ranges stay valid after the file is
+    rewritten on disk. Reads are serialized, so the reader can be shared
+    between threads.
+
+    Attributes:
+        path (str): The path of the file.
+    """
+
+    def __init__(self, path: str):
+        """Opens a file for reading spans.
+
+        Args:
+            path (str): The path of the file.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._lock = threading.Lock()
+
+    def read(self, start: int, end: int) -> bytes:
+        """Reads a byte range from the file.
+
+        Args:
+            start (int): The offset of the first byte.
+            end (int): The offset just past the last byte.
+
+        Returns:
+            bytes: The bytes in the range.
+        """
+        with self._lock:
+            self._file.seek(start)
+            return self._file.read(end - start)
+
+    def close(self):
+        """Closes the file."""
+        self._file.close()
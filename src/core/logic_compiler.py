@@ -0,0 +1,431 @@
+"""Compiles logic graphs into flat instruction tables.
+
+A logic graph is stored as a list of nodes that refer to each other by ID
+and name their commands with strings. This module compiles each graph once,
+at export time, into a form a game runtime can run without looking anything
+up by name:
+
+    constants   the graph's parameter values and dialogue text, each once
+    code        INSTRUCTION_WIDTH integers per instruction: the opcode, the
+                first operand and operand count, and the first target and
+                target count
+    operands    indices into `constants`
+    targets     the instructions each instruction continues to
+    entry       the instructions the graph starts at
+
+Opcodes come from COMMAND_DEFINITIONS: conditions are numbered from
+CONDITION_OPCODE_BASE and actions from ACTION_OPCODE_BASE, in definition
+order, so new commands must be added at the end of their section. A
+command's operands are its parameters in definition order, with unset
+parameters filled in, and are type-checked against the definitions.
+
+Each node becomes one instruction, except a dialogue node with an inline
+action, which is followed by a second instruction for the action. A
+condition continues to its first target if it holds and to its second, if
+there is one, if it does not; any other instruction continues to each of
+its targets in turn. Run this module to disassemble an exported file:
+
+    python3 -m advengine.core.logic_compiler Logic/LogicGraphs.bytecode.json
+"""
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from typing import Any, List
+
+from .commands import COMMAND_DEFINITIONS
+from .schemas.logic import ActionNode, ConditionNode, DialogueNode
+
+# The version of the compiled format. Increase it when the format changes.
+BYTECODE_VERSION = 1
+
+# The number of integers in each instruction of `CompiledGraph.code`.
+INSTRUCTION_WIDTH = 5
+
+# The opcodes of nodes that do not run a command.
+OPCODE_NOP = 0
+OPCODE_SAY = 1
+
+# The first opcode of each kind of command.
+CONDITION_OPCODE_BASE = 0x40
+ACTION_OPCODE_BASE = 0x80
+
+CONDITION_OPCODES = {
+    name: CONDITION_OPCODE_BASE + number
+    for number, name in enumerate(COMMAND_DEFINITIONS["conditions"])
+}
+ACTION_OPCODES = {
+    name: ACTION_OPCODE_BASE + number
+    for number, name in enumerate(COMMAND_DEFINITIONS["actions"])
+}
+
+# Every opcode, keyed by mnemonic.
+OPCODES = {"NOP": OPCODE_NOP, "SAY": OPCODE_SAY, **CONDITION_OPCODES, **ACTION_OPCODES}
+
+# The value of a parameter that a node does not set, for each parameter type.
+# A parameter with a list of allowed values defaults to the first of them.
+_TYPE_DEFAULTS = {"str": "", "int": 0, "bool": False, "any": ""}
+
+# The text a stored bool parameter may hold, and the value it stands for.
+_BOOL_STRINGS = {"true": True, "false": False, "1": True, "0": False}
+
+
+@dataclass
+class CompileError:
+    """A problem that stops a logic graph from compiling.
+
+    Attributes:
+        graph_id (str): The ID of the graph.
+        node_id (str): The ID of the node with the problem.
+        message (str): A description of the problem.
+    """
+
+    graph_id: str
+    node_id: str
+    message: str
+
+    def __str__(self) -> str:
+        """Returns the error as a single line."""
+        return f"{self.graph_id}/{self.node_id}: {self.message}"
+
+
+@dataclass
+class CompiledGraph:
+    """A logic graph compiled into flat instruction tables.
+
+    Attributes:
+        id (str): The ID of the graph.
+        name (str): The name of the graph.
+        constants (list): The values the operands refer to.
+        code (List[int]): INSTRUCTION_WIDTH integers per instruction.
+        operands (List[int]): Indices into `constants`.
+        targets (List[int]): Instruction numbers.
+        entry (List[int]): The instructions the graph starts at.
+        node_ids (List[str]): The ID of the node each instruction was
+            compiled from, for debugging.
+    """
+
+    id: str
+    name: str
+    constants: List[Any] = field(default_factory=list)
+    code: List[int] = field(default_factory=list)
+    operands: List[int] = field(default_factory=list)
+    targets: List[int] = field(default_factory=list)
+    entry: List[int] = field(default_factory=list)
+    node_ids: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Returns the number of instructions."""
+        return len(self.code) // INSTRUCTION_WIDTH
+
+    def instruction(self, pc: int) -> tuple:
+        """Decodes an instruction.
+
+        Args:
+            pc (int): The instruction number.
+
+        Returns:
+            tuple: The opcode, the operand values, and the target
+            instruction numbers.
+        """
+        start = pc * INSTRUCTION_WIDTH
+        opcode, first_operand, operand_count, first_target, target_count = (
+            self.code[start : start + INSTRUCTION_WIDTH]
+        )
+        operand_indices = self.operands[first_operand : first_operand + operand_count]
+        operands = [self.constants[index] for index in operand_indices]
+        targets = self.targets[first_target : first_target + target_count]
+        return opcode, operands, targets
+
+
+def compile_graph(graph) -> tuple:
+    """Compiles a logic graph.
+
+    Connections to node IDs that are not in the graph are left out, as
+    `LogicGraph.edges` does. The graph does not compile if two nodes share
+    an ID, if a node's command is unknown or a parameter has the wrong
+    type, or if a condition has more than two outputs. Stored parameters
+    that the node's command does not define, such as those left over from a
+    previous command, are ignored.
+
+    Args:
+        graph (LogicGraph): The graph.
+
+    Returns:
+        tuple: The CompiledGraph, or None if the graph has errors, and a
+        list of CompileErrors.
+    """
+    compiled = CompiledGraph(id=graph.id, name=graph.name)
+    errors = []
+    constants = {}
+
+    def constant(value) -> int:
+        # The type tells apart values that compare equal, such as 1 and True.
+        if isinstance(value, (str, int, float)) or value is None:
+            key = (type(value), value)
+        else:
+            key = json.dumps(value, sort_keys=True)
+        index = constants.get(key)
+        if index is None:
+            index = constants[key] = len(compiled.constants)
+            compiled.constants.append(value)
+        return index
+
+    # Number the instructions first, so connections can be resolved.
+    pcs = {}
+    pc = 0
+    for node in graph.nodes:
+        if node.id in pcs:
+            errors.append(CompileError(graph.id, node.id, "Duplicate node ID"))
+        pcs.setdefault(node.id, pc)
+        pc += 2 if isinstance(node, DialogueNode) and node.action_node else 1
+
+    for node in graph.nodes:
+        targets = [pcs[node_id] for node_id in node.outputs if node_id in pcs]
+        if isinstance(node, DialogueNode):
+            operands = [node.character_id, node.dialogue_text]
+            if node.action_node is None:
+                _emit(compiled, OPCODE_SAY, operands, targets, node.id, constant)
+                continue
+            # The inline action runs next, then the dialogue's outputs.
+            inline = [len(compiled) + 1]
+            _emit(compiled, OPCODE_SAY, operands, inline, node.id, constant)
+            node = node.action_node
+        opcode, operands = OPCODE_NOP, []
+        try:
+            if isinstance(node, ConditionNode):
+                if len(targets) > 2:
+                    raise ValueError(
+                        "A condition has at most two outputs, success and failure"
+                    )
+                opcode, operands = _command(
+                    node, node.condition_type, "conditions", CONDITION_OPCODES
+                )
+            elif isinstance(node, ActionNode):
+                opcode, operands = _command(
+                    node, node.action_command, "actions", ACTION_OPCODES
+                )
+        except ValueError as e:
+            errors.append(CompileError(graph.id, node.id, str(e)))
+        _emit(compiled, opcode, operands, targets, node.id, constant)
+
+    compiled.entry = [
+        pcs[node.id]
+        for node in graph.nodes
+        if not any(node_id in pcs for node_id in node.inputs)
+    ]
+    return (None if errors else compiled), errors
+
+
+def _emit(
+    compiled: CompiledGraph,
+    opcode: int,
+    operands: list,
+    targets: list,
+    node_id: str,
+    constant: callable,
+):
+    """Appends an instruction to a compiled graph."""
+    compiled.code += [
+        opcode,
+        len(compiled.operands),
+        len(operands),
+        len(compiled.targets),
+        len(targets),
+    ]
+    compiled.operands += [constant(value) for value in operands]
+    compiled.targets += targets
+    compiled.node_ids.append(node_id)
+
+
+def _command(node, command: str, kind: str, opcodes: dict) -> tuple:
+    """Looks up a node's command and type-checks its parameters.
+
+    Returns:
+        tuple: The opcode and the operand values.
+
+    Raises:
+        ValueError: If the command is unknown or a parameter has the wrong
+            type.
+    """
+    if command not in opcodes:
+        raise ValueError(f"Unknown {kind[:-1]} {command!r}")
+    operands = []
+    for name, param_type in COMMAND_DEFINITIONS[kind][command]["params"].items():
+        if name not in node.parameters:
+            if isinstance(param_type, list):
+                operands.append(param_type[0])
+            else:
+                operands.append(_TYPE_DEFAULTS[param_type])
+            continue
+        value = _convert_text(node.parameters[name], param_type)
+        problem = _check_type(value, param_type)
+        if problem:
+            raise ValueError(f"{command} {name} {problem}")
+        operands.append(value)
+    return opcodes[command], operands
+
+
+def _convert_text(value, param_type):
+    """Converts the text of an int or bool parameter to its value.
+
+    Older projects store numbers and flags as text, such as "45" or "true",
+    which the node editor converts when it shows them. Other values, and
+    text that is not a number or a flag, are returned as they are.
+    """
+    if not isinstance(value, str):
+        return value
+    if param_type == "int":
+        try:
+            return int(value.strip())
+        except ValueError:
+            return value
+    if param_type == "bool":
+        return _BOOL_STRINGS.get(value.strip().lower(), value)
+    return value
+
+
+def _check_type(value, param_type) -> str:
+    """Checks a parameter value against its type in the command definitions.
+
+    Returns:
+        str: A description of the problem, or None if the value is valid.
+    """
+    if isinstance(param_type, list):
+        if value not in param_type:
+            return f"must be one of {', '.join(param_type)}, not {value!r}"
+        return None
+    expected = {"str": str, "int": int, "bool": bool}.get(param_type)
+    if expected is None:
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            return f"cannot be exported: {value!r}"
+        return None
+    # A bool is an int in Python, but not a valid int parameter.
+    if not isinstance(value, expected) or (
+        expected is int and isinstance(value, bool)
+    ):
+        return f"must be {param_type}, not {type(value).__name__} {value!r}"
+    return None
+
+
+def compile_graphs(graphs: list) -> tuple:
+    """Compiles logic graphs into the data of the exported bytecode file.
+
+    Graphs with errors are left out, so the runtime never runs a graph that
+    was only partly compiled.
+
+    Args:
+        graphs (list[LogicGraph]): The graphs.
+
+    Returns:
+        tuple: The JSON-compatible data, and a list of CompileErrors.
+    """
+    compiled_graphs = []
+    errors = []
+    for graph in graphs:
+        compiled, graph_errors = compile_graph(graph)
+        errors.extend(graph_errors)
+        if compiled is not None:
+            compiled_graphs.append(compiled)
+    data = {
+        "version": BYTECODE_VERSION,
+        "instruction_width": INSTRUCTION_WIDTH,
+        "opcodes": OPCODES,
+        "graphs": [_graph_data(compiled) for compiled in compiled_graphs],
+    }
+    return data, errors
+
+
+def _graph_data(compiled: CompiledGraph) -> dict:
+    """Returns the JSON-compatible data of a compiled graph."""
+    return {
+        "id": compiled.id,
+        "name": compiled.name,
+        "constants": compiled.constants,
+        "code": compiled.code,
+        "operands": compiled.operands,
+        "targets": compiled.targets,
+        "entry": compiled.entry,
+        "node_ids": compiled.node_ids,
+    }
+
+
+def load_compiled_graphs(data: dict) -> List[CompiledGraph]:
+    """Loads compiled graphs from the data of an exported bytecode file.
+
+    Args:
+        data (dict): The loaded file.
+
+    Returns:
+        list[CompiledGraph]: The compiled graphs.
+
+    Raises:
+        ValueError: If the file is from a different version of the format.
+    """
+    if data.get("version") != BYTECODE_VERSION:
+        raise ValueError(f"Unsupported bytecode version: {data.get('version')}")
+    return [CompiledGraph(**graph) for graph in data["graphs"]]
+
+
+def disassemble(compiled: CompiledGraph) -> str:
+    """Formats a compiled graph as readable assembly, for debugging.
+
+    Args:
+        compiled (CompiledGraph): The compiled graph.
+
+    Returns:
+        str: One line per instruction, after a header with the graph's ID,
+        name and entry points.
+    """
+    mnemonics = {opcode: name for name, opcode in OPCODES.items()}
+    entry = ", ".join(map(str, compiled.entry)) or "none"
+    lines = [f"graph {compiled.id} {json.dumps(compiled.name)}", f"  entry: {entry}"]
+    width = max((len(node_id) for node_id in compiled.node_ids), default=0)
+    for pc in range(len(compiled)):
+        opcode, operands, targets = compiled.instruction(pc)
+        mnemonic = mnemonics.get(opcode, f"OP_{opcode:#04x}")
+        if mnemonic in CONDITION_OPCODES:
+            names = list(COMMAND_DEFINITIONS["conditions"][mnemonic]["params"])
+        elif mnemonic in ACTION_OPCODES:
+            names = list(COMMAND_DEFINITIONS["actions"][mnemonic]["params"])
+        elif opcode == OPCODE_SAY:
+            names = ["Character", "Text"]
+        else:
+            names = []
+        arguments = [
+            f"{name}={json.dumps(value, ensure_ascii=False)}"
+            for name, value in zip(names, operands)
+        ]
+        if mnemonic in CONDITION_OPCODES:
+            success = targets[0] if targets else "end"
+            failure = targets[1] if len(targets) > 1 else "end"
+            flow = f"-> {success} else {failure}"
+        else:
+            flow = "-> " + (", ".join(map(str, targets)) or "end")
+        lines.append(
+            f"  {pc:4}  {compiled.node_ids[pc]:<{width}}  {mnemonic:<20} "
+            f"{', '.join(arguments)}  {flow}".rstrip()
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list = None):
+    """Disassembles the graphs in an exported bytecode file."""
+    parser = argparse.ArgumentParser(description="Disassembles compiled logic graphs.")
+    parser.add_argument("path", help="an exported LogicGraphs.bytecode.json file")
+    parser.add_argument("graphs", nargs="*", help="the IDs of the graphs to show")
+    args = parser.parse_args(argv)
+    with open(args.path) as f:
+        compiled_graphs = load_compiled_graphs(json.load(f))
+    shown = [
+        compiled
+        for compiled in compiled_graphs
+        if not args.graphs or compiled.id in args.graphs
+    ]
+    print("\n\n".join(disassemble(compiled) for compiled in shown))
+
+
+if __name__ == "__main__":
+    main()
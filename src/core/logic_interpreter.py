@@ -0,0 +1,774 @@
+"""Runs compiled logic graphs without Unreal or GTK.
+
+This module provides the LogicInterpreter class, which runs the instruction
+tables that `logic_compiler` exports against a GameState, a compact model of
+the game world: global variables, inventory, attributes, currency, hotspot
+locks, entity visibility, visited scenes and quest progress. Every condition
+and action in COMMAND_DEFINITIONS has a handler here, so a puzzle can be
+checked from a script, or thousands of times a second from a simulation,
+instead of by launching the game.
+
+The interpreter does not use the GTK-based schemas: opcodes are read from
+the exported file, and project data is read as plain data, so it runs
+wherever Python does. Run this module to try graphs from the command line;
+the project must have been exported first:
+
+    python3 -m advengine.core.logic_interpreter MyGame graph_open_door \\
+        --set door_locked=false --give key_brass --repeat 10000
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from .project_store import DATABASE_FILENAME, SQLiteProjectStore
+
+# The exported compiled graphs, relative to the project directory. These and
+# BYTECODE_VERSION match ue_exporter and logic_compiler, which are not
+# imported because they need the GTK-based schemas.
+BYTECODE_PATH = os.path.join("Logic", "LogicGraphs.bytecode.json")
+DIALOGUE_BYTECODE_PATH = os.path.join("Dialogues", "DialogueGraphs.bytecode.json")
+
+# The project files of the collections the interpreter and simulator read,
+# relative to the project directory, for projects without a database.
+COLLECTION_FILES = {
+    "global_variables": os.path.join("Data", "GlobalState.json"),
+    "attributes": os.path.join("Data", "Attributes.csv"),
+    "scenes": os.path.join("Logic", "Scenes.json"),
+    "interactions": os.path.join("Logic", "Interactions.json"),
+    "quests": os.path.join("Logic", "Quests.json"),
+}
+
+# The version of the compiled format this interpreter runs.
+BYTECODE_VERSION = 1
+
+# The number of instructions a single run may execute before it is stopped,
+# so that a graph whose connections loop cannot run forever.
+MAX_STEPS = 10000
+
+# The time of day at the start of a game.
+DEFAULT_TIME_OF_DAY = "Day"
+
+# The comparison operators of ATTRIBUTE_CHECK.
+_COMPARISONS = {
+    "==": lambda a, b: a == b,
+    ">": lambda a, b: a > b,
+    "<": lambda a, b: a < b,
+    ">=": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+}
+
+# The strings that mean True when a bool variable is set from text.
+_TRUE_STRINGS = frozenset(("true", "1", "yes"))
+
+
+class InterpreterError(Exception):
+    """Raised when compiled graphs cannot be loaded or run."""
+
+
+def load_collection(project_path: str, collection: str) -> list:
+    """Reads a data collection of a project without the GTK-based schemas.
+
+    Args:
+        project_path (str): The path of the project directory.
+        collection (str): A key of COLLECTION_FILES, such as "scenes".
+
+    Returns:
+        list[dict]: The collection's objects as plain data, or an empty list
+        if the project does not have the collection. Values read from a CSV
+        file are strings.
+    """
+    if SQLiteProjectStore.exists(project_path):
+        store = SQLiteProjectStore(os.path.join(project_path, DATABASE_FILENAME))
+        try:
+            return store.load(collection, dict)
+        finally:
+            store.close()
+    path = os.path.join(project_path, COLLECTION_FILES[collection])
+    try:
+        with open(path, newline="") as f:
+            if path.endswith(".csv"):
+                return list(csv.DictReader(f))
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+@dataclass(slots=True)
+class GameState:
+    """The state of the game world that logic graphs read and change.
+
+    Attributes:
+        variables (Dict[str, Any]): Global variable values, keyed by ID.
+        variable_types (Dict[str, str]): The declared type of each global
+            variable ("bool", "int" or "str"), used to convert values that
+            were entered as text.
+        inventory (Dict[str, int]): The number of each item the player has.
+        attributes (Dict[str, int]): Attribute values, keyed by ID.
+        attribute_limits (Dict[str, int]): The maximum value of each
+            attribute that has one.
+        currency (int): The player's money.
+        scene (str): The ID of the current scene, or None.
+        spawn_point (str): The spawn point of the last scene transition.
+        visited_scenes (Dict[str, int]): The number of times each scene has
+            been entered.
+        locked_hotspots (Set[str]): The IDs of the locked hotspots.
+        hidden_entities (Set[str]): The IDs of the hidden entities.
+        entity_positions (Dict[str, tuple]): Where SHOW_ENTITY last placed
+            each entity.
+        entity_items (Dict[str, Set[str]]): The items each entity holds.
+        animations (Dict[str, tuple]): The animation key and loop flag last
+            set on each target.
+        walk_meshes (Dict[str, str]): The active walk mesh of each scene.
+        player_position (tuple): The player's position.
+        cursor_mode (str): "Contextual" or "Classic".
+        time_of_day (str): "Night", "Morning", "Day" or "Evening".
+        failed_checks (Set[str]): The IDs of the checks the player failed.
+        started_quests (Set[str]): The IDs of the started quests.
+        completed_objectives (Set[tuple]): (quest ID, objective ID) pairs.
+        events (List[tuple]): The dialogue lines and effects that have no
+            state of their own, such as sounds, in the order they happened.
+    """
+
+    variables: Dict[str, Any] = field(default_factory=dict)
+    variable_types: Dict[str, str] = field(default_factory=dict)
+    inventory: Dict[str, int] = field(default_factory=dict)
+    attributes: Dict[str, int] = field(default_factory=dict)
+    attribute_limits: Dict[str, int] = field(default_factory=dict)
+    currency: int = 0
+    scene: Optional[str] = None
+    spawn_point: Optional[str] = None
+    visited_scenes: Dict[str, int] = field(default_factory=dict)
+    locked_hotspots: Set[str] = field(default_factory=set)
+    hidden_entities: Set[str] = field(default_factory=set)
+    entity_positions: Dict[str, tuple] = field(default_factory=dict)
+    entity_items: Dict[str, Set[str]] = field(default_factory=dict)
+    animations: Dict[str, tuple] = field(default_factory=dict)
+    walk_meshes: Dict[str, str] = field(default_factory=dict)
+    player_position: tuple = (0, 0)
+    cursor_mode: str = "Contextual"
+    time_of_day: str = DEFAULT_TIME_OF_DAY
+    failed_checks: Set[str] = field(default_factory=set)
+    started_quests: Set[str] = field(default_factory=set)
+    completed_objectives: Set[tuple] = field(default_factory=set)
+    events: List[tuple] = field(default_factory=list)
+
+    @classmethod
+    def from_project(cls, data) -> "GameState":
+        """Creates the state at the start of a game.
+
+        Args:
+            data (ProjectData): The project data. Only its global variables
+                and attributes are read.
+
+        Returns:
+            GameState: The new state.
+        """
+        state = cls()
+        for variable in data.global_variables:
+            state.variable_types[variable.id] = variable.type
+            state.variables[variable.id] = state.convert(
+                variable.id, variable.initial_value
+            )
+        for attribute in data.attributes:
+            state.attributes[attribute.id] = int(attribute.initial_value)
+            state.attribute_limits[attribute.id] = int(attribute.max_value)
+        return state
+
+    @classmethod
+    def load(cls, project_path: str) -> "GameState":
+        """Creates the state at the start of a game from a project's data.
+
+        Only the project's global variables and attributes are read, with
+        `load_collection`.
+
+        Args:
+            project_path (str): The path of the project directory.
+
+        Returns:
+            GameState: The new state.
+        """
+        state = cls()
+        for variable in load_collection(project_path, "global_variables"):
+            state.variable_types[variable["id"]] = variable.get("type", "str")
+            state.variables[variable["id"]] = state.convert(
+                variable["id"], variable.get("initial_value")
+            )
+        for attribute in load_collection(project_path, "attributes"):
+            state.attributes[attribute["id"]] = int(attribute["initial_value"] or 0)
+            if attribute.get("max_value") not in (None, ""):
+                state.attribute_limits[attribute["id"]] = int(attribute["max_value"])
+        return state
+
+    def convert(self, name: str, value) -> Any:
+        """Converts a value to the declared type of a global variable.
+
+        Values of "any" parameters are usually entered as text, so "false"
+        must become False before it is stored in a bool variable.
+
+        Args:
+            name (str): The ID of the variable.
+            value (Any): The value.
+
+        Returns:
+            Any: The converted value, or the value as it is if the variable
+            has no declared type or the value cannot be converted.
+        """
+        variable_type = self.variable_types.get(name)
+        if not isinstance(value, str) or variable_type not in ("bool", "int"):
+            return value
+        if variable_type == "bool":
+            return value.strip().lower() in _TRUE_STRINGS
+        try:
+            return int(value)
+        except ValueError:
+            return value
+
+    def copy(self) -> "GameState":
+        """Returns a copy that can be changed without changing this state."""
+        return GameState(
+            variables=dict(self.variables),
+            variable_types=self.variable_types,
+            inventory=dict(self.inventory),
+            attributes=dict(self.attributes),
+            attribute_limits=self.attribute_limits,
+            currency=self.currency,
+            scene=self.scene,
+            spawn_point=self.spawn_point,
+            visited_scenes=dict(self.visited_scenes),
+            locked_hotspots=set(self.locked_hotspots),
+            hidden_entities=set(self.hidden_entities),
+            entity_positions=dict(self.entity_positions),
+            entity_items={
+                entity: set(items) for entity, items in self.entity_items.items()
+            },
+            animations=dict(self.animations),
+            walk_meshes=dict(self.walk_meshes),
+            player_position=self.player_position,
+            cursor_mode=self.cursor_mode,
+            time_of_day=self.time_of_day,
+            failed_checks=set(self.failed_checks),
+            started_quests=set(self.started_quests),
+            completed_objectives=set(self.completed_objectives),
+            events=list(self.events),
+        )
+
+
+# Conditions. Each returns whether the condition holds.
+
+
+def _variable_equals(state, name, value):
+    """Checks whether a global variable has a value."""
+    return state.variables.get(name) == state.convert(name, value)
+
+
+def _has_item(state, item_id, amount):
+    """Checks whether the player holds at least an amount of an item."""
+    return state.inventory.get(item_id, 0) >= (amount or 1)
+
+
+def _attribute_check(state, attribute_id, value, comparison):
+    """Compares an attribute with a value."""
+    return _COMPARISONS[comparison](state.attributes.get(attribute_id, 0), value)
+
+
+def _hotspot_locked(state, hotspot_id, locked):
+    """Checks whether a hotspot's lock state is as given."""
+    return (hotspot_id in state.locked_hotspots) == locked
+
+
+def _entity_visible(state, entity_id, visible):
+    """Checks whether an entity's visibility is as given."""
+    return (entity_id not in state.hidden_entities) == visible
+
+
+def _scene_visited(state, scene_id, times):
+    """Checks whether a scene was entered at least a number of times."""
+    return state.visited_scenes.get(scene_id, 0) >= (times or 1)
+
+
+def _currency_ge(state, amount):
+    """Checks whether the player has at least an amount of money."""
+    return state.currency >= amount
+
+
+def _has_failed_check(state, check_id):
+    """Checks whether the player failed a check."""
+    return check_id in state.failed_checks
+
+
+def _entity_has_item(state, entity_id, item_id):
+    """Checks whether an entity holds an item."""
+    return item_id in state.entity_items.get(entity_id, ())
+
+
+def _walk_mesh_active(state, mesh_id, active):
+    """Checks whether a walk mesh's state in the current scene is as given."""
+    return (state.walk_meshes.get(state.scene) == mesh_id) == active
+
+
+def _time_of_day_is(state, time_state):
+    """Checks the time of day."""
+    return state.time_of_day == time_state
+
+
+CONDITION_HANDLERS = {
+    "VARIABLE_EQUALS": _variable_equals,
+    "HAS_ITEM": _has_item,
+    "ATTRIBUTE_CHECK": _attribute_check,
+    "HOTSPOT_LOCKED": _hotspot_locked,
+    "ENTITY_VISIBLE": _entity_visible,
+    "SCENE_VISITED": _scene_visited,
+    "CURRENCY_GE": _currency_ge,
+    "HAS_FAILED_CHECK": _has_failed_check,
+    "ENTITY_HAS_ITEM": _entity_has_item,
+    "WALK_MESH_ACTIVE": _walk_mesh_active,
+    "TIME_OF_DAY_IS": _time_of_day_is,
+}
+
+
+# Actions. An unset Amount means one item.
+
+
+def _set_variable(state, name, value):
+    """Sets a global variable."""
+    state.variables[name] = state.convert(name, value)
+
+
+def _inventory_add(state, item_id, amount):
+    """Gives the player an amount of an item."""
+    state.inventory[item_id] = state.inventory.get(item_id, 0) + (amount or 1)
+
+
+def _inventory_remove(state, item_id, amount):
+    """Takes an amount of an item from the player."""
+    count = state.inventory.get(item_id, 0) - (amount or 1)
+    if count > 0:
+        state.inventory[item_id] = count
+    else:
+        state.inventory.pop(item_id, None)
+
+
+def _scene_transition(state, scene_id, spawn_point):
+    """Moves the player to a scene and counts the visit."""
+    state.scene = scene_id
+    state.spawn_point = spawn_point
+    state.visited_scenes[scene_id] = state.visited_scenes.get(scene_id, 0) + 1
+
+
+def _modify_attribute(state, attribute_id, value):
+    """Adds to an attribute, up to its maximum."""
+    value += state.attributes.get(attribute_id, 0)
+    limit = state.attribute_limits.get(attribute_id)
+    state.attributes[attribute_id] = value if limit is None else min(value, limit)
+
+
+def _unlock_hotspot(state, hotspot_id):
+    """Unlocks a hotspot."""
+    state.locked_hotspots.discard(hotspot_id)
+
+
+def _lock_hotspot(state, hotspot_id):
+    """Locks a hotspot."""
+    state.locked_hotspots.add(hotspot_id)
+
+
+def _set_animation(state, target_id, animation_key, loop):
+    """Sets the animation of a target."""
+    state.animations[target_id] = (animation_key, loop)
+
+
+def _hide_entity(state, entity_id):
+    """Hides an entity."""
+    state.hidden_entities.add(entity_id)
+
+
+def _show_entity(state, entity_id, x, y):
+    """Shows an entity at a position."""
+    state.hidden_entities.discard(entity_id)
+    state.entity_positions[entity_id] = (x, y)
+
+
+def _set_cursor_mode(state, mode):
+    """Sets the cursor mode."""
+    state.cursor_mode = mode
+
+
+def _set_walk_mesh(state, scene_id, mesh_id):
+    """Sets the walk mesh of a scene, or of the current scene."""
+    state.walk_meshes[scene_id or state.scene] = mesh_id
+
+
+def _set_player_pos(state, x, y):
+    """Moves the player."""
+    state.player_position = (x, y)
+
+
+def _give_currency(state, amount):
+    """Gives the player money."""
+    state.currency += amount
+
+
+def _take_currency(state, amount):
+    """Takes money from the player, down to zero."""
+    state.currency = max(0, state.currency - amount)
+
+
+def _start_quest(state, quest_id):
+    """Starts a quest."""
+    state.started_quests.add(quest_id)
+
+
+def _complete_objective(state, quest_id, objective_id):
+    """Completes a quest objective, starting the quest if needed."""
+    state.started_quests.add(quest_id)
+    state.completed_objectives.add((quest_id, objective_id))
+
+
+def _event(mnemonic: str) -> callable:
+    """Creates a handler that only records an event, such as a sound."""
+
+    def handler(state, *operands):
+        """Records the event and its operands."""
+        state.events.append((mnemonic, *operands))
+
+    return handler
+
+
+ACTION_HANDLERS = {
+    "SET_VARIABLE": _set_variable,
+    "INVENTORY_ADD": _inventory_add,
+    "INVENTORY_REMOVE": _inventory_remove,
+    "SCENE_TRANSITION": _scene_transition,
+    "SHOP_OPEN": _event("SHOP_OPEN"),
+    "MODIFY_ATTRIBUTE": _modify_attribute,
+    "PLAY_CINEMATIC": _event("PLAY_CINEMATIC"),
+    "PLAY_SFX": _event("PLAY_SFX"),
+    "UNLOCK_HOTSPOT": _unlock_hotspot,
+    "LOCK_HOTSPOT": _lock_hotspot,
+    "SET_ANIMATION": _set_animation,
+    "HIDE_ENTITY": _hide_entity,
+    "SHOW_ENTITY": _show_entity,
+    "SET_CURSOR_MODE": _set_cursor_mode,
+    "SET_WALK_MESH": _set_walk_mesh,
+    "SET_PLAYER_POS": _set_player_pos,
+    "GIVE_CURRENCY": _give_currency,
+    "TAKE_CURRENCY": _take_currency,
+    "PLAY_SOUND_2D": _event("PLAY_SOUND_2D"),
+    "SHOW_DIALOGUE_CHOICES": _event("SHOW_DIALOGUE_CHOICES"),
+    "FORCE_SAVE": _event("FORCE_SAVE"),
+    "START_QUEST": _start_quest,
+    "COMPLETE_OBJECTIVE": _complete_objective,
+    # Nodes without a command.
+    "NOP": None,
+    "SAY": _event("SAY"),
+}
+
+
+@dataclass
+class RunResult:
+    """Describes one run of a logic graph.
+
+    Attributes:
+        graph_id (str): The ID of the graph.
+        trace (List[int]): The instructions that ran, in order.
+        finished (bool): False if the run was stopped after too many steps.
+    """
+
+    graph_id: str
+    trace: List[int] = field(default_factory=list)
+    finished: bool = True
+
+
+class Program:
+    """A compiled graph, prepared to run.
+
+    Attributes:
+        id (str): The ID of the graph.
+        name (str): The name of the graph.
+        instructions (list[tuple]): For each instruction, whether it is a
+            condition, its handler, its operand values, and its targets;
+            the targets of other instructions are reversed, ready to be
+            pushed on the run stack.
+        entry (tuple): The instructions the graph starts at, reversed.
+        node_ids (list[str]): The node each instruction was compiled from.
+        mnemonics (list[str]): The command of each instruction, such as
+            "SAY" or "HAS_ITEM".
+    """
+
+    def __init__(self, data: dict, width: int, handlers: dict):
+        """Prepares a graph from the data of an exported bytecode file.
+
+        Args:
+            data (dict): The graph's data.
+            width (int): The number of integers in each instruction.
+            handlers (dict): (mnemonic, is condition, handler) tuples, keyed
+                by opcode.
+        """
+        self.id = data["id"]
+        self.name = data["name"]
+        self.node_ids = data["node_ids"]
+        self.entry = tuple(reversed(data["entry"]))
+        constants, operands, targets = (
+            data["constants"],
+            data["operands"],
+            data["targets"],
+        )
+        code = data["code"]
+        self.instructions = []
+        self.mnemonics = []
+        for start in range(0, len(code), width):
+            opcode, first_operand, operand_count, first_target, target_count = code[
+                start : start + width
+            ]
+            if opcode not in handlers:
+                raise InterpreterError(f"Unknown opcode {opcode} in graph {self.id}")
+            mnemonic, is_condition, handler = handlers[opcode]
+            values = tuple(
+                constants[index]
+                for index in operands[first_operand : first_operand + operand_count]
+            )
+            next_pcs = tuple(targets[first_target : first_target + target_count])
+            if not is_condition:
+                next_pcs = next_pcs[::-1]
+            self.instructions.append((is_condition, handler, values, next_pcs))
+            self.mnemonics.append(mnemonic)
+
+
+class LogicInterpreter:
+    """Runs compiled logic graphs against a GameState.
+
+    A run starts at each of the graph's entry points in turn. A condition
+    continues to its first target if it holds and to its second, if there
+    is one, if it does not; any other instruction continues to each of its
+    targets in turn, depth first.
+
+    Attributes:
+        programs (Dict[str, Program]): The prepared graphs, keyed by ID.
+        errors (list): The problems that kept graphs from compiling, when
+            the interpreter was created with `from_graphs`.
+    """
+
+    def __init__(self, data: dict):
+        """Prepares the graphs of an exported bytecode file.
+
+        Args:
+            data (dict): The loaded file.
+
+        Raises:
+            InterpreterError: If the file is from a different version of the
+                format, or uses a command this interpreter does not know.
+        """
+        self.programs = {}
+        self.errors = []
+        self.add_graphs(data)
+
+    def add_graphs(self, data: dict):
+        """Prepares the graphs of another exported bytecode file.
+
+        A graph whose ID is already taken is left out, so logic graphs win
+        over dialogue graphs that share their ID.
+
+        Args:
+            data (dict): The loaded file.
+
+        Raises:
+            InterpreterError: If the file is from a different version of the
+                format, or uses a command this interpreter does not know.
+        """
+        if data.get("version") != BYTECODE_VERSION:
+            raise InterpreterError(
+                f"Unsupported bytecode version: {data.get('version')}"
+            )
+        handlers = {}
+        for mnemonic, opcode in data["opcodes"].items():
+            if mnemonic in CONDITION_HANDLERS:
+                handlers[opcode] = (mnemonic, True, CONDITION_HANDLERS[mnemonic])
+            elif mnemonic in ACTION_HANDLERS:
+                handlers[opcode] = (mnemonic, False, ACTION_HANDLERS[mnemonic])
+        width = data["instruction_width"]
+        for graph in data["graphs"]:
+            if graph["id"] not in self.programs:
+                self.programs[graph["id"]] = Program(graph, width, handlers)
+
+    @classmethod
+    def load(cls, path: str) -> "LogicInterpreter":
+        """Loads an exported bytecode file.
+
+        Args:
+            path (str): The path of the file, or of a project directory that
+                has been exported. A project's compiled dialogue graphs are
+                loaded too, if it has them.
+
+        Returns:
+            LogicInterpreter: The interpreter.
+        """
+        if not os.path.isdir(path):
+            with open(path) as f:
+                return cls(json.load(f))
+        with open(os.path.join(path, BYTECODE_PATH)) as f:
+            interpreter = cls(json.load(f))
+        dialogue_path = os.path.join(path, DIALOGUE_BYTECODE_PATH)
+        if os.path.exists(dialogue_path):
+            with open(dialogue_path) as f:
+                interpreter.add_graphs(json.load(f))
+        return interpreter
+
+    @classmethod
+    def from_graphs(
+        cls, graphs: list, dialogue_graphs: list = ()
+    ) -> "LogicInterpreter":
+        """Compiles logic and dialogue graphs and prepares them to run.
+
+        Args:
+            graphs (list[LogicGraph]): The logic graphs.
+            dialogue_graphs (list[LogicGraph], optional): The dialogue graphs.
+
+        Returns:
+            LogicInterpreter: The interpreter. Graphs that did not compile
+            are left out and their problems are listed in `errors`.
+        """
+        # The compiler needs the schemas, which this module otherwise avoids.
+        from .logic_compiler import compile_graphs
+
+        data, errors = compile_graphs(graphs)
+        interpreter = cls(data)
+        dialogue_data, dialogue_errors = compile_graphs(dialogue_graphs)
+        interpreter.add_graphs(dialogue_data)
+        interpreter.errors = errors + dialogue_errors
+        return interpreter
+
+    def run(
+        self, graph_id: str, state: GameState, max_steps: int = MAX_STEPS
+    ) -> RunResult:
+        """Runs a graph, changing the state.
+
+        Args:
+            graph_id (str): The ID of the graph.
+            state (GameState): The state to run against.
+            max_steps (int, optional): The number of instructions after
+                which the run is stopped. Defaults to MAX_STEPS.
+
+        Returns:
+            RunResult: The instructions that ran.
+
+        Raises:
+            InterpreterError: If there is no such graph.
+        """
+        program = self.programs.get(graph_id)
+        if program is None:
+            raise InterpreterError(f"Unknown logic graph: {graph_id}")
+        instructions = program.instructions
+        trace = []
+        stack = list(program.entry)
+        while stack:
+            if len(trace) >= max_steps:
+                return RunResult(graph_id, trace, finished=False)
+            pc = stack.pop()
+            trace.append(pc)
+            is_condition, handler, operands, targets = instructions[pc]
+            if is_condition:
+                branch = 0 if handler(state, *operands) else 1
+                if branch < len(targets):
+                    stack.append(targets[branch])
+            else:
+                if handler is not None:
+                    handler(state, *operands)
+                stack.extend(targets)
+        return RunResult(graph_id, trace)
+
+
+def _parse_value(text: str) -> Any:
+    """Parses a command-line value as JSON, or keeps it as text."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def main(argv: list = None):
+    """Runs logic graphs from the command line and prints what they did."""
+    parser = argparse.ArgumentParser(description="Runs compiled logic graphs.")
+    parser.add_argument(
+        "project", help="an exported project directory or bytecode file"
+    )
+    parser.add_argument("graphs", nargs="+", help="the IDs of the graphs to run")
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="set a global variable first",
+    )
+    parser.add_argument(
+        "--give",
+        action="append",
+        default=[],
+        metavar="ITEM[=COUNT]",
+        help="add an item to the inventory first",
+    )
+    parser.add_argument("--scene", help="the scene the player is in")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="run the graphs this many times on fresh state and report the rate",
+    )
+    parser.add_argument("--max-steps", type=int, default=MAX_STEPS)
+    args = parser.parse_args(argv)
+
+    try:
+        interpreter = LogicInterpreter.load(args.project)
+    except (OSError, ValueError, InterpreterError) as e:
+        parser.exit(1, f"Cannot load compiled graphs (export the project first): {e}\n")
+    project_path = args.project if os.path.isdir(args.project) else None
+    initial = GameState.load(project_path) if project_path else GameState()
+    for assignment in args.set:
+        name, _, value = assignment.partition("=")
+        initial.variables[name] = initial.convert(name, _parse_value(value))
+    for gift in args.give:
+        item_id, _, count = gift.partition("=")
+        initial.inventory[item_id] = initial.inventory.get(item_id, 0) + int(
+            count or 1
+        )
+    if args.scene:
+        _scene_transition(initial, args.scene, None)
+
+    start = time.perf_counter()
+    for _ in range(max(args.repeat, 1)):
+        state = initial.copy()
+        try:
+            results = [
+                interpreter.run(graph_id, state, args.max_steps)
+                for graph_id in args.graphs
+            ]
+        except InterpreterError as e:
+            parser.exit(1, f"{e}\n")
+    seconds = time.perf_counter() - start
+
+    for result in results:
+        program = interpreter.programs[result.graph_id]
+        path = " -> ".join(program.node_ids[pc] for pc in result.trace) or "(empty)"
+        status = "" if result.finished else f" (stopped after {args.max_steps} steps)"
+        print(f"{result.graph_id}: {path}{status}")
+    for event in state.events:
+        print("  " + " ".join(map(str, event)))
+    for name in ("variables", "inventory", "attributes", "visited_scenes"):
+        before, after = getattr(initial, name), getattr(state, name)
+        changes = {
+            key: value for key, value in after.items() if before.get(key) != value
+        }
+        changes.update({key: None for key in before if key not in after})
+        if changes:
+            print(f"{name}: {json.dumps(changes, default=str)}")
+    if args.repeat > 1:
+        runs = args.repeat * len(args.graphs)
+        print(f"{runs} graph runs in {seconds:.3f} s ({runs / seconds:,.0f} runs/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,722 @@
+"""Randomized playthroughs of a project, run in parallel.
+
+This module provides the PlaythroughSimulator class, which plays a project
+many times over with random choices, using the headless LogicInterpreter
+instead of the game. Each step of a playthrough picks one of the
+interactions available to the player at random: its hotspot must be in the
+current scene, visible and not locked, and the player must hold its items.
+LOCK_HOTSPOT and UNLOCK_HOTSPOT actions therefore gate progress, as a
+locked door does in the game. The interaction's logic or dialogue graph
+is run, so SCENE_TRANSITION actions move the player on to the next scene.
+
+A playthrough ends when every quest is complete, when it is soft-locked,
+or when it reaches the step limit. It counts as soft-locked when no
+interaction is available, or when STALL_STEPS interactions in a row have
+left the game state unchanged. A project without interactions or quests
+has nothing to play, and its playthroughs end before they start. The
+results of all playthroughs are combined into a SimulationReport: outcome
+and quest completion rates, the logic and dialogue nodes that were
+reached, the dialogue that never was, and seeds that reproduce each
+soft-lock.
+
+Playthroughs are spread over a pool of worker processes. Each one uses its
+own seed, so a report does not depend on the number of workers, and any
+playthrough can be replayed alone. Run this module to simulate an exported
+project:
+
+    python3 -m advengine.core.playthrough_simulator MyGame --runs 5000
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from .logic_interpreter import (
+    BYTECODE_PATH,
+    DIALOGUE_BYTECODE_PATH,
+    GameState,
+    InterpreterError,
+    LogicInterpreter,
+    load_collection,
+)
+
+# The number of interactions a playthrough may run before it is stopped.
+MAX_STEPS = 500
+
+# The number of interactions in a row that leave the game state unchanged
+# before a playthrough counts as soft-locked.
+STALL_STEPS = 100
+
+# The number of state-changing interactions before a soft-lock that a
+# report lists.
+TRAIL_LENGTH = 10
+
+# The number of soft-locks a report describes in detail.
+MAX_SOFT_LOCK_EXAMPLES = 20
+
+# The outcomes of a playthrough.
+OUTCOME_COMPLETED = "completed"
+OUTCOME_SOFT_LOCK = "soft-lock"
+OUTCOME_STEP_LIMIT = "step limit"
+OUTCOME_NOTHING_TO_PLAY = "nothing to play"
+
+
+@dataclass
+class PlaythroughResult:
+    """Describes one randomized playthrough.
+
+    Attributes:
+        seed (int): The seed of the playthrough's random choices.
+        outcome (str): OUTCOME_COMPLETED, OUTCOME_SOFT_LOCK,
+            OUTCOME_STEP_LIMIT or OUTCOME_NOTHING_TO_PLAY.
+        steps (int): The number of interactions that were run.
+        scene (str): The scene the playthrough ended in.
+        coverage (Dict[str, List[int]]): The instructions that ran, keyed
+            by graph ID.
+        completed_quests (List[str]): The IDs of the completed quests.
+        completed_objectives (List[list]): (quest ID, objective ID) pairs.
+        available (List[str]): The IDs of the interactions that were
+            available at least once.
+        runaway_graphs (List[str]): The IDs of the graphs that were stopped
+            for running too many instructions.
+        trail (List[str]): The IDs of the last interactions that changed
+            the game state.
+        inventory (Dict[str, int]): The inventory at the end.
+    """
+
+    seed: int
+    outcome: str
+    steps: int
+    scene: Optional[str]
+    coverage: Dict[str, List[int]] = field(default_factory=dict)
+    completed_quests: List[str] = field(default_factory=list)
+    completed_objectives: List[list] = field(default_factory=list)
+    available: List[str] = field(default_factory=list)
+    runaway_graphs: List[str] = field(default_factory=list)
+    trail: List[str] = field(default_factory=list)
+    inventory: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class SimulationReport:
+    """Combines the results of many playthroughs.
+
+    Attributes:
+        playthroughs (int): The number of playthroughs.
+        seconds (float): The time the simulation took.
+        workers (int): The number of worker processes.
+        outcomes (Dict[str, int]): The number of playthroughs with each
+            outcome.
+        quest_completion (Dict[str, float]): The share of playthroughs that
+            completed each quest, from 0 to 1.
+        objective_completion (Dict[str, float]): The same for each objective,
+            keyed by "quest ID/objective ID".
+        node_coverage (Dict[str, Dict[str, int]]): The number of
+            playthroughs that reached each node, keyed by graph ID and node
+            ID.
+        unreached_nodes (List[str]): The nodes no playthrough reached, as
+            "graph ID/node ID".
+        unreachable_dialogue (List[dict]): The dialogue lines no playthrough
+            reached, with their graph, node, character and text.
+        soft_locks (List[dict]): The first soft-locked playthroughs, with
+            the seed, scene, inventory and last state-changing interactions
+            of each.
+        unavailable_interactions (List[str]): The IDs of the interactions
+            that were never available.
+        broken_interactions (List[str]): The IDs of the interactions whose
+            logic graph does not exist or did not compile.
+        runaway_graphs (Dict[str, int]): The number of playthroughs in which
+            each graph ran into the interpreter's step limit.
+    """
+
+    playthroughs: int = 0
+    seconds: float = 0.0
+    workers: int = 1
+    outcomes: Dict[str, int] = field(default_factory=dict)
+    quest_completion: Dict[str, float] = field(default_factory=dict)
+    objective_completion: Dict[str, float] = field(default_factory=dict)
+    node_coverage: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    unreached_nodes: List[str] = field(default_factory=list)
+    unreachable_dialogue: List[dict] = field(default_factory=list)
+    soft_locks: List[dict] = field(default_factory=list)
+    unavailable_interactions: List[str] = field(default_factory=list)
+    broken_interactions: List[str] = field(default_factory=list)
+    runaway_graphs: Dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        """Formats the report as text."""
+        total = max(self.playthroughs, 1)
+        lines = [
+            f"{self.playthroughs} playthroughs in {self.seconds:.1f} s "
+            f"({self.workers} worker(s))",
+            "Outcomes: "
+            + ", ".join(
+                f"{outcome} {count} ({count / total:.1%})"
+                for outcome, count in self.outcomes.items()
+            ),
+        ]
+        if self.quest_completion:
+            lines.append("Quest completion:")
+            lines += [
+                f"  {quest_id:<30} {rate:7.1%}"
+                for quest_id, rate in self.quest_completion.items()
+            ]
+        node_count = sum(len(nodes) for nodes in self.node_coverage.values())
+        reached = node_count - len(self.unreached_nodes)
+        lines.append(
+            f"Node coverage: {reached}/{node_count} nodes "
+            f"({reached / max(node_count, 1):.1%})"
+        )
+        sections = [
+            ("Unreached nodes", self.unreached_nodes),
+            (
+                "Unreachable dialogue",
+                [
+                    f"{line['graph']}/{line['node']}: "
+                    f"{line['character']}: {json.dumps(line['text'])}"
+                    for line in self.unreachable_dialogue
+                ],
+            ),
+            (
+                "Soft-locks",
+                [
+                    f"seed {lock['seed']} in {lock['scene']} after "
+                    f"{' > '.join(lock['trail']) or 'no interactions'}, "
+                    f"holding {json.dumps(lock['inventory'])}"
+                    for lock in self.soft_locks
+                ],
+            ),
+            ("Interactions never available", self.unavailable_interactions),
+            ("Interactions without a compiled graph", self.broken_interactions),
+            (
+                "Graphs stopped for looping",
+                [
+                    f"{graph_id} in {count} playthrough(s)"
+                    for graph_id, count in self.runaway_graphs.items()
+                ],
+            ),
+        ]
+        for title, entries in sections:
+            if entries:
+                lines.append(f"{title} ({len(entries)}):")
+                lines += [f"  {entry}" for entry in entries]
+        return "\n".join(lines)
+
+
+@dataclass
+class World:
+    """The parts of a project that playthroughs use, as plain data.
+
+    A World is sent to every worker process, so it only holds data that can
+    be pickled; each worker prepares its own interpreter from `bytecode`
+    and `dialogue_bytecode`.
+
+    Attributes:
+        bytecode (dict): The exported compiled logic graphs.
+        initial_state (GameState): The state at the start of a game.
+        start_scene (str): The scene a playthrough starts in.
+        scene_hotspots (Dict[str, set]): The hotspot IDs of each scene.
+        interactions (List[tuple]): For each interaction, its ID, logic
+            graph ID, item IDs and target hotspot ID.
+        quests (Dict[str, tuple]): The objective IDs of each quest.
+        dialogue_bytecode (dict, optional): The exported compiled dialogue
+            graphs, if the project has them.
+    """
+
+    bytecode: dict
+    initial_state: GameState
+    start_scene: Optional[str]
+    scene_hotspots: Dict[str, set]
+    interactions: List[tuple]
+    quests: Dict[str, tuple]
+    dialogue_bytecode: Optional[dict] = None
+
+    @classmethod
+    def load(cls, project_path: str, start_scene: str = None) -> "World":
+        """Reads an exported project.
+
+        Args:
+            project_path (str): The path of the project directory.
+            start_scene (str, optional): The scene to start in. Defaults to
+                the project's first scene.
+
+        Returns:
+            World: The world.
+
+        Raises:
+            OSError: If the project has not been exported.
+        """
+        with open(os.path.join(project_path, BYTECODE_PATH)) as f:
+            bytecode = json.load(f)
+        dialogue_bytecode = None
+        dialogue_path = os.path.join(project_path, DIALOGUE_BYTECODE_PATH)
+        if os.path.exists(dialogue_path):
+            with open(dialogue_path) as f:
+                dialogue_bytecode = json.load(f)
+        return cls.from_data(
+            bytecode,
+            GameState.load(project_path),
+            load_collection(project_path, "scenes"),
+            load_collection(project_path, "interactions"),
+            load_collection(project_path, "quests"),
+            start_scene,
+            dialogue_bytecode,
+        )
+
+    @classmethod
+    def from_project(cls, data, start_scene: str = None) -> "World":
+        """Builds a world from loaded project data, compiling its graphs.
+
+        Args:
+            data (ProjectData): The project data.
+            start_scene (str, optional): The scene to start in. Defaults to
+                the project's first scene.
+
+        Returns:
+            World: The world.
+        """
+        # The compiler needs the schemas, which this module otherwise avoids.
+        from .logic_compiler import compile_graphs
+        from .schema_codec import encode
+
+        bytecode, _ = compile_graphs(data.logic_graphs)
+        dialogue_bytecode, _ = compile_graphs(data.dialogue_graphs)
+        return cls.from_data(
+            bytecode,
+            GameState.from_project(data),
+            [encode(scene) for scene in data.scenes],
+            [encode(interaction) for interaction in data.interactions],
+            [encode(quest) for quest in data.quests],
+            start_scene,
+            dialogue_bytecode,
+        )
+
+    @classmethod
+    def from_data(
+        cls,
+        bytecode: dict,
+        initial_state: GameState,
+        scenes: list,
+        interactions: list,
+        quests: list,
+        start_scene: str = None,
+        dialogue_bytecode: dict = None,
+    ) -> "World":
+        """Builds a world from the plain data of a project's collections."""
+        scene_hotspots = {
+            scene["id"]: {hotspot["id"] for hotspot in scene.get("hotspots", ())}
+            for scene in scenes
+        }
+        if start_scene is None and scenes:
+            start_scene = scenes[0]["id"]
+        return cls(
+            bytecode=bytecode,
+            dialogue_bytecode=dialogue_bytecode,
+            initial_state=initial_state,
+            start_scene=start_scene,
+            scene_hotspots=scene_hotspots,
+            interactions=[
+                (
+                    interaction["id"],
+                    interaction["logic_graph_id"],
+                    tuple(
+                        item_id
+                        for item_id in (
+                            interaction.get("primary_item_id"),
+                            interaction.get("secondary_item_id"),
+                        )
+                        if item_id
+                    ),
+                    interaction.get("target_hotspot_id") or None,
+                )
+                for interaction in interactions
+            ],
+            quests={
+                quest["id"]: tuple(
+                    objective["id"] for objective in quest.get("objectives", ())
+                )
+                for quest in quests
+            },
+        )
+
+
+class PlaythroughSimulator:
+    """Runs randomized playthroughs of a World.
+
+    Attributes:
+        world (World): The world to play.
+        max_steps (int): The number of interactions after which a
+            playthrough is stopped.
+        stall_steps (int): The number of interactions in a row without a
+            state change after which a playthrough counts as soft-locked.
+    """
+
+    def __init__(
+        self,
+        world: World,
+        max_steps: int = MAX_STEPS,
+        stall_steps: int = STALL_STEPS,
+    ):
+        """Initializes a new PlaythroughSimulator instance.
+
+        Args:
+            world (World): The world to play.
+            max_steps (int, optional): Defaults to MAX_STEPS.
+            stall_steps (int, optional): Defaults to STALL_STEPS.
+        """
+        self.world = world
+        self.max_steps = max_steps
+        self.stall_steps = stall_steps
+        self._interpreter = None
+        self._hotspot_scenes = None
+
+    def run(self, runs: int, seed: int = 0, workers: int = None) -> SimulationReport:
+        """Runs playthroughs and combines their results.
+
+        Args:
+            runs (int): The number of playthroughs.
+            seed (int, optional): The seed of the first playthrough; the
+                others use the following seeds. Defaults to 0.
+            workers (int, optional): The number of worker processes, or 1 to
+                run in this process. Defaults to the number of CPUs.
+
+        Returns:
+            SimulationReport: The report.
+        """
+        started = time.perf_counter()
+        workers = max(1, min(workers or os.cpu_count() or 1, runs))
+        seeds = list(range(seed, seed + runs))
+        if workers == 1:
+            results = [self.play(s) for s in seeds]
+        else:
+            # A few chunks per worker keep the workers busy until the end.
+            size = max(1, runs // (workers * 4))
+            chunks = [seeds[i : i + size] for i in range(0, runs, size)]
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.world, self.max_steps, self.stall_steps),
+            ) as executor:
+                results = [
+                    result
+                    for chunk in executor.map(_play_chunk, chunks)
+                    for result in chunk
+                ]
+        report = self.combine(results)
+        report.workers = workers
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def play(self, seed: int) -> PlaythroughResult:
+        """Runs one playthrough.
+
+        Args:
+            seed (int): The seed of the playthrough's random choices.
+
+        Returns:
+            PlaythroughResult: The result.
+        """
+        interpreter = self._get_interpreter()
+        world = self.world
+        rng = random.Random(seed)
+        state = world.initial_state.copy()
+        if world.start_scene is not None:
+            state.scene = world.start_scene
+            state.visited_scenes[state.scene] = 1
+        if not world.interactions and not world.quests:
+            return PlaythroughResult(
+                seed=seed,
+                outcome=OUTCOME_NOTHING_TO_PLAY,
+                steps=0,
+                scene=state.scene,
+            )
+        coverage = {}
+        available_ids = set()
+        runaway = set()
+        trail = []
+        runnable = [
+            interaction
+            for interaction in world.interactions
+            if interaction[1] in interpreter.programs
+        ]
+        outcome = OUTCOME_STEP_LIMIT
+        steps = 0
+        stalled = 0
+        fingerprint = _fingerprint(state)
+        for _ in range(self.max_steps):
+            if _quests_complete(world.quests, state):
+                outcome = OUTCOME_COMPLETED
+                break
+            available = [
+                interaction
+                for interaction in runnable
+                if self._is_available(interaction, state)
+            ]
+            if not available:
+                outcome = OUTCOME_SOFT_LOCK
+                break
+            available_ids.update(interaction[0] for interaction in available)
+            interaction_id, graph_id, _, _ = rng.choice(available)
+            steps += 1
+            result = interpreter.run(graph_id, state)
+            coverage.setdefault(graph_id, set()).update(result.trace)
+            if not result.finished:
+                runaway.add(graph_id)
+            # Dialogue and sounds are not needed, and would only pile up.
+            state.events.clear()
+            new_fingerprint = _fingerprint(state)
+            if new_fingerprint == fingerprint:
+                stalled += 1
+            else:
+                stalled = 0
+                fingerprint = new_fingerprint
+                trail.append(interaction_id)
+                del trail[:-TRAIL_LENGTH]
+            if stalled >= self.stall_steps:
+                outcome = OUTCOME_SOFT_LOCK
+                break
+        else:
+            if _quests_complete(world.quests, state):
+                outcome = OUTCOME_COMPLETED
+
+        return PlaythroughResult(
+            seed=seed,
+            outcome=outcome,
+            steps=steps,
+            scene=state.scene,
+            coverage={
+                graph_id: sorted(pcs) for graph_id, pcs in coverage.items()
+            },
+            completed_quests=[
+                quest_id
+                for quest_id, objectives in world.quests.items()
+                if _quest_complete(quest_id, objectives, state)
+            ],
+            completed_objectives=sorted(
+                [list(pair) for pair in state.completed_objectives]
+            ),
+            available=sorted(available_ids),
+            runaway_graphs=sorted(runaway),
+            trail=trail,
+            inventory=dict(state.inventory),
+        )
+
+    def combine(self, results: List[PlaythroughResult]) -> SimulationReport:
+        """Combines playthrough results into a report.
+
+        Args:
+            results (list[PlaythroughResult]): The results, in seed order.
+
+        Returns:
+            SimulationReport: The report.
+        """
+        interpreter = self._get_interpreter()
+        world = self.world
+        total = max(len(results), 1)
+        report = SimulationReport(playthroughs=len(results))
+        report.outcomes = {
+            outcome: 0
+            for outcome in (OUTCOME_COMPLETED, OUTCOME_SOFT_LOCK, OUTCOME_STEP_LIMIT)
+        }
+        if not world.interactions and not world.quests:
+            report.outcomes = {OUTCOME_NOTHING_TO_PLAY: 0}
+        quest_counts = dict.fromkeys(world.quests, 0)
+        objective_counts = {
+            f"{quest_id}/{objective_id}": 0
+            for quest_id, objectives in world.quests.items()
+            for objective_id in objectives
+        }
+        reached = {graph_id: {} for graph_id in interpreter.programs}
+        available = set()
+        for result in results:
+            report.outcomes[result.outcome] += 1
+            for quest_id in result.completed_quests:
+                quest_counts[quest_id] += 1
+            for quest_id, objective_id in result.completed_objectives:
+                key = f"{quest_id}/{objective_id}"
+                if key in objective_counts:
+                    objective_counts[key] += 1
+            for graph_id, pcs in result.coverage.items():
+                counts = reached[graph_id]
+                for pc in pcs:
+                    counts[pc] = counts.get(pc, 0) + 1
+            available.update(result.available)
+            for graph_id in result.runaway_graphs:
+                report.runaway_graphs[graph_id] = (
+                    report.runaway_graphs.get(graph_id, 0) + 1
+                )
+            if (
+                result.outcome == OUTCOME_SOFT_LOCK
+                and len(report.soft_locks) < MAX_SOFT_LOCK_EXAMPLES
+            ):
+                report.soft_locks.append(
+                    {
+                        "seed": result.seed,
+                        "scene": result.scene,
+                        "steps": result.steps,
+                        "trail": result.trail,
+                        "inventory": result.inventory,
+                    }
+                )
+
+        report.quest_completion = {
+            quest_id: count / total for quest_id, count in quest_counts.items()
+        }
+        report.objective_completion = {
+            key: count / total for key, count in objective_counts.items()
+        }
+        for graph_id, program in interpreter.programs.items():
+            counts = reached[graph_id]
+            nodes = report.node_coverage.setdefault(graph_id, {})
+            for pc, node_id in enumerate(program.node_ids):
+                nodes[node_id] = max(nodes.get(node_id, 0), counts.get(pc, 0))
+                if pc in counts:
+                    continue
+                report.unreached_nodes.append(f"{graph_id}/{node_id}")
+                if program.mnemonics[pc] == "SAY":
+                    character, text = program.instructions[pc][2]
+                    report.unreachable_dialogue.append(
+                        {
+                            "graph": graph_id,
+                            "node": node_id,
+                            "character": character,
+                            "text": text,
+                        }
+                    )
+        report.unavailable_interactions = [
+            interaction[0]
+            for interaction in world.interactions
+            if interaction[1] in interpreter.programs
+            and interaction[0] not in available
+        ]
+        report.broken_interactions = [
+            interaction[0]
+            for interaction in world.interactions
+            if interaction[1] not in interpreter.programs
+        ]
+        return report
+
+    def _get_interpreter(self) -> LogicInterpreter:
+        """Prepares the interpreter the first time it is needed."""
+        if self._interpreter is None:
+            self._interpreter = LogicInterpreter(self.world.bytecode)
+            if self.world.dialogue_bytecode is not None:
+                self._interpreter.add_graphs(self.world.dialogue_bytecode)
+            self._hotspot_scenes = {
+                hotspot_id: scene_id
+                for scene_id, hotspots in self.world.scene_hotspots.items()
+                for hotspot_id in hotspots
+            }
+        return self._interpreter
+
+    def _is_available(self, interaction: tuple, state: GameState) -> bool:
+        """Checks whether the player can use an interaction.
+
+        An interaction without a target hotspot, or whose target is not a
+        hotspot of any scene, such as a character, can be used anywhere. An
+        interaction whose target is hidden or locked cannot be used.
+        """
+        _, _, item_ids, hotspot_id = interaction
+        for item_id in item_ids:
+            if item_id not in state.inventory:
+                return False
+        if hotspot_id is None:
+            return True
+        if hotspot_id in state.hidden_entities or hotspot_id in state.locked_hotspots:
+            return False
+        scene_id = self._hotspot_scenes.get(hotspot_id)
+        return scene_id is None or scene_id == state.scene
+
+
+def _quest_complete(quest_id: str, objectives: tuple, state: GameState) -> bool:
+    """Checks whether a quest is complete.
+
+    A quest without objectives is complete once it has been started.
+    """
+    if not objectives:
+        return quest_id in state.started_quests
+    return all(
+        (quest_id, objective_id) in state.completed_objectives
+        for objective_id in objectives
+    )
+
+
+def _quests_complete(quests: dict, state: GameState) -> bool:
+    """Checks whether every quest is complete; False if there are none."""
+    return bool(quests) and all(
+        _quest_complete(quest_id, objectives, state)
+        for quest_id, objectives in quests.items()
+    )
+
+
+def _fingerprint(state: GameState) -> tuple:
+    """Copies the parts of a state that gameplay progresses through.
+
+    Fingerprints are only compared for equality, so variables may hold
+    values that cannot be hashed.
+    """
+    return (
+        state.scene,
+        state.currency,
+        dict(state.variables),
+        dict(state.inventory),
+        dict(state.attributes),
+        set(state.locked_hotspots),
+        set(state.hidden_entities),
+        set(state.started_quests),
+        set(state.completed_objectives),
+        set(state.failed_checks),
+    )
+
+
+# The simulator of a worker process, created by _init_worker.
+_worker_simulator = None
+
+
+def _init_worker(world: World, max_steps: int, stall_steps: int):
+    """Prepares a worker process to run playthroughs."""
+    global _worker_simulator
+    _worker_simulator = PlaythroughSimulator(world, max_steps, stall_steps)
+
+
+def _play_chunk(seeds: list) -> list:
+    """Runs the playthroughs of a chunk of seeds in a worker process."""
+    return [_worker_simulator.play(seed) for seed in seeds]
+
+
+def main(argv: list = None):
+    """Simulates playthroughs of an exported project and prints a report."""
+    parser = argparse.ArgumentParser(
+        description="Runs randomized playthroughs of an exported project."
+    )
+    parser.add_argument("project", help="the project directory")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workers", type=int, help="worker processes (default: one per CPU)"
+    )
+    parser.add_argument("--max-steps", type=int, default=MAX_STEPS)
+    parser.add_argument("--stall-steps", type=int, default=STALL_STEPS)
+    parser.add_argument("--start-scene", help="the scene to start in")
+    parser.add_argument("--json", metavar="PATH", help="also write the report here")
+    args = parser.parse_args(argv)
+
+    try:
+        world = World.load(args.project, args.start_scene)
+        simulator = PlaythroughSimulator(world, args.max_steps, args.stall_steps)
+        report = simulator.run(args.runs, args.seed, args.workers)
+    except (OSError, ValueError, InterpreterError) as e:
+        parser.exit(1, f"Cannot simulate {args.project} (export it first): {e}\n")
+    print(report.summary())
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(asdict(report), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,12 @@ import json
 import logging
 import tempfile
 import shutil
-from dataclasses import asdict
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from gi.repository import GLib
 from .schemas import (
     ProjectData,
     Item,
@@ -21,12 +26,9 @@ from .schemas import (
     Scene,
     Hotspot,
     LogicGraph,
+    LazyLogicGraph,
     LogicNode,
-    DialogueNode,
-    ConditionNode,
-    ActionNode,
     Asset,
-    Animation,
     Audio,
     GlobalVariable,
     Verb,
@@ -37,9 +39,25 @@ from .schemas import (
     UIElement,
     SearchResult,
 )
+from .schemas.gobject_factory import register_change_listener
+from .json_stream import FileSpanReader, iter_json_array
+from .project_store import DATABASE_FILENAME, SQLiteProjectStore
+from .schema_codec import (
+    decode,
+    decode_csv,
+    encode,
+    encode_row,
+    field_names,
+    get_decoder,
+)
+from .search_index import SearchIndex
 from .settings_manager import SettingsManager
 
 
+# The number of malformed CSV rows listed in a load error message.
+MAX_REPORTED_ROWS = 10
+
+
 class ProjectManager:
     """Manages all data for a single AdvEngine project.
 
@@ -55,7 +73,14 @@ class ProjectManager:
         data (ProjectData): A dataclass containing all project data.
         settings (SettingsManager): Manages project-specific settings.
         is_dirty (bool): True if the project has unsaved changes.
+        dirty_collections (set[str]): The names of the data collections
+            that have changed since the last save.
         is_new_project (bool): True if the project was just created.
+        load_timings (dict): The time in seconds spent parsing each data
+            collection during the last load, keyed by collection name.
+        search_index (SearchIndex): The full-text index used by search().
+        store (SQLiteProjectStore): The project's database, or None if the
+            project is stored as CSV and JSON files.
     """
 
     def __init__(self, project_path: str):
@@ -66,138 +91,639 @@ class ProjectManager:
         """
         self.project_path = project_path
         self.data = ProjectData()
+        self.search_index = SearchIndex(self.data)
         self.settings = SettingsManager(project_path)
+        self.store = None
         self.is_dirty = False
+        self.dirty_collections = set()
+        # For each dirty collection, the ids of the objects known to have
+        # changed, or None if any object in it may have changed.
+        self._changed_items = {}
         self.is_new_project = False
         self.dirty_state_changed_callbacks = []
         self.project_loaded_callbacks = []
         self.error_callbacks = []
         self.project_saved_callbacks = []
+        self.load_progress_callbacks = []
+        self.load_timings = {}
+        self._lazy_graphs = True
+        # The open graph files that lazily loaded graphs read their nodes from.
+        self._span_readers = []
+        self._deferred_errors = None
+        self._save_thread = None
+        self._save_errors = []
+        self._save_pending = False
+        self._save_pending_force = False
 
         self._data_files = {
-            "items": ("Data/ItemData.csv", Item, self._load_csv, self._save_csv),
+            "items": ("Data/ItemData.csv", Item, self._load_csv, self._snapshot_csv),
             "attributes": (
                 "Data/Attributes.csv",
                 Attribute,
                 self._load_csv,
-                self._save_csv,
+                self._snapshot_csv,
             ),
             "characters": (
                 "Data/CharacterData.csv",
                 Character,
                 self._load_csv,
-                self._save_csv,
+                self._snapshot_csv,
             ),
             "scenes": (
                 "Logic/Scenes.json",
                 Scene,
                 self._load_json,
-                self._save_json,
-                self._scene_object_hook,
+                self._snapshot_json,
+                get_decoder(Scene),
             ),
             "logic_graphs": (
                 "Logic/LogicGraphs.json",
                 LogicGraph,
                 self._load_graph_data,
-                self._save_graph_data,
+                self._snapshot_graph_data,
             ),
             "assets": (
                 "Data/Assets.json",
                 Asset,
                 self._load_json,
-                self._save_json,
-                self._asset_object_hook,
+                self._snapshot_json,
+                get_decoder(Asset),
             ),
             "audio_files": (
                 "Data/Audio.json",
                 Audio,
                 self._load_json,
-                self._save_json,
-                lambda data: Audio(**data),
+                self._snapshot_json,
+                get_decoder(Audio),
             ),
             "global_variables": (
                 "Data/GlobalState.json",
                 GlobalVariable,
                 self._load_json,
-                self._save_json,
-                lambda data: GlobalVariable(**data),
+                self._snapshot_json,
+                get_decoder(GlobalVariable),
             ),
             "verbs": (
                 "Data/Verbs.json",
                 Verb,
                 self._load_json,
-                self._save_json,
-                lambda data: Verb(**data),
+                self._snapshot_json,
+                get_decoder(Verb),
             ),
             "dialogue_graphs": (
                 "Logic/DialogueGraphs.json",
                 LogicGraph,
                 self._load_graph_data,
-                self._save_graph_data,
+                self._snapshot_graph_data,
             ),
             "interactions": (
                 "Logic/Interactions.json",
                 Interaction,
                 self._load_json,
-                self._save_json,
-                lambda data: Interaction(**data),
+                self._snapshot_json,
+                get_decoder(Interaction),
             ),
             "quests": (
                 "Logic/Quests.json",
                 Quest,
                 self._load_json,
-                self._save_json,
-                self._quest_object_hook,
+                self._snapshot_json,
+                get_decoder(Quest),
             ),
             "ui_layouts": (
                 "UI/WindowLayout.json",
                 UILayout,
                 self._load_json,
-                self._save_json,
-                self._ui_layout_object_hook,
+                self._snapshot_json,
+                get_decoder(UILayout),
             ),
         }
 
-    def load_project(self):
+        # Maps wrapped dataclass types to the collection that owns them, so
+        # that edits made through GObject bindings mark the right file dirty.
+        self._collection_types = {
+            config[1]: key
+            for key, config in self._data_files.items()
+            if config[1] is not LogicGraph
+        }
+        self._collection_types.update(
+            {Hotspot: "scenes", Objective: "quests", UIElement: "ui_layouts"}
+        )
+        # The field of their owner's objects that holds each nested type.
+        self._nested_fields = {
+            Hotspot: "hotspots",
+            Objective: "objectives",
+            UIElement: "elements",
+        }
+        register_change_listener(self._on_data_object_changed)
+
+    def load_project(
+        self,
+        parallel: bool = True,
+        max_workers: int = None,
+        lazy_graphs: bool = True,
+        from_files: bool = False,
+    ):
         """Loads all project data from files into memory.
 
-        This method reads all of the project's data files (both CSV and JSON)
-        and populates the `self.data` attribute with the loaded data. It is
-        called once when a project is opened.
-        """
-        # Clear existing data to ensure a clean load
-        for key in self._data_files:
-            getattr(self.data, key).clear()
+        Projects that have a database are loaded from it rather than from
+        their CSV and JSON files, unless `from_files` is True.
 
-        for key, config in self._data_files.items():
-            loader = config[2]
-            target_list = getattr(self.data, key)
-            if len(config) > 4:  # Has object hook
-                loader(config[0], target_list, config[4])
-            elif loader == self._load_csv:
-                loader(config[0], config[1], target_list)
+        Each data collection is parsed into its own list, concurrently on a
+        thread pool when `parallel` is True. The parsed collections are only
+        committed to `self.data` once every file has been read, so
+        `project_loaded` callbacks always see a consistent snapshot of the
+        project. The time spent on each file is recorded in
+        `self.load_timings`.
+
+        Args:
+            parallel (bool): If True, parse the data files concurrently.
+                Defaults to True.
+            max_workers (int, optional): The maximum number of worker
+                threads to use when loading in parallel. Defaults to None,
+                which lets the executor choose.
+            lazy_graphs (bool): If True, logic and dialogue graphs are loaded
+                as LazyLogicGraph objects whose nodes are built on first use.
+                Defaults to True.
+            from_files (bool): If True, load the CSV and JSON files even if
+                the project has a database. Defaults to False.
+        """
+        self._lazy_graphs = lazy_graphs
+        self._deferred_errors = []
+        # A background save may still be reading the current lazy graphs.
+        self.wait_for_save()
+        old_readers, self._span_readers = self._span_readers, []
+        if self.store is None and not from_files:
+            self._open_store()
+        from_store = self.store is not None and not from_files
+        start = time.perf_counter()
+        try:
+            if parallel:
+                with ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="advengine-load"
+                ) as executor:
+                    futures = {
+                        key: executor.submit(self._load_collection, key, from_store)
+                        for key in self._data_files
+                    }
+                    results = {key: future.result() for key, future in futures.items()}
             else:
-                loader(config[0], target_list)
+                results = {
+                    key: self._load_collection(key, from_store)
+                    for key in self._data_files
+                }
+        except BaseException:
+            # The current data is kept, along with the files it reads from.
+            self._close_span_readers()
+            self._span_readers = old_readers
+            raise
+        finally:
+            deferred_errors, self._deferred_errors = self._deferred_errors, None
+
+        # Commit every collection in one step, replacing the contents of the
+        # existing lists so that references held by editors stay valid.
+        self.load_timings = {}
+        self.data.invalidate_index()
+        for key, (loaded, elapsed) in results.items():
+            getattr(self.data, key)[:] = loaded
+            self.load_timings[key] = elapsed
+            logging.debug(
+                "Loaded %s (%d objects) in %.1f ms",
+                self._data_files[key][0],
+                len(loaded),
+                elapsed * 1000,
+            )
+        logging.debug(
+            "Loaded project in %.1f ms", (time.perf_counter() - start) * 1000
+        )
+        for reader in old_readers:
+            reader.close()
 
+        for title, message in deferred_errors:
+            self._notify_error(title, message)
+
+        # The index is built on the first search, so that loading does not
+        # build the nodes of every lazily loaded graph.
+        self.search_index.clear()
         self.is_new_project = False
         self.set_dirty(False)
         self._notify_project_loaded()
 
-    def save_project(self):
-        """Saves all project data from memory to their respective files.
+    def _load_collection(self, key: str, from_store: bool = False) -> tuple:
+        """Parses a single data collection into a new list.
+
+        This method may run on a worker thread and must not touch
+        `self.data`.
+
+        Args:
+            key (str): The name of the collection to load.
+            from_store (bool): If True, load the collection from the
+                project's database instead of its file. Defaults to False.
+
+        Returns:
+            tuple: The list of loaded objects and the elapsed time in
+            seconds.
+        """
+        config = self._data_files[key]
+        loader = config[2]
+        loaded = []
+        start = time.perf_counter()
+        if from_store:
+            self._load_stored_collection(key, loaded)
+        elif len(config) > 4:  # Has object hook
+            loader(config[0], loaded, config[4])
+        elif loader == self._load_csv:
+            loader(config[0], config[1], loaded)
+        else:
+            loader(config[0], loaded)
+        return loaded, time.perf_counter() - start
+
+    def save_project(self, force: bool = False):
+        """Saves modified project data from memory to their respective files.
+
+        Only the collections listed in `dirty_collections` are written, along
+        with any collection whose file does not exist yet. Collections that
+        fail to save stay dirty so that they are retried on the next save.
+        This method blocks until the data is on disk, waiting for any
+        background save that is still running.
+
+        Args:
+            force (bool): If True, rewrite every data file regardless of
+                whether it has changed. Defaults to False.
+        """
+        self.wait_for_save()
+        snapshot = self._snapshot_project(force)
+        self.dirty_collections = set()
+        self._finish_save(self._write_snapshot(snapshot))
+
+    def save_project_async(self, force: bool = False):
+        """Saves modified project data on a background thread.
+
+        The modified collections are copied on the calling thread, which must
+        be the GTK main thread, and are then serialized and written to disk
+        by a worker. Edits made while the worker runs do not affect the data
+        being written. Completion is reported through the project saved and
+        error callbacks from the main loop. Requests made while a save is
+        still running are coalesced into a single follow-up save.
+
+        Args:
+            force (bool): If True, rewrite every data file regardless of
+                whether it has changed. Defaults to False.
+        """
+        if self._save_thread is not None:
+            self._save_pending = True
+            self._save_pending_force = self._save_pending_force or force
+            return
+
+        snapshot = self._snapshot_project(force)
+        self.dirty_collections = set()
+        self._save_thread = threading.Thread(
+            target=self._run_background_save,
+            args=(snapshot,),
+            name="advengine-save",
+            daemon=True,
+        )
+        self._save_thread.start()
+
+    def wait_for_save(self):
+        """Blocks until any running background save has finished.
+
+        A coalesced follow-up save is dropped, since the caller is expected
+        to save the latest state itself.
+        """
+        thread = self._save_thread
+        if thread is None:
+            return
+        thread.join()
+        self._save_pending = False
+        self._save_pending_force = False
+        self._on_background_save_finished(thread)
+
+    def close(self):
+        """Finishes any background save before the manager is discarded.
+
+        A save that was requested while another was running is written
+        before this method returns, so that it is not lost when the
+        application exits or switches to another project. The graph files
+        and the database that lazily loaded graphs read from are then
+        closed, so graphs whose nodes were never built can no longer be used.
+        """
+        pending = self._save_pending
+        force = self._save_pending_force
+        self.wait_for_save()
+        if pending and (force or self.dirty_collections):
+            self.save_project(force)
+        self._close_span_readers()
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def _close_span_readers(self):
+        """Closes the graph files opened for lazily loaded graphs."""
+        readers, self._span_readers = self._span_readers, []
+        for reader in readers:
+            reader.close()
+
+    def create_database(self) -> bool:
+        """Moves the project's data into a SQLite database.
+
+        Every collection is written to the database, which is then used for
+        all further loads and saves. The CSV and JSON files are left in
+        place, but are no longer updated unless `export_files` is called.
+
+        Returns:
+            bool: True if the database was created.
+        """
+        self.wait_for_save()
+        if self.store is not None:
+            return True
+        path = os.path.join(self.project_path, DATABASE_FILENAME)
+        store = None
+        try:
+            store = SQLiteProjectStore(path)
+            store.apply(
+                [store.diff(key, getattr(self.data, key)) for key in self._data_files]
+            )
+        except sqlite3.Error as e:
+            logging.error(f"Error creating {path}: {e}")
+            if store is not None:
+                store.close()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            self._notify_error(
+                "Failed to Create Project Database",
+                f"Could not create the database at {path}.\n\n{e}",
+            )
+            return False
+        self.store = store
+        self.dirty_collections = set()
+        self._finish_save([])
+        return True
+
+    def export_files(self) -> bool:
+        """Writes every collection to the project's CSV and JSON files.
+
+        For a project with a database, this exports the database contents to
+        the standard project layout; the database stays in use.
+
+        Returns:
+            bool: True if every file was written.
+        """
+        self.wait_for_save()
+        errors = self._write_file_snapshot(self._snapshot_files(force=True))
+        for key, title, message in errors:
+            self._notify_error(title, message)
+        return not errors
+
+    def import_files(self):
+        """Reloads the project's data from its CSV and JSON files.
+
+        For a project with a database, the database is then rewritten with
+        the imported data.
+        """
+        self.wait_for_save()
+        self.load_project(from_files=True)
+        if self.store is not None:
+            for key in self._data_files:
+                self.store.invalidate(key)
+            self.save_project(force=True)
+
+    def _run_background_save(self, snapshot: dict):
+        """Writes a project snapshot to disk on the save worker thread.
+
+        Args:
+            snapshot (dict): The snapshot returned by `_snapshot_project`.
+        """
+        self._save_errors = self._write_snapshot(snapshot)
+        GLib.idle_add(self._on_background_save_finished, threading.current_thread())
+
+    def _on_background_save_finished(self, thread: threading.Thread) -> bool:
+        """Completes a background save on the main thread.
+
+        Args:
+            thread (threading.Thread): The worker thread that performed the
+                save.
+
+        Returns:
+            bool: Always False to remove the idle handler.
+        """
+        if thread is not self._save_thread:
+            # Already completed by wait_for_save().
+            return False
+        self._save_thread = None
+        self._finish_save(self._save_errors)
+
+        if self._save_pending:
+            force = self._save_pending_force
+            self._save_pending = False
+            self._save_pending_force = False
+            if force or self.dirty_collections:
+                self.save_project_async(force)
+        return False
+
+    def _snapshot_project(self, force: bool = False) -> dict:
+        """Copies the collections that need saving.
+
+        Args:
+            force (bool): If True, include every collection.
+
+        Returns:
+            dict: A mapping of collection names to the data to write. For a
+            project with a database, this is the StoreChanges for the
+            collection's table; otherwise it is a (filename, writer) tuple,
+            where the writer writes the copied data to a file.
+        """
+        changed_items, self._changed_items = self._changed_items, {}
+        if self.store is not None:
+            return self._snapshot_store(force, changed_items)
+        return self._snapshot_files(force)
+
+    def _snapshot_files(self, force: bool = False) -> dict:
+        """Copies the collections whose files need writing.
+
+        Args:
+            force (bool): If True, include every collection.
 
-        This method writes all data from the `self.data` attribute to the
-        project's data files. It is called when the user saves the project.
+        Returns:
+            dict: A mapping of collection names to a (filename, writer)
+            tuple, where the writer writes the copied data to a file.
         """
+        snapshot = {}
         for key, config in self._data_files.items():
-            saver = config[3]
+            file_path = os.path.join(self.project_path, config[0])
+            if not (
+                force or key in self.dirty_collections or not os.path.exists(file_path)
+            ):
+                continue
+            snapshot_func = config[3]
             data_list = getattr(self.data, key)
-            if saver == self._save_csv:
-                saver(config[0], data_list, config[1])
+            if snapshot_func == self._snapshot_csv:
+                writer = snapshot_func(data_list, config[1])
             else:
-                saver(config[0], data_list)
-        self.set_dirty(False)
-        self._notify_project_saved()
+                writer = snapshot_func(data_list)
+            snapshot[key] = (config[0], writer)
+        return snapshot
+
+    def _snapshot_store(self, force: bool = False, changed_items: dict = None) -> dict:
+        """Works out the database rows that need writing.
+
+        Only the rows of objects that were added, changed, moved or removed
+        are included. Objects are only encoded if they were named as changed
+        when the collection was marked dirty, or if no object was named.
+        Lazily loaded graphs that have not been touched are never encoded.
+
+        Args:
+            force (bool): If True, check every object in every collection.
+            changed_items (dict, optional): The objects known to have changed
+                in each collection, as recorded by `set_dirty`.
+
+        Returns:
+            dict: A mapping of collection names to their StoreChanges.
+        """
+        changed_items = changed_items or {}
+        snapshot = {}
+        for key in self._data_files:
+            if not (force or key in self.dirty_collections):
+                continue
+            changes = self.store.diff(
+                key,
+                getattr(self.data, key),
+                unchanged=self._is_unchanged_graph,
+                changed=None if force else changed_items.get(key),
+            )
+            if changes or changes.replace_all:
+                snapshot[key] = changes
+        return snapshot
+
+    @staticmethod
+    def _is_unchanged_graph(obj) -> bool:
+        """Returns True if an object is a lazy graph that was never touched."""
+        return isinstance(obj, LazyLogicGraph) and obj.unchanged_source() is not None
+
+    def _write_snapshot(self, snapshot: dict) -> list:
+        """Writes a project snapshot to disk.
+
+        This method may run on a worker thread and must not touch
+        `self.data` or invoke any callbacks.
+
+        Args:
+            snapshot (dict): The snapshot returned by `_snapshot_project`.
+
+        Returns:
+            list: A (collection, title, message) tuple for each collection
+            that could not be written.
+        """
+        if self.store is not None:
+            return self._write_store_snapshot(snapshot)
+        return self._write_file_snapshot(snapshot)
+
+    def _write_store_snapshot(self, snapshot: dict) -> list:
+        """Writes the changes in a project snapshot to the database.
+
+        All collections are written in a single transaction, so if any of
+        them fails, none are written.
+
+        Args:
+            snapshot (dict): The snapshot returned by `_snapshot_store`.
+
+        Returns:
+            list: A (collection, title, message) tuple for each collection
+            that could not be written.
+        """
+        if not snapshot:
+            return []
+        try:
+            self.store.apply(list(snapshot.values()))
+        except sqlite3.Error as e:
+            logging.error(f"Error saving to {self.store.path}: {e}")
+            return [
+                (
+                    key,
+                    "Failed to Save Project",
+                    f"Could not write to the database at {self.store.path}.\n\n{e}",
+                )
+                for key in snapshot
+            ]
+        logging.debug(
+            "Saved %d rows to %s",
+            sum(len(changes) for changes in snapshot.values()),
+            DATABASE_FILENAME,
+        )
+        return []
+
+    def _write_file_snapshot(self, snapshot: dict) -> list:
+        """Writes the files in a project snapshot.
+
+        Args:
+            snapshot (dict): The snapshot returned by `_snapshot_files`.
+
+        Returns:
+            list: A (collection, title, message) tuple for each collection
+            that could not be written.
+        """
+        errors = []
+        for key, (filename, writer) in snapshot.items():
+            file_path = os.path.join(self.project_path, filename)
+            try:
+                self._write_file(file_path, writer)
+            except (OSError, csv.Error, TypeError, ValueError) as e:
+                logging.error(f"Error saving {file_path}: {e}")
+                errors.append(
+                    (
+                        key,
+                        f"Failed to Save {filename}",
+                        f"Could not write to file at {file_path}.\n\n{e}",
+                    )
+                )
+        return errors
+
+    def _finish_save(self, errors: list):
+        """Updates the dirty state and notifies listeners after a save.
+
+        Args:
+            errors (list): The errors returned by `_write_snapshot`.
+        """
+        reported = set()
+        for key, title, message in errors:
+            self.dirty_collections.add(key)
+            if self.store is not None:
+                # The database still holds the previous rows.
+                self.store.invalidate(key)
+            if (title, message) not in reported:
+                reported.add((title, message))
+                self._notify_error(title, message)
+        if not self.dirty_collections:
+            self.set_dirty(False)
+        if not errors:
+            self._notify_project_saved()
+
+    @staticmethod
+    def _write_file(file_path: str, writer: callable):
+        """Atomically writes a file and flushes it to disk.
+
+        The data is written to a temporary file in the same directory, synced
+        with fsync and then moved over the destination, so a crash never
+        leaves a partially written file behind.
+
+        Args:
+            file_path (str): The absolute path of the file to write.
+            writer (callable): A callable that writes the file contents to
+                the open text file it is given.
+        """
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_file = tempfile.NamedTemporaryFile(
+            mode="w", delete=False, dir=os.path.dirname(file_path), newline=""
+        )
+        try:
+            with temp_file as f:
+                writer(f)
+                f.flush()
+                os.fsync(f.fileno())
+            shutil.move(temp_file.name, file_path)
+        finally:
+            if os.path.exists(temp_file.name):
+                os.remove(temp_file.name)
 
     def register_project_saved_callback(self, callback: callable):
         """Registers a callback to be called when the project is saved."""
@@ -208,6 +734,24 @@ class ProjectManager:
         for callback in self.project_saved_callbacks:
             callback()
 
+    def register_load_progress_callback(self, callback: callable):
+        """Registers a callback to be called as large data files are read.
+
+        The callback is called from the thread that reads the file, which is
+        not the main thread when collections are loaded in parallel.
+
+        Args:
+            callback (callable): A callable that takes the file name relative
+                to the project root, the number of bytes read so far, and the
+                total size of the file in bytes.
+        """
+        self.load_progress_callbacks.append(callback)
+
+    def _notify_load_progress(self, filename: str, bytes_read: int, total: int):
+        """Notifies all registered callbacks of progress reading a file."""
+        for callback in self.load_progress_callbacks:
+            callback(filename, bytes_read, total)
+
     def register_project_loaded_callback(self, callback: callable):
         """Registers a callback to be called when the project is loaded.
 
@@ -246,6 +790,11 @@ class ProjectManager:
             title (str): The title of the error.
             message (str): The message of the error.
         """
+        if self._deferred_errors is not None:
+            # Errors raised while loading may come from worker threads, so
+            # they are reported once the load has finished.
+            self._deferred_errors.append((title, message))
+            return
         for callback in self.error_callbacks:
             callback(title, message)
 
@@ -254,59 +803,121 @@ class ProjectManager:
         for callback in self.dirty_state_changed_callbacks:
             callback(self.is_dirty)
 
-    def set_dirty(self, state: bool = True):
+    def set_dirty(self, state: bool = True, collection: str = None, item=None):
         """Sets the project's dirty state and notifies listeners.
 
         This method should be called whenever any data in the project is
-        modified.
+        modified. Callers should name the collection they modified so that
+        only its file is rewritten on the next save, and may also name the
+        modified object so that a project database only re-encodes that
+        object's row.
 
         Args:
             state (bool): The new dirty state. Defaults to True.
+            collection (str, optional): The name of the modified collection.
+                If omitted when marking the project dirty, every collection
+                is considered modified. Defaults to None.
+            item (object, optional): The object of the collection that was
+                modified, such as the graph that owns an edited node. If
+                omitted, any object in the collection may have changed.
+                Adding and removing objects needs no item. Defaults to None.
         """
+        if state:
+            self.search_index.mark_stale(collection, item)
+            if collection is None:
+                self.dirty_collections.update(self._data_files)
+                self._changed_items = dict.fromkeys(self._data_files)
+            elif collection in self._data_files:
+                self.dirty_collections.add(collection)
+                if item is None:
+                    self._changed_items[collection] = None
+                else:
+                    changed = self._changed_items.setdefault(collection, set())
+                    if changed is not None:
+                        changed.add(id(item))
+            else:
+                logging.error(f"Error: Collection '{collection}' not found.")
+        else:
+            self.dirty_collections.clear()
+            self._changed_items = {}
+
         if self.is_dirty != state:
             self.is_dirty = state
             self._notify_dirty_state_changed()
 
-    def _save_csv(self, filename: str, data_list: list, dataclass_type: type):
-        """Saves a list of dataclass objects to a CSV file.
+    def _on_data_object_changed(self, instance: object):
+        """Marks the collection owning a modified dataclass as dirty.
+
+        The change listeners are shared by every ProjectManager, so changes
+        to objects that belong to another project are ignored.
+
+        Args:
+            instance (object): The dataclass instance that was modified
+                through its GObject wrapper.
+        """
+        for cls in type(instance).__mro__:
+            collection = self._collection_types.get(cls)
+            if collection:
+                # The edit may have changed the object's ID.
+                self.data.invalidate_index(collection)
+                nested_field = self._nested_fields.get(cls)
+                if not self._owns(collection, instance, nested_field):
+                    return
+                # Nested objects, such as hotspots, do not know their owner.
+                item = instance if nested_field is None else None
+                self.set_dirty(True, collection, item)
+                return
+
+    def _owns(self, collection: str, instance: object, nested_field: str) -> bool:
+        """Checks whether an object belongs to this project's data.
+
+        Args:
+            collection (str): The name of the collection that would own it.
+            instance (object): The dataclass instance.
+            nested_field (str): The field of the collection's objects that
+                holds the instance, or None if it is one of those objects.
+
+        Returns:
+            bool: True if the instance is in the collection.
+        """
+        items = getattr(self.data, collection)
+        if nested_field is None:
+            if self.data.get_by_id(collection, instance.id) is instance:
+                return True
+            # Objects with a duplicate ID are not in the index.
+            return any(item is instance for item in items)
+        return any(
+            child is instance
+            for item in items
+            for child in getattr(item, nested_field)
+        )
+
+    def _snapshot_csv(self, data_list: list, dataclass_type: type) -> callable:
+        """Copies a list of dataclass objects for saving as CSV.
 
         Args:
-            filename (str): The name of the CSV file.
             data_list (list): A list of dataclass objects to save.
             dataclass_type (type): The type of the dataclass objects.
+
+        Returns:
+            callable: A function that writes the copied rows to an open file.
         """
-        file_path = os.path.join(self.project_path, filename)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        temp_file = tempfile.NamedTemporaryFile(
-            mode="w", delete=False, dir=os.path.dirname(file_path)
-        )
-        try:
-            with temp_file as f:
-                if not data_list:
-                    fieldnames = asdict(
-                        dataclass_type(*[None] * len(dataclass_type.__annotations__))
-                    ).keys()
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                else:
-                    writer = csv.DictWriter(f, fieldnames=asdict(data_list[0]).keys())
-                    writer.writeheader()
-                    for item in data_list:
-                        writer.writerow(asdict(item))
-            shutil.move(temp_file.name, file_path)
-        except (IOError, csv.Error) as e:
-            logging.error(f"Error saving {file_path}: {e}")
-            self._notify_error(
-                f"Failed to Save {filename}",
-                f"Could not write to file at {file_path}.\n\n{e}",
-            )
-        finally:
-            if os.path.exists(temp_file.name):
-                os.remove(temp_file.name)
+        rows = [encode_row(item) for item in data_list]
+        fieldnames = field_names(type(data_list[0]) if data_list else dataclass_type)
+
+        def write(f):
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
+
+        return write
 
     def _load_csv(self, filename: str, dataclass_type: type, target_list: list):
         """Loads data from a CSV file into a list of dataclass objects.
 
+        Rows that cannot be converted are skipped, and reported by line
+        number once the rest of the file has loaded.
+
         Args:
             filename (str): The name of the CSV file.
             dataclass_type (type): The type of the dataclass objects to create.
@@ -315,61 +926,76 @@ class ProjectManager:
         file_path = os.path.join(self.project_path, filename)
         try:
             with open(file_path, "r", newline="") as f:
-                reader = csv.DictReader(f)
-                count = 0
-                for row in reader:
-                    for key, value in row.items():
-                        field_type = dataclass_type.__annotations__.get(key)
-                        if field_type == int:
-                            row[key] = int(value) if value else 0
-                        elif field_type == bool:
-                            row[key] = value.lower() in ["true", "1"]
-                        elif field_type == dict:
-                            row[key] = json.loads(value) if value else {}
-                    new_item = dataclass_type(**row)
-                    target_list.append(new_item)
-                    logging.debug(f"  Created object: {new_item}")
-                    count += 1
-                logging.debug(f"Loaded {count} items from {filename}")
+                loaded, errors = decode_csv(csv.reader(f), dataclass_type)
+            target_list.extend(loaded)
+            logging.debug("Loaded %d items from %s", len(loaded), filename)
         except FileNotFoundError:
             if not self.is_new_project:
                 logging.warning(f"Warning: {file_path} not found.")
+            return
         except Exception as e:
             logging.error(f"Error loading {file_path}: {e}")
             self._notify_error(
                 f"Failed to Load {filename}",
                 f"Could not read file at {file_path}.\n\n{e}",
             )
+            return
+
+        if errors:
+            for error in errors:
+                logging.error(f"Skipped malformed row in {file_path}, {error}")
+            details = "\n".join(str(error) for error in errors[:MAX_REPORTED_ROWS])
+            if len(errors) > MAX_REPORTED_ROWS:
+                details += f"\n... and {len(errors) - MAX_REPORTED_ROWS} more"
+            self._notify_error(
+                f"Skipped Rows in {filename}",
+                f"{len(errors)} malformed rows in {file_path} were not loaded."
+                f"\n\n{details}",
+            )
 
     def _load_json(
-        self, filename: str, target_list: list, object_hook: callable = None
+        self,
+        filename: str,
+        target_list: list,
+        object_hook: callable = None,
+        with_offsets: bool = False,
     ):
         """Loads data from a JSON file.
 
+        The file is parsed incrementally, and each element of its top-level
+        array is passed to the object hook as soon as it has been read, so
+        only one element's raw data is held in memory at a time.
+
         Args:
             filename (str): The path to the JSON file, relative to the project root.
             target_list (list): The list to which the loaded objects will be appended.
             object_hook (callable): An optional function to process each loaded object.
+            with_offsets (bool): If True, the object hook is passed a
+                (data, start, end) tuple holding the byte offsets of each
+                object's JSON in the file. Defaults to False.
         """
         file_path = os.path.join(self.project_path, filename)
+
+        def progress(bytes_read, total):
+            self._notify_load_progress(filename, bytes_read, total)
+
         try:
-            with open(file_path, "r") as f:
-                content = f.read()
-                if not content:
+            with open(file_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
                     logging.debug(f"File {filename} is empty.")
                     return
-                data = json.loads(content)
-                count = 0
-                if object_hook:
-                    for item_data in data:
-                        new_item = object_hook(item_data)
-                        target_list.append(new_item)
-                        logging.debug(f"  Created object: {new_item}")
-                        count += 1
-                else:
-                    target_list.extend(data)
-                    count = len(data)
-                logging.debug(f"Loaded {count} items from {filename}")
+                # Objects are only added once the whole file has parsed, so a
+                # corrupt file never leaves a partial collection behind.
+                loaded = []
+                for item_data in iter_json_array(
+                    f, progress=progress, with_offsets=with_offsets
+                ):
+                    if object_hook:
+                        item_data = object_hook(item_data)
+                        logging.debug("  Created object: %s", item_data)
+                    loaded.append(item_data)
+                target_list.extend(loaded)
+                logging.debug(f"Loaded {len(loaded)} items from {filename}")
         except FileNotFoundError:
             if not self.is_new_project:
                 logging.warning(f"Warning: {file_path} not found.")
@@ -386,104 +1012,169 @@ class ProjectManager:
                 f"An unexpected error occurred while reading {file_path}.\n\n{e}",
             )
 
-    def _save_json(self, filename: str, data_list: list):
-        """Saves a list of dataclass objects to a JSON file.
+    def _snapshot_json(self, data_list: list) -> callable:
+        """Copies a list of dataclass objects for saving as JSON.
 
         Args:
-            filename (str): The path to the JSON file, relative to the project root.
             data_list (list): A list of dataclass objects to save.
-        """
-        file_path = os.path.join(self.project_path, filename)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        temp_file = tempfile.NamedTemporaryFile(
-            mode="w", delete=False, dir=os.path.dirname(file_path)
-        )
-        try:
-            with temp_file as f:
-                json.dump([asdict(item) for item in data_list], f, indent=2)
-            shutil.move(temp_file.name, file_path)
-        except (IOError, TypeError) as e:
-            logging.error(f"Error saving {file_path}: {e}")
-            self._notify_error(
-                f"Failed to Save {filename}",
-                f"Could not write to file at {file_path}.\n\n{e}",
-            )
-        finally:
-            if os.path.exists(temp_file.name):
-                os.remove(temp_file.name)
 
-    def _scene_object_hook(self, data):
-        """Object hook for loading scenes from JSON."""
-        hotspots = [Hotspot(**hs) for hs in data.get("hotspots", [])]
-        data["hotspots"] = hotspots
-        return Scene(**data)
-
-    def _quest_object_hook(self, data):
-        """Object hook for loading quests from JSON."""
-        objectives = [Objective(**obj) for obj in data.get("objectives", [])]
-        data["objectives"] = objectives
-        return Quest(**data)
-
-    def _ui_layout_object_hook(self, data):
-        """Object hook for loading UI layouts from JSON."""
-        elements = [UIElement(**elem) for elem in data.get("elements", [])]
-        data["elements"] = elements
-        return UILayout(**data)
-
-    def _asset_object_hook(self, data):
-        """Object hook for loading assets from JSON."""
-        return (
-            Animation(**data)
-            if data.get("asset_type") == "animation"
-            else Asset(**data)
-        )
+        Returns:
+            callable: A function that writes the copied data to an open file.
+        """
+        items = [encode(item) for item in data_list]
+        return lambda f: json.dump(items, f, indent=2)
 
     def _load_graph_data(self, file_path, target_list):
         """Loads graph data from a JSON file.
 
+        When graphs are loaded lazily, only each graph's ID, name and node
+        count are read up front, along with the location of its JSON in the
+        file. The nodes are parsed from the file the first time they are
+        used.
+
         Args:
             file_path (str): The path to the JSON file.
             target_list (list): The list to which the loaded objects will be appended.
         """
+        if not self._lazy_graphs:
+            self._load_json(file_path, target_list, self._graph_object_hook)
+            return
+
+        reader = None
+
+        def lazy_graph_hook(item):
+            nonlocal reader
+            data, start, end = item
+            if reader is None:
+                reader = FileSpanReader(os.path.join(self.project_path, file_path))
+                self._span_readers.append(reader)
+            return LazyLogicGraph(
+                id=data["id"],
+                name=data["name"],
+                node_count=len(data.get("nodes", [])),
+                load_nodes=partial(
+                    self._load_graph_nodes, partial(reader.read, start, end)
+                ),
+                read_source=partial(reader.read, start, end),
+            )
+
+        self._load_json(file_path, target_list, lazy_graph_hook, with_offsets=True)
+
+    def _load_graph_nodes(self, read_source: callable):
+        """Builds the nodes of a lazily loaded graph.
+
+        Args:
+            read_source (callable): Returns the graph's JSON, as bytes.
+
+        Returns:
+            list[LogicNode]: The graph's nodes.
+        """
+        try:
+            data = json.loads(read_source())
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            logging.error(f"Error loading graph nodes: {e}")
+            raise
+        return self._graph_object_hook(data).nodes
 
-        def pascal_to_snake(name):
-            import re
+    def _open_store(self):
+        """Opens the project's database, if it has one.
 
-            name = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
-            return "var_name" if name == "varname" else name
+        If the database cannot be opened, the error is reported and the
+        project is loaded from its files instead.
+        """
+        if not SQLiteProjectStore.exists(self.project_path):
+            return
+        path = os.path.join(self.project_path, DATABASE_FILENAME)
+        try:
+            self.store = SQLiteProjectStore(path)
+        except sqlite3.Error as e:
+            logging.error(f"Error opening {path}: {e}")
+            self._notify_error(
+                "Failed to Open Project Database",
+                f"Could not open the database at {path}. The project's data "
+                f"files were loaded instead.\n\n{e}",
+            )
 
-        def graph_object_hook(data):
-            nodes = []
-            for node_data in data.get("nodes", []):
-                node_data.pop("parent_id", None)
-                node_data.pop("children_ids", None)
-                node_type = node_data.get("node_type")
-                if "parameters" in node_data:
-                    for key, value in node_data["parameters"].items():
-                        snake_key = pascal_to_snake(key)
-                        if snake_key not in node_data:
-                            node_data[snake_key] = value
-                    del node_data["parameters"]
+    def _load_stored_collection(self, key: str, target_list: list):
+        """Loads a collection from the project's database.
 
-                node_class = {
-                    "Dialogue": DialogueNode,
-                    "Condition": ConditionNode,
-                    "Action": ActionNode,
-                }.get(node_type, LogicNode)
-                nodes.append(node_class(**node_data))
-            data["nodes"] = nodes
-            return LogicGraph(**data)
+        Args:
+            key (str): The name of the collection.
+            target_list (list): The list to which the loaded objects will be
+                appended.
+        """
+        config = self._data_files[key]
+        store = self.store
+        try:
+            if config[1] is not LogicGraph:
+                decoder = config[4] if len(config) > 4 else get_decoder(config[1])
+                target_list.extend(store.load(key, decoder))
+            elif not self._lazy_graphs:
+                target_list.extend(store.load(key, self._graph_object_hook))
+            else:
 
-        self._load_json(file_path, target_list, graph_object_hook)
+                def create_graph(row_key, graph_id, name, node_count):
+                    read_source = partial(store.read, key, row_key)
+                    return LazyLogicGraph(
+                        id=graph_id,
+                        name=name,
+                        node_count=node_count,
+                        load_nodes=partial(self._load_graph_nodes, read_source),
+                        read_source=read_source,
+                    )
 
-    def _save_graph_data(self, file_path, graph_list):
-        """Saves graph data to a JSON file.
+                target_list.extend(store.load_summaries(key, create_graph))
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            logging.error(f"Error loading {key} from {store.path}: {e}")
+            self._notify_error(
+                f"Failed to Load {config[0]}",
+                f"Could not read {key} from the database at {store.path}.\n\n{e}",
+            )
+
+    def _graph_object_hook(self, data):
+        """Object hook for loading logic and dialogue graphs from JSON."""
+        for node_data in data.get("nodes", []):
+            # Older projects store these alongside the node's inputs and
+            # outputs; they are not part of the schema.
+            node_data.pop("parent_id", None)
+            node_data.pop("children_ids", None)
+        return decode(LogicGraph, data)
+
+    def _snapshot_graph_data(self, graph_list) -> callable:
+        """Copies graph data for saving as JSON.
+
+        Lazily loaded graphs that have not been touched are copied from the
+        file they were loaded from, byte for byte. The output is otherwise
+        the same as `_snapshot_json` produces.
 
         Args:
-            file_path (str): The path to the JSON file.
             graph_list (list): A list of LogicGraph objects to save.
+
+        Returns:
+            callable: A function that writes the copied graphs to an open
+            file.
         """
-        self._save_json(file_path, graph_list)
+        items = []
+        for graph in graph_list:
+            source = None
+            if isinstance(graph, LazyLogicGraph):
+                source = graph.unchanged_source()
+            items.append(source if source is not None else encode(graph))
+
+        def write(f):
+            if not items:
+                f.write("[]")
+                return
+            f.write("[\n")
+            for i, item in enumerate(items):
+                f.write(",\n  " if i else "  ")
+                if callable(item):
+                    f.write(item().decode("utf-8"))
+                else:
+                    f.write(json.dumps(item, indent=2).replace("\n", "\n  "))
+            f.write("\n]")
+
+        return write
 
     def add_data_item(self, collection_name: str, item: object):
         """Adds an item to the specified data collection.
@@ -495,7 +1186,8 @@ class ProjectManager:
         collection = getattr(self.data, collection_name, None)
         if collection is not None:
             collection.append(item)
-            self.set_dirty()
+            self.data.index_add(collection_name, item)
+            self.set_dirty(True, collection_name)
         else:
             logging.error(f"Error: Collection '{collection_name}' not found.")
 
@@ -510,7 +1202,8 @@ class ProjectManager:
         if collection is not None:
             if item in collection:
                 collection.remove(item)
-                self.set_dirty()
+                self.data.invalidate_index(collection_name)
+                self.set_dirty(True, collection_name)
                 return True
             return False
         else:
@@ -573,35 +1266,24 @@ class ProjectManager:
             logging.error(f"Failed to create project from template '{template}': {e}")
             return None, str(e)
 
-    def search(self, query: str) -> list[SearchResult]:
+    def search(
+        self, query: str, limit: int = None, cancelled: callable = None
+    ) -> list[SearchResult]:
         """Searches all project data for a given query.
 
+        Objects and collections modified since the last search are
+        re-indexed first.
+
         Args:
-            query (str): The search term.
+            query (str): The search terms.
+            limit (int, optional): The maximum number of results to return.
+                Defaults to None, which returns every match.
+            cancelled (callable, optional): A callable that returns True if
+                the search should be abandoned. Defaults to None.
 
         Returns:
-            A list of SearchResult objects that match the query.
-        """
-        results = []
-        query_lower = query.lower()
-
-        searchable_data = [
-            ("Item", self.data.items, "name"),
-            ("Character", self.data.characters, "display_name"),
-            ("Scene", self.data.scenes, "name"),
-            ("Quest", self.data.quests, "name"),
-            ("Asset", self.data.assets, "name"),
-        ]
-
-        for data_type, data_list, name_field in searchable_data:
-            for item in data_list:
-                if (
-                    query_lower in getattr(item, name_field).lower()
-                    or query_lower in item.id.lower()
-                ):
-                    results.append(
-                        SearchResult(
-                            id=item.id, name=getattr(item, name_field), type=data_type
-                        )
-                    )
-        return results
+            A list of SearchResult objects that match the query, best match
+            first.
+        """
+        self.search_index.refresh()
+        return self.search_index.query(query, limit=limit, cancelled=cancelled)
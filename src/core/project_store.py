@@ -0,0 +1,448 @@
+"""A SQLite database backend for project data.
+
+This module provides the SQLiteProjectStore class, which keeps every data
+collection of a project in a single SQLite database instead of the CSV and
+JSON files of the standard project layout. Each collection has its own
+table, with one row per object holding the object's ID, its position in the
+collection and its data as JSON.
+
+The store remembers a digest of each row it has read or written, so saving
+a collection only writes the rows of objects that were added, changed,
+moved or removed, all in a single transaction.
+"""
+
+import bisect
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+
+from .schema_codec import encode
+
+DATABASE_FILENAME = "Project.sqlite"
+
+SCHEMA_VERSION = 1
+
+
+def _digest(text: str) -> bytes:
+    """Returns a digest that identifies the saved form of an object."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _ordered_indices(positions: list) -> set:
+    """Finds the largest set of rows that are still in stored order.
+
+    Args:
+        positions (list): The stored position of each row, in the new order
+            of the collection, or None for rows that are not stored yet.
+
+    Returns:
+        set[int]: The indices of a longest run of rows, not necessarily
+        adjacent, whose stored positions increase.
+    """
+    # Patience sorting: tails[k] is the index of the smallest position that
+    # ends an increasing run of length k + 1.
+    tails = []
+    tail_positions = []
+    links = [None] * len(positions)
+    for i, position in enumerate(positions):
+        if position is None:
+            continue
+        k = bisect.bisect_left(tail_positions, position)
+        links[i] = tails[k - 1] if k else None
+        if k == len(tails):
+            tails.append(i)
+            tail_positions.append(position)
+        else:
+            tails[k] = i
+            tail_positions[k] = position
+    kept = set()
+    i = tails[-1] if tails else None
+    while i is not None:
+        kept.add(i)
+        i = links[i]
+    return kept
+
+
+def _assign_positions(positions: list) -> list:
+    """Gives new positions to the rows that were added or moved.
+
+    Rows in the largest run that is still in stored order keep their
+    positions, and the other rows are spaced out between them, so removing,
+    appending or moving a few objects only changes the positions of those
+    objects. If there is no room between two positions, every row is
+    renumbered.
+
+    Args:
+        positions (list): The stored position of each row, in the new order
+            of the collection, or None for rows that are not stored yet.
+
+    Returns:
+        list[float]: The position of each row.
+    """
+    if None not in positions and _is_increasing(positions):
+        return list(positions)
+    kept = _ordered_indices(positions)
+    result = list(positions)
+    low = None
+    i = 0
+    while i < len(positions):
+        if i in kept:
+            low = positions[i]
+            i += 1
+            continue
+        end = i
+        while end < len(positions) and end not in kept:
+            end += 1
+        count = end - i
+        high = positions[end] if end < len(positions) else None
+        if high is None:
+            start = 0.0 if low is None else math.floor(low) + 1.0
+            step = 1.0
+        elif low is None:
+            start, step = high - count, 1.0
+        else:
+            step = (high - low) / (count + 1)
+            start = low + step
+        for n in range(count):
+            result[i + n] = start + n * step
+        i = end
+    if not _is_increasing(result):
+        # Floating point has run out of room between two positions.
+        return [float(n) for n in range(len(positions))]
+    return result
+
+
+def _is_increasing(values: list) -> bool:
+    """Returns whether every value is greater than the one before it."""
+    return all(a < b for a, b in zip(values, values[1:]))
+
+
+class StoreChanges:
+    """The row changes needed to bring one table up to date.
+
+    Attributes:
+        collection (str): The name of the collection.
+        upserts (list[tuple]): A (key, id, position, data, digest) tuple for
+            each row to insert or replace.
+        moves (list[tuple]): A (position, key) tuple for each row whose
+            data is unchanged but whose position has changed.
+        deletes (list[int]): The keys of the rows to delete.
+        replace_all (bool): True if every existing row is deleted first.
+    """
+
+    def __init__(self, collection: str, replace_all: bool = False):
+        """Initializes a new, empty StoreChanges instance.
+
+        Args:
+            collection (str): The name of the collection.
+            replace_all (bool, optional): If True, delete every existing row
+                before applying the upserts. Defaults to False.
+        """
+        self.collection = collection
+        self.upserts = []
+        self.moves = []
+        self.deletes = []
+        self.replace_all = replace_all
+
+    def __len__(self) -> int:
+        """Returns the number of rows that are written or deleted."""
+        return len(self.upserts) + len(self.moves) + len(self.deletes)
+
+
+class SQLiteProjectStore:
+    """Stores the collections of a project in a SQLite database.
+
+    Objects are tracked by identity: the store remembers which row each
+    loaded or saved object lives in, along with a digest of the row's data.
+    `diff` compares a collection against these rows on the main thread, and
+    `apply` writes the resulting changes, which it may do on a worker
+    thread. Only one set of changes should be outstanding at a time; if
+    applying them fails, call `invalidate` so that the next save rewrites
+    the affected collections in full.
+
+    Attributes:
+        path (str): The path of the database file.
+    """
+
+    def __init__(self, path: str):
+        """Opens a project database, creating it if it does not exist.
+
+        Args:
+            path (str): The path of the database file.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened, or was written
+                by a newer version of AdvEngine.
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS store_info (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        row = self._connection.execute(
+            "SELECT value FROM store_info WHERE key = 'schema_version'"
+        ).fetchone()
+        if row is None:
+            self._connection.execute(
+                "INSERT INTO store_info VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+        elif int(row[0]) > SCHEMA_VERSION:
+            self._connection.close()
+            raise sqlite3.DatabaseError(
+                f"{path} was created by a newer version of AdvEngine"
+            )
+        self._tables = set()
+        # For each collection, maps id(obj) to [obj, key, position, digest].
+        self._rows = {}
+        self._next_keys = {}
+        self._stale = set()
+
+    @staticmethod
+    def exists(project_path: str) -> bool:
+        """Returns True if a project has a database.
+
+        Args:
+            project_path (str): The project's root directory.
+        """
+        return os.path.exists(os.path.join(project_path, DATABASE_FILENAME))
+
+    def close(self):
+        """Closes the database."""
+        with self._lock:
+            self._connection.close()
+
+    def load(self, collection: str, decoder: callable) -> list:
+        """Loads every object in a collection.
+
+        Args:
+            collection (str): The name of the collection.
+            decoder (callable): Creates an object from its decoded JSON data.
+
+        Returns:
+            list: The objects, in collection order.
+        """
+        with self._lock:
+            self._ensure_table(collection)
+            rows = self._connection.execute(
+                "SELECT key, position, data_digest, data"
+                f' FROM "{collection}" ORDER BY position'
+            ).fetchall()
+        # Parsing the rows as a single array is much faster than parsing
+        # them one at a time.
+        values = json.loads("[" + ",".join(row[3] for row in rows) + "]")
+        objects = []
+        tracked = {}
+        for (key, position, digest, _), value in zip(rows, values):
+            obj = decoder(value)
+            objects.append(obj)
+            tracked[id(obj)] = [obj, key, position, digest]
+        self._track(collection, tracked, rows)
+        return objects
+
+    def load_summaries(self, collection: str, create: callable) -> list:
+        """Loads a graph collection without decoding the graphs' nodes.
+
+        Args:
+            collection (str): The name of the collection.
+            create (callable): Called with the key, ID, name and node count
+                of each graph, and returns the object that stands for it.
+                The object's nodes can be read later with `read`.
+
+        Returns:
+            list: The objects returned by `create`, in collection order.
+        """
+        with self._lock:
+            self._ensure_table(collection)
+            rows = self._connection.execute(
+                "SELECT key, position, data_digest, id,"
+                " json_extract(data, '$.name'), json_array_length(data, '$.nodes')"
+                f' FROM "{collection}" ORDER BY position'
+            ).fetchall()
+        objects = []
+        tracked = {}
+        for key, position, digest, obj_id, name, node_count in rows:
+            obj = create(key, obj_id, name, node_count or 0)
+            objects.append(obj)
+            tracked[id(obj)] = [obj, key, position, digest]
+        self._track(collection, tracked, rows)
+        return objects
+
+    def read(self, collection: str, key: int) -> bytes:
+        """Reads the JSON data of a single row.
+
+        Args:
+            collection (str): The name of the collection.
+            key (int): The row's key.
+
+        Returns:
+            bytes: The row's data as UTF-8 encoded JSON.
+
+        Raises:
+            KeyError: If the row does not exist.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f'SELECT data FROM "{collection}" WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"No row {key} in {collection}")
+        return row[0].encode("utf-8")
+
+    def diff(
+        self,
+        collection: str,
+        objects: list,
+        unchanged: callable = None,
+        changed: set = None,
+    ):
+        """Works out the row changes needed to save a collection.
+
+        This method encodes the objects, so it must run on the thread that
+        owns them. It records the new state of the collection as if the
+        changes had been applied.
+
+        Args:
+            collection (str): The name of the collection.
+            objects (list): The objects in the collection, in order.
+            unchanged (callable, optional): Called with an object that is
+                already in the database; if it returns True, the object is
+                assumed unchanged and is not encoded. Defaults to None.
+            changed (set, optional): The ids of the objects that may have
+                changed. Objects that are already in the database and not in
+                this set are assumed unchanged. Defaults to None, meaning any
+                object may have changed.
+
+        Returns:
+            StoreChanges: The changes to apply.
+        """
+        replace_all = collection in self._stale or collection not in self._rows
+        previous = {} if replace_all else self._rows[collection]
+        rows = []
+        for obj in objects:
+            row = previous.get(id(obj))
+            rows.append(row if row is not None and row[0] is obj else None)
+        positions = _assign_positions([row and row[2] for row in rows])
+
+        changes = StoreChanges(collection, replace_all=replace_all)
+        tracked = {}
+        for obj, row, position in zip(objects, rows, positions):
+            if row is not None and (
+                (changed is not None and id(obj) not in changed)
+                or (unchanged is not None and unchanged(obj))
+            ):
+                if row[2] != position:
+                    changes.moves.append((position, row[1]))
+                    row[2] = position
+                tracked[id(obj)] = row
+                continue
+            data = json.dumps(encode(obj))
+            digest = _digest(data)
+            if row is None:
+                row = [obj, self._new_key(collection), position, None]
+            if row[3] != digest or replace_all:
+                obj_id = getattr(obj, "id", None)
+                changes.upserts.append((row[1], obj_id, position, data, digest))
+            elif row[2] != position:
+                changes.moves.append((position, row[1]))
+            row[2] = position
+            row[3] = digest
+            tracked[id(obj)] = row
+        changes.deletes = [
+            row[1] for obj_id, row in previous.items() if obj_id not in tracked
+        ]
+        self._rows[collection] = tracked
+        self._stale.discard(collection)
+        return changes
+
+    def apply(self, changes: list):
+        """Writes row changes to the database in a single transaction.
+
+        Either every change is written or, if an error occurs, none are.
+
+        Args:
+            changes (list[StoreChanges]): The changes returned by `diff`.
+
+        Raises:
+            sqlite3.Error: If the changes could not be written.
+        """
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for table in changes:
+                    self._ensure_table(table.collection)
+                    name = table.collection
+                    if table.replace_all:
+                        connection.execute(f'DELETE FROM "{name}"')
+                    connection.executemany(
+                        f'DELETE FROM "{name}" WHERE key = ?',
+                        [(key,) for key in table.deletes],
+                    )
+                    connection.executemany(
+                        f'INSERT OR REPLACE INTO "{name}"'
+                        " (key, id, position, data, data_digest)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        table.upserts,
+                    )
+                    connection.executemany(
+                        f'UPDATE "{name}" SET position = ? WHERE key = ?',
+                        table.moves,
+                    )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def invalidate(self, collection: str):
+        """Makes the next diff of a collection rewrite every row.
+
+        Call this when changes returned by `diff` could not be applied.
+
+        Args:
+            collection (str): The name of the collection.
+        """
+        self._stale.add(collection)
+
+    def _track(self, collection: str, tracked: dict, rows: list):
+        """Records the rows of a freshly loaded collection."""
+        self._rows[collection] = tracked
+        self._next_keys[collection] = max((row[0] for row in rows), default=0) + 1
+        self._stale.discard(collection)
+
+    def _new_key(self, collection: str) -> int:
+        """Allocates the key of a new row."""
+        if collection not in self._next_keys:
+            with self._lock:
+                self._ensure_table(collection)
+                (largest,) = self._connection.execute(
+                    f'SELECT MAX(key) FROM "{collection}"'
+                ).fetchone()
+            self._next_keys[collection] = (largest or 0) + 1
+        key = self._next_keys[collection]
+        self._next_keys[collection] = key + 1
+        return key
+
+    def _ensure_table(self, collection: str):
+        """Creates the table for a collection if it does not exist."""
+        if collection in self._tables:
+            return
+        with self._lock:
+            self._connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{collection}" ('
+                "key INTEGER PRIMARY KEY, id TEXT, position REAL NOT NULL,"
+                " data TEXT NOT NULL, data_digest BLOB)"
+            )
+            self._connection.execute(
+                f'CREATE INDEX IF NOT EXISTS "{collection}_id"'
+                f' ON "{collection}" (id)'
+            )
+            self._tables.add(collection)
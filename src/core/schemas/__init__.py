@@ -4,7 +4,14 @@ from .item import Item, ItemGObject
 from .attribute import Attribute, AttributeGObject
 from .character import Character, CharacterGObject
 from .scene import Scene, SceneGObject, Hotspot, HotspotGObject
-from .logic import LogicNode, DialogueNode, ConditionNode, ActionNode, LogicGraph
+from .logic import (
+    LogicNode,
+    DialogueNode,
+    ConditionNode,
+    ActionNode,
+    LogicGraph,
+    LazyLogicGraph,
+)
 from .asset import Asset, AssetGObject, Animation, Audio, AudioGObject
 from .global_state import GlobalVariable, GlobalVariableGObject
 from .verb import Verb, VerbGObject
@@ -8,6 +8,7 @@ import gi
 gi.require_version("Gtk", "4.0")
 from dataclasses import dataclass, field
 from typing import List
+from ..schema_codec import register_variants
 from .gobject_factory import create_gobject_wrapper
 
 
@@ -49,6 +50,9 @@ class Animation(Asset):
     frames: List[str] = field(default_factory=list)
 
 
+register_variants(Asset, "asset_type", {"animation": Animation})
+
+
 @dataclass
 class Audio(Asset):
     """Represents an audio asset, inheriting from the base Asset class.
@@ -4,7 +4,37 @@ import gi
 
 gi.require_version("Gtk", "4.0")
 from gi.repository import GObject
+import inspect
 import json
+import weakref
+
+_change_listeners = []
+
+
+def register_change_listener(callback: callable):
+    """Registers a callback to be called when a wrapped dataclass changes.
+
+    Bound methods are referenced weakly, so registering a listener does not
+    keep its owner alive.
+
+    Args:
+        callback (callable): A callable that takes the modified dataclass
+            instance as its only argument.
+    """
+    if inspect.ismethod(callback):
+        _change_listeners.append(weakref.WeakMethod(callback))
+    else:
+        _change_listeners.append(lambda: callback)
+
+
+def _notify_change_listeners(instance):
+    """Notifies all registered listeners that a dataclass has changed."""
+    for ref in list(_change_listeners):
+        callback = ref()
+        if callback is None:
+            _change_listeners.remove(ref)
+        else:
+            callback(instance)
 
 
 def create_gobject_wrapper(dataclass_type):
@@ -46,7 +76,9 @@ def create_gobject_wrapper(dataclass_type):
             value = getattr(self, py_attr_name)
             if isinstance(getattr(instance, py_attr_name), dict):
                 value = json.loads(value)
-            setattr(instance, py_attr_name, value)
+            if getattr(instance, py_attr_name) != value:
+                setattr(instance, py_attr_name, value)
+                _notify_change_listeners(instance)
 
     new_class = type(
         class_name,
@@ -1,24 +1,67 @@
 """Defines the data schemas for the node-based logic editor."""
 
-from dataclasses import dataclass, field
-from typing import List, Optional
+import re
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional
 
+from ..commands import COMMAND_DEFINITIONS
+from ..schema_codec import register_variants
 
-@dataclass
+
+def _snake_to_pascal(name: str) -> str:
+    """Converts a snake_case parameter name to its PascalCase form."""
+    return "".join(
+        "ID" if part == "id" else part.capitalize() for part in name.split("_")
+    )
+
+
+def _pascal_to_snake(name: str) -> str:
+    """Converts a PascalCase parameter name to its snake_case form."""
+    name = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
+    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", name).lower()
+
+
+def _parameter_defaults(kind: str) -> Dict[str, Any]:
+    """Collects the default value of every parameter of a kind of command.
+
+    Args:
+        kind (str): "conditions" or "actions".
+
+    Returns:
+        dict: The default value of each parameter, keyed by PascalCase name.
+        Parameters that are an int or a bool in every command default to 0
+        or False; all others default to an empty string.
+    """
+    types = {}
+    for definition in COMMAND_DEFINITIONS[kind].values():
+        for name, param_type in definition["params"].items():
+            types.setdefault(name, set()).add(
+                param_type if isinstance(param_type, str) else "str"
+            )
+    return {
+        name: {"int": 0, "bool": False}.get(next(iter(kinds)), "")
+        if len(kinds) == 1
+        else ""
+        for name, kinds in types.items()
+    }
+
+
+@dataclass(slots=True)
 class LogicNode:
     """Base class for all nodes in a logic graph."""
 
     id: str
     node_type: str
-    x: int
-    y: int
+    x: int = 0
+    y: int = 0
     width: int = 240
     height: int = 160
     inputs: List[str] = field(default_factory=list)
     outputs: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class DialogueNode(LogicNode):
     """A node that represents a line of dialogue."""
 
@@ -27,61 +70,415 @@ class DialogueNode(LogicNode):
     action_node: Optional["ActionNode"] = None
 
 
-@dataclass
-class ConditionNode(LogicNode):
+@dataclass(slots=True)
+class CommandNode(LogicNode):
+    """Base class for nodes that run a command with parameters.
+
+    Parameters are stored sparsely in the `parameters` dict of each subclass,
+    keyed by the PascalCase names used in COMMAND_DEFINITIONS; a parameter
+    holding its default value is not stored at all. Every parameter is also
+    available as a snake_case attribute, such as `node.item_id`, except for
+    parameters whose names clash with a node field, such as the X and Y
+    parameters of SHOW_ENTITY, which must be accessed with `get_parameter`
+    and `set_parameter`.
+    """
+
+    # The COMMAND_DEFINITIONS section for the node's commands, the default
+    # value of each of their parameters, and the parameter names keyed by
+    # their lowercase form without underscores.
+    COMMAND_KIND = ""
+    PARAMETER_DEFAULTS = {}
+    PARAMETER_NAMES = {}
+
+    def get_parameter(self, name: str, default: Any = None) -> Any:
+        """Gets the value of a command parameter.
+
+        Args:
+            name (str): The PascalCase name of the parameter.
+            default (Any, optional): The value to return for an unset
+                parameter that is not in the command definitions. Defaults
+                to None.
+
+        Returns:
+            Any: The parameter's value.
+        """
+        return self.parameters.get(
+            name, self.PARAMETER_DEFAULTS.get(name, default)
+        )
+
+    def set_parameter(self, name: str, value: Any):
+        """Sets the value of a command parameter.
+
+        Setting a parameter to its default value removes it from storage.
+
+        Args:
+            name (str): The PascalCase name of the parameter.
+            value (Any): The new value.
+        """
+        if name in self.PARAMETER_DEFAULTS and value == self.PARAMETER_DEFAULTS[name]:
+            self.parameters.pop(name, None)
+        else:
+            self.parameters[name] = value
+
+    @classmethod
+    def from_data(cls, data: dict) -> "CommandNode":
+        """Creates a node from its JSON data.
+
+        Parameters may be given in a "parameters" dict, with PascalCase or
+        snake_case names, or as top-level snake_case keys, as in projects
+        saved before parameters were stored sparsely. Top-level keys take
+        precedence.
+
+        Args:
+            data (dict): The node's data.
+
+        Returns:
+            CommandNode: The new node.
+        """
+        field_names = {node_field.name for node_field in fields(cls)}
+        kwargs = {}
+        parameters = {}
+        for key, value in (data.get("parameters") or {}).items():
+            parameters[cls._parameter_key(key)] = value
+        for key, value in data.items():
+            if key in field_names:
+                if key != "parameters":
+                    kwargs[key] = value
+            else:
+                parameters[cls._parameter_key(key)] = value
+        kwargs["parameters"] = {
+            name: value
+            for name, value in parameters.items()
+            if name not in cls.PARAMETER_DEFAULTS
+            or value != cls.PARAMETER_DEFAULTS[name]
+        }
+        return cls(**kwargs)
+
+    @classmethod
+    def _parameter_key(cls, key: str) -> str:
+        """Returns the PascalCase storage name for a parameter name."""
+        if key in cls.PARAMETER_DEFAULTS:
+            return key
+        name = cls.PARAMETER_NAMES.get(key.replace("_", "").lower())
+        return name or _snake_to_pascal(key)
+
+    @classmethod
+    def _add_parameter_attributes(cls):
+        """Adds a snake_case attribute for each of the class's parameters."""
+        node_fields = {node_field.name for node_field in fields(cls)}
+        for name, default in cls.PARAMETER_DEFAULTS.items():
+            attribute = _pascal_to_snake(name)
+            if attribute in node_fields or hasattr(cls, attribute):
+                continue
+            setattr(cls, attribute, _parameter_property(name, default))
+
+
+def _parameter_property(name: str, default: Any) -> property:
+    """Creates an attribute that reads and writes a stored parameter."""
+
+    def getter(self):
+        return self.parameters.get(name, default)
+
+    def setter(self, value):
+        self.set_parameter(name, value)
+
+    return property(getter, setter, doc=f"The {name} parameter.")
+
+
+@dataclass(slots=True)
+class ConditionNode(CommandNode):
     """A node that checks a condition in the game world."""
 
+    COMMAND_KIND = "conditions"
+    PARAMETER_DEFAULTS = _parameter_defaults("conditions")
+    PARAMETER_NAMES = {name.lower(): name for name in PARAMETER_DEFAULTS}
+
     condition_type: str = ""
-    var_name: str = ""
-    value: str = ""
-    item_id: str = ""
-    amount: int = 0
-    attribute_id: str = ""
-    comparison: str = ""
-    hotspot_id: str = ""
-    state: bool = False
-    entity_id: str = ""
-    visible: bool = False
-    scene_id: str = ""
-    times: int = 0
-    check_id: str = ""
-    mesh_id: str = ""
-    time_state: str = ""
+    parameters: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
-class ActionNode(LogicNode):
+@dataclass(slots=True)
+class ActionNode(CommandNode):
     """A node that performs an action in the game world."""
 
+    COMMAND_KIND = "actions"
+    PARAMETER_DEFAULTS = _parameter_defaults("actions")
+    PARAMETER_NAMES = {name.lower(): name for name in PARAMETER_DEFAULTS}
+
     action_command: str = ""
-    var_name: str = ""
-    value: str = ""
-    item_id: str = ""
-    amount: int = 0
-    scene_id: str = ""
-    spawn_point: str = ""
-    shop_id: str = ""
-    attribute_id: str = ""
-    cinematic_id: str = ""
-    sound_id: str = ""
-    hotspot_id: str = ""
-    target_id: str = ""
-    animation_key: str = ""
-    loop: bool = False
-    entity_id: str = ""
-    x: int = 0
-    y: int = 0
-    mode: str = ""
-    mesh_id: str = ""
-    dialogue_node_id: str = ""
-    quest_id: str = ""
-    objective_id: str = ""
+    parameters: Dict[str, Any] = field(default_factory=dict)
+
+
+ConditionNode._add_parameter_attributes()
+ActionNode._add_parameter_attributes()
+register_variants(
+    LogicNode,
+    "node_type",
+    {"Dialogue": DialogueNode, "Condition": ConditionNode, "Action": ActionNode},
+)
 
 
 @dataclass
 class LogicGraph:
-    """Represents a graph of logic nodes."""
+    """Represents a graph of logic nodes.
+
+    Nodes can be looked up by ID in constant time with `get_node`. Nodes
+    should be added and removed with `add_node` and `remove_node` so that the
+    node index stays current; the index is also rebuilt automatically if the
+    node list is modified directly.
+
+    The graph also caches its connections as forward and reverse adjacency
+    lists, built from each node's `outputs`. Connections should be changed
+    with `connect` and `disconnect`, which keep `outputs`, `inputs` and the
+    cache in sync. Code that edits `outputs` directly must call
+    `invalidate_edges` afterwards.
+    """
 
     id: str
     name: str
     nodes: List[LogicNode] = field(default_factory=list)
+
+    def __post_init__(self):
+        """Initializes the node index, which is not part of the data."""
+        self._node_index = {}
+        self._indexed_count = -1
+        self._edges = []
+        self._successors = {}
+        self._predecessors = {}
+        self._edges_count = -1
+
+    @property
+    def node_count(self) -> int:
+        """int: The number of nodes in the graph."""
+        return len(self.nodes)
+
+    def get_node(self, node_id: str) -> Optional[LogicNode]:
+        """Gets a node in this graph by its ID.
+
+        Args:
+            node_id (str): The ID of the node to find.
+
+        Returns:
+            LogicNode or None: The node with the given ID, or None if the
+            graph has no such node.
+        """
+        if self._indexed_count != len(self.nodes):
+            self._build_node_index()
+        node = self._node_index.get(node_id)
+        if node is not None and node.id != node_id:
+            self._build_node_index()
+            node = self._node_index.get(node_id)
+        return node
+
+    def add_node(self, node: LogicNode):
+        """Appends a node to the graph.
+
+        Args:
+            node (LogicNode): The node to add.
+        """
+        in_sync = self._indexed_count == len(self.nodes)
+        edges_in_sync = self._edges_count == len(self.nodes)
+        self.nodes.append(node)
+        if in_sync:
+            self._node_index.setdefault(node.id, node)
+            self._indexed_count += 1
+        if edges_in_sync and not node.inputs and not node.outputs:
+            self._edges_count += 1
+        else:
+            self._edges_count = -1
+
+    def remove_node(self, node: LogicNode):
+        """Removes a node from the graph, along with its connections.
+
+        Args:
+            node (LogicNode): The node to remove.
+        """
+        sources = self.predecessors(node)
+        targets = self.successors(node)
+        self.nodes.remove(node)
+        for source in sources:
+            source.outputs[:] = [i for i in source.outputs if i != node.id]
+        for target in targets:
+            target.inputs[:] = [i for i in target.inputs if i != node.id]
+        self._indexed_count = -1
+        self._edges_count = -1
+
+    def connect(self, source: LogicNode, target: LogicNode) -> bool:
+        """Connects the output of one node to the input of another.
+
+        Args:
+            source (LogicNode): The node the connection starts from.
+            target (LogicNode): The node the connection ends at.
+
+        Returns:
+            bool: True if the connection was added, or False if the nodes
+            were already connected.
+        """
+        if target.id in source.outputs:
+            return False
+        self._ensure_edges()
+        source.outputs.append(target.id)
+        if source.id not in target.inputs:
+            target.inputs.append(source.id)
+        self._edges.append((source, target))
+        self._successors.setdefault(source.id, []).append(target)
+        self._predecessors.setdefault(target.id, []).append(source)
+        return True
+
+    def disconnect(self, source: LogicNode, target: LogicNode):
+        """Removes the connection between two nodes, if there is one.
+
+        Args:
+            source (LogicNode): The node the connection starts from.
+            target (LogicNode): The node the connection ends at.
+        """
+        source.outputs[:] = [i for i in source.outputs if i != target.id]
+        target.inputs[:] = [i for i in target.inputs if i != source.id]
+        self._edges_count = -1
+
+    def edges(self) -> List[tuple]:
+        """Gets every connection in the graph.
+
+        Connections to IDs that do not exist in the graph are left out.
+
+        Returns:
+            list[tuple]: A (source, target) node pair for each connection,
+            in node order.
+        """
+        self._ensure_edges()
+        return self._edges
+
+    def successors(self, node: LogicNode) -> List[LogicNode]:
+        """Gets the nodes that a node's output is connected to.
+
+        Args:
+            node (LogicNode): The node.
+
+        Returns:
+            list[LogicNode]: The connected nodes, in the order of the node's
+            outputs.
+        """
+        self._ensure_edges()
+        return list(self._successors.get(node.id, ()))
+
+    def predecessors(self, node: LogicNode) -> List[LogicNode]:
+        """Gets the nodes whose outputs are connected to a node.
+
+        Args:
+            node (LogicNode): The node.
+
+        Returns:
+            list[LogicNode]: The connected nodes, in node order.
+        """
+        self._ensure_edges()
+        return list(self._predecessors.get(node.id, ()))
+
+    def invalidate_edges(self):
+        """Discards the connection cache after `outputs` was edited directly."""
+        self._edges_count = -1
+
+    def _ensure_edges(self):
+        """Rebuilds the connection cache if it is out of date."""
+        if self._edges_count == len(self.nodes):
+            return
+        self._edges = []
+        self._successors = {}
+        self._predecessors = {}
+        for source in self.nodes:
+            for target_id in source.outputs:
+                target = self.get_node(target_id)
+                if target is None:
+                    continue
+                self._edges.append((source, target))
+                self._successors.setdefault(source.id, []).append(target)
+                self._predecessors.setdefault(target.id, []).append(source)
+        self._edges_count = len(self.nodes)
+
+    def _build_node_index(self):
+        """Rebuilds the node index from the node list."""
+        self._node_index = {node.id: node for node in reversed(self.nodes)}
+        self._indexed_count = len(self.nodes)
+
+
+class LazyLogicGraph(LogicGraph):
+    """A LogicGraph whose nodes are only built when they are first used.
+
+    The graph's ID, name and node count are available without building its
+    nodes. Until the nodes are built, and as long as the ID and name are
+    unchanged, the graph's original JSON can be written back as is.
+    """
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        node_count: int,
+        load_nodes: Callable[[], List[LogicNode]],
+        read_source: Callable[[], bytes],
+    ):
+        """Initializes a new LazyLogicGraph instance.
+
+        Args:
+            id (str): The ID of the graph.
+            name (str): The name of the graph.
+            node_count (int): The number of nodes in the graph.
+            load_nodes (callable): A function that builds the graph's nodes.
+            read_source (callable): A function that returns the graph's
+                original JSON.
+        """
+        self.id = id
+        self.name = name
+        self._nodes = None
+        self._node_count = node_count
+        self._load_nodes = load_nodes
+        self._read_source = read_source
+        self._source_header = (id, name)
+        self._load_lock = threading.Lock()
+        self.__post_init__()
+
+    @property
+    def nodes(self) -> List[LogicNode]:
+        """list[LogicNode]: The graph's nodes, built on first access."""
+        if self._nodes is None:
+            # Export workers may read the same graph at the same time.
+            with self._load_lock:
+                if self._nodes is None:
+                    self._nodes = self._load_nodes()
+                    self._load_nodes = None
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes: List[LogicNode]):
+        self._nodes = nodes
+        self._load_nodes = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """bool: True if the graph's nodes have been built."""
+        return self._nodes is not None
+
+    @property
+    def node_count(self) -> int:
+        """int: The number of nodes in the graph."""
+        if self._nodes is None:
+            return self._node_count
+        return len(self._nodes)
+
+    def unchanged_source(self) -> Optional[Callable[[], bytes]]:
+        """Gets a function that reads the graph's original JSON.
+
+        Returns:
+            callable or None: A function returning the original JSON, or None
+            if the graph's nodes were built or its ID or name changed, in
+            which case the original may no longer match the graph.
+        """
+        if self._nodes is None and (self.id, self.name) == self._source_header:
+            return self._read_source
+        return None
+
+    def __repr__(self) -> str:
+        """Describes the graph without building its nodes."""
+        return (
+            f"LazyLogicGraph(id={self.id!r}, name={self.name!r}, "
+            f"node_count={self.node_count}, loaded={self.is_loaded})"
+        )
@@ -18,7 +18,15 @@ from .verb import Verb
 
 @dataclass
 class ProjectData:
-    """A container for all data in an AdvEngine project."""
+    """A container for all data in an AdvEngine project.
+
+    In addition to the collections themselves, ProjectData keeps a lazily
+    built `id -> object` index per collection so that objects can be looked
+    up by ID in constant time. The indexes are maintained by the
+    ProjectManager when items are added or removed, and are rebuilt
+    automatically when a collection's size no longer matches its index or a
+    lookup finds an object whose ID has since changed.
+    """
 
     global_variables: List[GlobalVariable] = field(default_factory=list)
     verbs: List[Verb] = field(default_factory=list)
@@ -33,3 +41,67 @@ class ProjectData:
     interactions: List[Interaction] = field(default_factory=list)
     quests: List[Quest] = field(default_factory=list)
     ui_layouts: List[UILayout] = field(default_factory=list)
+
+    def __post_init__(self):
+        """Initializes the ID indexes, which are not part of the data."""
+        self._id_indexes = {}
+
+    def get_by_id(self, collection_name: str, item_id: str):
+        """Gets an object from a collection by its ID.
+
+        Args:
+            collection_name (str): The name of the collection to search.
+            item_id (str): The ID of the object to find.
+
+        Returns:
+            The first object in the collection with the given ID, or None if
+            there is no such object.
+        """
+        collection = getattr(self, collection_name)
+        index = self._id_indexes.get(collection_name)
+        if index is None or index[1] != len(collection):
+            index = self._build_index(collection_name)
+        item = index[0].get(item_id)
+        if item is not None and item.id != item_id:
+            # The object was renamed since the index was built.
+            item = self._build_index(collection_name)[0].get(item_id)
+        return item
+
+    def index_add(self, collection_name: str, item):
+        """Records an object that was appended to a collection.
+
+        Args:
+            collection_name (str): The name of the collection.
+            item: The object that was appended.
+        """
+        index = self._id_indexes.get(collection_name)
+        if index is not None:
+            index[0].setdefault(item.id, item)
+            index[1] += 1
+
+    def invalidate_index(self, collection_name: str = None):
+        """Discards the index of a collection so it is rebuilt on next use.
+
+        Args:
+            collection_name (str, optional): The name of the collection. If
+                omitted, every index is discarded. Defaults to None.
+        """
+        if collection_name is None:
+            self._id_indexes.clear()
+        else:
+            self._id_indexes.pop(collection_name, None)
+
+    def _build_index(self, collection_name: str) -> list:
+        """Builds the ID index for a collection.
+
+        Args:
+            collection_name (str): The name of the collection.
+
+        Returns:
+            list: The index mapping and the collection size it reflects.
+        """
+        collection = getattr(self, collection_name)
+        # Iterate in reverse so the first object wins for duplicate IDs.
+        index = [{item.id: item for item in reversed(collection)}, len(collection)]
+        self._id_indexes[collection_name] = index
+        return index
@@ -9,11 +9,19 @@ from .gobject_factory import create_gobject_wrapper
 
 @dataclass
 class SearchResult:
-    """Represents a single search result."""
+    """Represents a single search result.
+
+    Attributes:
+        id (str): The ID of the matching object.
+        name (str): The display name of the matching object.
+        type (str): The kind of object that matched, e.g. "Item".
+        field (str): The comma-separated names of the fields that matched.
+    """
 
     id: str
     name: str
     type: str
+    field: str = ""
 
 
 SearchResultGObject = create_gobject_wrapper(SearchResult)
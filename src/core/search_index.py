@@ -0,0 +1,526 @@
+"""Full-text search over AdvEngine project data.
+
+This module provides the SearchIndex class, an inverted index over every
+searchable text field in a project, including dialogue lines, logic node
+parameters, global variables and hotspots. Text is split into lowercase word
+tokens, and every token is further indexed by its character trigrams so that
+substring queries only have to examine the few tokens that can match.
+"""
+
+import heapq
+import json
+import re
+import threading
+from dataclasses import fields as dataclass_fields
+
+from .schemas import SearchResult
+
+NGRAM_SIZE = 3
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Matches on these fields rank above matches in free text.
+_FIELD_WEIGHTS = {"name": 3.0, "display_name": 3.0, "id": 2.0}
+
+# Exact token matches rank above prefix matches, which rank above other
+# substring matches.
+_EXACT, _PREFIX, _SUBSTRING = 3.0, 2.0, 1.0
+
+# The result type, display name field and searchable fields of each
+# top-level collection.
+_COLLECTIONS = {
+    "items": ("Item", "name", ("id", "name", "type", "description")),
+    "attributes": ("Attribute", "name", ("id", "name")),
+    "characters": (
+        "Character",
+        "display_name",
+        ("id", "display_name", "dialogue_start_id", "shop_id"),
+    ),
+    "scenes": ("Scene", "name", ("id", "name", "background_image")),
+    "logic_graphs": ("Logic Graph", "name", ("id", "name")),
+    "assets": ("Asset", "name", ("id", "name", "asset_type", "file_path")),
+    "audio_files": ("Audio", "name", ("id", "name", "file_path")),
+    "global_variables": (
+        "Global Variable",
+        "name",
+        ("id", "name", "category", "initial_value"),
+    ),
+    "verbs": ("Verb", "name", ("id", "name")),
+    "dialogue_graphs": ("Dialogue Graph", "name", ("id", "name")),
+    "interactions": (
+        "Interaction",
+        "id",
+        (
+            "id",
+            "verb_id",
+            "primary_item_id",
+            "secondary_item_id",
+            "target_hotspot_id",
+            "logic_graph_id",
+        ),
+    ),
+    "quests": ("Quest", "name", ("id", "name")),
+    "ui_layouts": ("UI Layout", "name", ("id", "name")),
+}
+
+# Nested objects that are searchable in their own right, keyed by the
+# collection that owns them.
+_CHILDREN = {
+    "scenes": ("hotspots", "Hotspot", "name", ("id", "name")),
+    "quests": ("objectives", "Objective", "name", ("id", "name")),
+    "ui_layouts": ("elements", "UI Element", "id", ("id", "type")),
+}
+
+# Logic node fields that hold layout or connection data rather than text.
+_NODE_LAYOUT_FIELDS = {"x", "y", "width", "height", "inputs", "outputs"}
+
+# The searchable field names of each node class, filled in on first use.
+_node_field_names = {}
+
+
+def _tokenize(text: str) -> list[str]:
+    """Splits text into lowercase word tokens.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list[str]: The tokens, in order of appearance.
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _token_grams(token: str) -> list[str]:
+    """Returns the index keys for a token.
+
+    Every token is keyed by its one- and two-character prefixes, marked with
+    a leading "^", and by each of its character trigrams.
+
+    Args:
+        token (str): The token to key.
+
+    Returns:
+        list[str]: The distinct index keys for the token.
+    """
+    prefix_lengths = range(1, min(len(token), NGRAM_SIZE - 1) + 1)
+    keys = ["^" + token[:length] for length in prefix_lengths]
+    keys.extend(
+        token[i : i + NGRAM_SIZE] for i in range(len(token) - NGRAM_SIZE + 1)
+    )
+    return list(dict.fromkeys(keys))
+
+
+def _text_fields(obj, field_names) -> dict:
+    """Collects the non-empty text values of an object's fields.
+
+    Args:
+        obj: The object to read.
+        field_names (Iterable[str]): The names of the fields to read.
+
+    Returns:
+        dict: The string value of every non-empty field, keyed by name.
+    """
+    values = {}
+    for name in field_names:
+        value = getattr(obj, name, None)
+        if value is not None and value != "":
+            values[name] = str(value)
+    return values
+
+
+def _node_document(node, collection: str) -> tuple:
+    """Builds the searchable document for a logic or dialogue node.
+
+    Args:
+        node (LogicNode or dict): The node, or the decoded JSON of a node of
+            a lazy graph that has not been built.
+        collection (str): The collection that owns the node's graph.
+
+    Returns:
+        tuple: The display name, result type and text fields of the node.
+    """
+    if isinstance(node, dict):
+        values = node
+    else:
+        field_names = _node_field_names.get(type(node))
+        if field_names is None:
+            field_names = _node_field_names[type(node)] = tuple(
+                node_field.name
+                for node_field in dataclass_fields(node)
+                if node_field.name not in _NODE_LAYOUT_FIELDS
+            )
+        values = {name: getattr(node, name) for name in field_names}
+    text_fields = {}
+    for name, value in values.items():
+        if isinstance(value, str) and value and name not in _NODE_LAYOUT_FIELDS:
+            text_fields[name] = value
+    # Command parameters are stored sparsely, keyed by parameter name.
+    for name, value in (values.get("parameters") or {}).items():
+        if isinstance(value, str) and value:
+            text_fields[name] = value
+
+    dialogue_text = values.get("dialogue_text")
+    if dialogue_text:
+        name = dialogue_text
+        if len(name) > 60:
+            name = name[:57] + "..."
+        return name, "Dialogue Line", text_fields
+    command = values.get("action_command") or values.get("condition_type")
+    prefix = "Dialogue" if collection == "dialogue_graphs" else "Logic"
+    return command or values["id"], f"{prefix} Node", text_fields
+
+
+def _documents(collection: str, obj):
+    """Yields every searchable document contained in a project object.
+
+    Document keys are based on object identity rather than IDs, so they stay
+    stable when an object is renamed.
+
+    Args:
+        collection (str): The name of the collection that owns the object.
+        obj: A top-level object from the collection.
+
+    Yields:
+        tuple: The document key, result ID, display name, result type and
+        text fields of each document.
+    """
+    doc_type, name_field, field_names = _COLLECTIONS[collection]
+    owner = id(obj)
+    yield (
+        (collection, owner, owner),
+        obj.id,
+        str(getattr(obj, name_field, "") or obj.id),
+        doc_type,
+        _text_fields(obj, field_names),
+    )
+
+    if collection in _CHILDREN:
+        attr, child_type, child_name_field, child_fields = _CHILDREN[collection]
+        for child in getattr(obj, attr, None) or []:
+            yield (
+                (collection, owner, id(child)),
+                child.id,
+                str(getattr(child, child_name_field, "") or child.id),
+                child_type,
+                _text_fields(child, child_fields),
+            )
+    elif collection in ("logic_graphs", "dialogue_graphs"):
+        read_source = getattr(obj, "unchanged_source", lambda: None)()
+        if read_source is not None:
+            # Index a lazy graph from its JSON rather than building its nodes.
+            for node in json.loads(read_source()).get("nodes", []):
+                name, node_type, text_fields = _node_document(node, collection)
+                key = (collection, owner, node["id"])
+                yield key, node["id"], name, node_type, text_fields
+            return
+        for node in obj.nodes:
+            name, node_type, text_fields = _node_document(node, collection)
+            key = (collection, owner, id(node))
+            yield key, node.id, name, node_type, text_fields
+
+
+class SearchIndex:
+    """An incrementally updated inverted index over a project's data.
+
+    The index maps word tokens to the documents and fields that contain them,
+    and maps character trigrams to tokens so that substring matches are
+    found without scanning the vocabulary. When a single object changes,
+    only that object's documents are re-indexed on the next query; when a
+    collection changes as a whole, it is compared against its indexed text
+    so that only documents that actually changed are re-tokenized. Lazy
+    graphs that have not been built are indexed from their JSON.
+
+    Queries and refresh() may run on a worker thread while the main thread
+    marks changes.
+
+    Attributes:
+        project_data (ProjectData): The data being indexed.
+    """
+
+    def __init__(self, project_data):
+        """Initializes a new, empty SearchIndex instance.
+
+        Args:
+            project_data (ProjectData): The project data to index.
+        """
+        self.project_data = project_data
+        self._docs = {}
+        self._postings = {}
+        self._grams = {}
+        self._collection_keys = {}
+        self._stale = set(_COLLECTIONS)
+        self._stale_items = {}
+        self._lock = threading.Lock()
+        # Guards the stale markers, so marking a change never waits for a
+        # refresh to finish.
+        self._stale_lock = threading.Lock()
+
+    def clear(self):
+        """Discards the index, so every collection is indexed on next use."""
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._grams.clear()
+            self._collection_keys.clear()
+            self.mark_stale()
+
+    def rebuild(self):
+        """Discards the index and indexes every collection from scratch."""
+        self.clear()
+        self.refresh()
+
+    def mark_stale(self, collection: str = None, item=None):
+        """Marks a collection or object as changed so it is re-indexed.
+
+        Args:
+            collection (str, optional): The name of the changed collection.
+                If omitted, every collection is marked. Defaults to None.
+            item (object, optional): The top-level object of the collection
+                that changed. If omitted, any object in the collection may
+                have changed, or objects were added or removed. Defaults to
+                None.
+        """
+        with self._stale_lock:
+            if collection is None:
+                self._stale.update(_COLLECTIONS)
+                self._stale_items.clear()
+            elif collection not in _COLLECTIONS or collection in self._stale:
+                return
+            elif item is None:
+                self._stale.add(collection)
+                self._stale_items.pop(collection, None)
+            else:
+                self._stale_items.setdefault(collection, {})[id(item)] = item
+
+    def refresh(self):
+        """Re-indexes every collection and object that was marked stale."""
+        with self._stale_lock:
+            stale, self._stale = self._stale, set()
+            stale_items, self._stale_items = self._stale_items, {}
+        with self._lock:
+            try:
+                for collection in list(stale):
+                    self._index_collection(collection)
+                    stale.discard(collection)
+                for collection in list(stale_items):
+                    for item in stale_items[collection].values():
+                        self._index_object(collection, item)
+                    del stale_items[collection]
+            except Exception:
+                # Keep whatever was not indexed for the next refresh.
+                with self._stale_lock:
+                    self._stale.update(stale)
+                    self._stale.update(stale_items)
+                raise
+
+    def query(
+        self, text: str, limit: int = None, cancelled: callable = None
+    ) -> list[SearchResult]:
+        """Finds the documents that match every word of a query.
+
+        Each query word matches indexed tokens that contain it; words shorter
+        than three characters only match token prefixes. Results are ranked
+        by how closely and in which fields each word matched.
+
+        Args:
+            text (str): The query text.
+            limit (int, optional): The maximum number of results to return.
+                Defaults to None, which returns every match.
+            cancelled (callable, optional): A callable that returns True if
+                the query should be abandoned. Defaults to None.
+
+        Returns:
+            list[SearchResult]: The matching results, best match first. An
+            empty list is returned if the query was cancelled.
+        """
+        terms = list(dict.fromkeys(_tokenize(text)))
+        if not terms:
+            return []
+        with self._lock:
+            return self._query(terms, limit, cancelled)
+
+    def _query(self, terms: list[str], limit: int, cancelled: callable) -> list:
+        """Runs a query while the index lock is held.
+
+        Args:
+            terms (list[str]): The distinct query words.
+            limit (int): The maximum number of results, or None.
+            cancelled (callable): A cancellation check, or None.
+
+        Returns:
+            list[SearchResult]: The ranked results.
+        """
+        scores = None
+        matched = set()
+        for term in terms:
+            term_scores = {}
+            for token, quality in self._match_tokens(term):
+                matched.add(token)
+                for key, weight in self._postings[token].items():
+                    weight *= quality
+                    if weight > term_scores.get(key, 0.0):
+                        term_scores[key] = weight
+                if cancelled and cancelled():
+                    return []
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    key: score + term_scores[key]
+                    for key, score in scores.items()
+                    if key in term_scores
+                }
+            if not scores:
+                return []
+
+        def rank(entry):
+            key, score = entry
+            doc = self._docs[key]
+            return -score, doc[2], doc[1]
+
+        if limit is None:
+            ranked = sorted(scores.items(), key=rank)
+        else:
+            ranked = heapq.nsmallest(limit, scores.items(), key=rank)
+
+        results = []
+        for key, _ in ranked:
+            result_id, name, doc_type, _, field_tokens = self._docs[key]
+            hits = [
+                field_name
+                for field_name, tokens in field_tokens.items()
+                if tokens & matched
+            ]
+            results.append(
+                SearchResult(
+                    id=result_id,
+                    name=name,
+                    type=doc_type,
+                    field=", ".join(sorted(hits)),
+                )
+            )
+        return results
+
+    def _match_tokens(self, term: str):
+        """Yields the indexed tokens that match a query word.
+
+        Args:
+            term (str): A lowercase query word.
+
+        Yields:
+            tuple: Each matching token and the quality of the match.
+        """
+        if len(term) < NGRAM_SIZE:
+            for token in self._grams.get("^" + term, ()):
+                yield token, _EXACT if token == term else _PREFIX
+            return
+
+        gram_sets = []
+        for i in range(len(term) - NGRAM_SIZE + 1):
+            tokens = self._grams.get(term[i : i + NGRAM_SIZE])
+            if not tokens:
+                return
+            gram_sets.append(tokens)
+        gram_sets.sort(key=len)
+        candidates = gram_sets[0].intersection(*gram_sets[1:])
+        for token in candidates:
+            if token == term:
+                yield token, _EXACT
+            elif token.startswith(term):
+                yield token, _PREFIX
+            elif term in token:
+                yield token, _SUBSTRING
+
+    def _index_collection(self, collection: str):
+        """Brings the index of a single collection up to date.
+
+        Args:
+            collection (str): The name of the collection to index.
+        """
+        documents = {}
+        owners = {}
+        for obj in list(getattr(self.project_data, collection)):
+            keys = owners[id(obj)] = set()
+            for key, *document in _documents(collection, obj):
+                documents[key] = tuple(document)
+                keys.add(key)
+
+        old_keys = set().union(*self._collection_keys.get(collection, {}).values())
+        self._update_documents(old_keys, documents)
+        self._collection_keys[collection] = owners
+
+    def _index_object(self, collection: str, obj):
+        """Brings the index of a single top-level object up to date.
+
+        Args:
+            collection (str): The name of the collection that owns the object.
+            obj: The object to index.
+        """
+        documents = {
+            key: tuple(document) for key, *document in _documents(collection, obj)
+        }
+        owners = self._collection_keys.setdefault(collection, {})
+        self._update_documents(owners.get(id(obj), set()), documents)
+        owners[id(obj)] = set(documents)
+
+    def _update_documents(self, old_keys: set, documents: dict):
+        """Replaces indexed documents with their current contents.
+
+        Args:
+            old_keys (set): The keys of the documents indexed previously.
+            documents (dict): The current documents, keyed by document key.
+        """
+        for key in old_keys - documents.keys():
+            self._remove_document(key)
+        for key, document in documents.items():
+            indexed = self._docs.get(key)
+            if indexed is not None:
+                if indexed[:4] == document:
+                    continue
+                self._remove_document(key)
+            self._add_document(key, *document)
+
+    def _add_document(self, key, result_id, name, doc_type, text_fields):
+        """Adds a document to the index.
+
+        Args:
+            key (tuple): The document key.
+            result_id (str): The ID reported in search results.
+            name (str): The display name reported in search results.
+            doc_type (str): The type reported in search results.
+            text_fields (dict): The searchable text, keyed by field name.
+        """
+        # Each posting holds the weight of the best field the token
+        # appears in, so queries never have to look at field names.
+        field_tokens = {}
+        for field_name, text in text_fields.items():
+            tokens = field_tokens[field_name] = set(_tokenize(text))
+            weight = _FIELD_WEIGHTS.get(field_name, 1.0)
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    for gram in _token_grams(token):
+                        self._grams.setdefault(gram, set()).add(token)
+                if weight > postings.get(key, 0.0):
+                    postings[key] = weight
+        self._docs[key] = (result_id, name, doc_type, text_fields, field_tokens)
+
+    def _remove_document(self, key):
+        """Removes a document from the index.
+
+        Args:
+            key (tuple): The document key.
+        """
+        document = self._docs.pop(key)
+        for token in set().union(*document[4].values()):
+            postings = self._postings[token]
+            postings.pop(key, None)
+            if postings:
+                continue
+            del self._postings[token]
+            for gram in _token_grams(token):
+                tokens = self._grams[gram]
+                tokens.discard(token)
+                if not tokens:
+                    del self._grams[gram]
@@ -1,138 +1,495 @@
 import os
 import json
 import csv
-from dataclasses import asdict
-
-COMMAND_DEFINITIONS = {
-    "actions": {
-        "SET_VARIABLE": {"params": {"VarName": "str", "Value": "any"}},
-        "INVENTORY_ADD": {"params": {"ItemID": "str", "Amount": "int"}},
-        "INVENTORY_REMOVE": {"params": {"ItemID": "str", "Amount": "int"}},
-        "SCENE_TRANSITION": {"params": {"SceneID": "str", "SpawnPoint": "str"}},
-        "SHOP_OPEN": {"params": {"ShopID": "str"}},
-        "MODIFY_ATTRIBUTE": {"params": {"AttributeID": "str", "Value": "int"}},
-        "PLAY_CINEMATIC": {"params": {"CinematicID": "str"}},
-        "PLAY_SFX": {"params": {"SoundID": "str"}},
-        "UNLOCK_HOTSPOT": {"params": {"HotspotID": "str"}},
-        "LOCK_HOTSPOT": {"params": {"HotspotID": "str"}},
-        "SET_ANIMATION": {
-            "params": {"TargetID": "str", "AnimationKey": "str", "Loop": "bool"}
-        },
-        "HIDE_ENTITY": {"params": {"EntityID": "str"}},
-        "SHOW_ENTITY": {"params": {"EntityID": "str", "X": "int", "Y": "int"}},
-        "SET_CURSOR_MODE": {"params": {"Mode": ["Contextual", "Classic"]}},
-        "SET_WALK_MESH": {"params": {"SceneID": "str", "MeshID": "str"}},
-        # Extended Actions:
-        "SET_PLAYER_POS": {"params": {"X": "int", "Y": "int"}},
-        "GIVE_CURRENCY": {"params": {"Amount": "int"}},
-        "TAKE_CURRENCY": {"params": {"Amount": "int"}},
-        "PLAY_SOUND_2D": {"params": {"SoundID": "str"}},
-        "SHOW_DIALOGUE_CHOICES": {"params": {"DialogueNodeID": "str"}},
-        "FORCE_SAVE": {"params": {}},
-    },
-    "conditions": {
-        "VARIABLE_EQUALS": {"params": {"VarName": "str", "Value": "any"}},
-        "HAS_ITEM": {"params": {"ItemID": "str", "Amount": "int"}},
-        "ATTRIBUTE_CHECK": {
-            "params": {
-                "AttributeID": "str",
-                "Value": "int",
-                "Comparison": ["==", ">", "<", ">=", "<="],
-            }
-        },
-        "HOTSPOT_LOCKED": {"params": {"HotspotID": "str", "State": "bool"}},
-        "ENTITY_VISIBLE": {"params": {"EntityID": "str", "Visible": "bool"}},
-        "SCENE_VISITED": {"params": {"SceneID": "str", "Times": "int"}},
-        # Extended Conditions:
-        "CURRENCY_GE": {"params": {"Amount": "int"}},
-        "HAS_FAILED_CHECK": {"params": {"CheckID": "str"}},
-        "ENTITY_HAS_ITEM": {"params": {"EntityID": "str", "ItemID": "str"}},
-        "WALK_MESH_ACTIVE": {"params": {"MeshID": "str", "State": "bool"}},
-        "TIME_OF_DAY_IS": {
-            "params": {"TimeState": ["Night", "Morning", "Day", "Evening"]}
-        },
-    },
+import gzip
+import hashlib
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .bundle_writer import build_bundle
+from .commands import COMMAND_DEFINITIONS, get_command_definitions
+from .logic_compiler import compile_graphs
+from .schema_codec import encode, encode_row, field_names
+from .schemas import Attribute, Character, Item
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# The export manifest, relative to the project directory.
+MANIFEST_PATH = os.path.join(".cache", "export_manifest.json")
+
+# The keyword arguments passed to json.dumps for each JSON style.
+JSON_STYLES = {
+    "indented": {"indent": 2},
+    "compact": {},
+    "minified": {"separators": (",", ":")},
 }
 
+# The file extension of the compressed sidecar for each compression format.
+SIDECAR_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+# The logic graphs compiled into instruction tables, relative to the project
+# directory. See logic_compiler for its format.
+BYTECODE_PATH = os.path.join("Logic", "LogicGraphs.bytecode.json")
+
+# The dialogue graphs compiled the same way, relative to the project directory.
+DIALOGUE_BYTECODE_PATH = os.path.join("Dialogues", "DialogueGraphs.bytecode.json")
+
+# The packed binary bundle of the runtime data, relative to the project
+# directory. See bundle_reader for its format.
+BUNDLE_PATH = os.path.join("Data", "GameData.aebundle")
+
+
+@dataclass
+class ExportOptions:
+    """Controls the format of exported files.
+
+    Attributes:
+        json_style (str): "indented" for human-readable JSON, "compact" for
+            JSON without line breaks, or "minified" for JSON without any
+            optional whitespace.
+        compression (str): "gzip" or "zstd" to also write a compressed copy
+            of each JSON output next to it, or None.
+        workers (int): The number of outputs rendered and written at the
+            same time.
+        bundle (bool): If True, also write the runtime data as a packed
+            binary bundle that the game can memory-map instead of parsing
+            the CSV and JSON outputs.
+    """
+
+    json_style: str = "indented"
+    compression: Optional[str] = None
+    workers: int = 1
+    bundle: bool = False
+
+
+# The export modes: human-readable output, and output that is fast to write
+# and for Unreal to parse.
+EXPORT_MODES = {
+    "readable": ExportOptions(),
+    "performance": ExportOptions(
+        json_style="minified",
+        compression="gzip",
+        workers=min(8, os.cpu_count() or 1),
+        bundle=True,
+    ),
+}
+
+
+@dataclass
+class OutputStats:
+    """Describes how one output was exported.
+
+    Attributes:
+        size (int): The size of the output, in bytes.
+        compressed_size (int): The size of its compressed sidecar, in bytes,
+            or None if no sidecar was written.
+        seconds (float): The time spent rendering and writing the output.
+        written (bool): False if the output was unchanged and not written.
+        sidecar_written (bool): Whether the compressed sidecar was written,
+            or None if the output has no sidecar.
+    """
+
+    size: int
+    compressed_size: Optional[int] = None
+    seconds: float = 0.0
+    written: bool = True
+    sidecar_written: Optional[bool] = None
+
+
+@dataclass
+class ExportReport:
+    """Describes what an export wrote.
+
+    Attributes:
+        written (List[str]): The outputs and compressed sidecars that were
+            written, relative to the project directory.
+        skipped (List[str]): The outputs and compressed sidecars that were
+            left alone because their content had not changed.
+        changed_graphs (List[str]): The IDs of the logic graphs that were
+            added or changed since the last export.
+        removed_graphs (List[str]): The IDs of the logic graphs that were
+            removed since the last export.
+        compile_errors (List[str]): The problems that kept logic and
+            dialogue graphs out of the compiled bytecode.
+        outputs (Dict[str, OutputStats]): The size and export time of each
+            output.
+        seconds (float): The time the whole export took.
+    """
+
+    written: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    changed_graphs: List[str] = field(default_factory=list)
+    removed_graphs: List[str] = field(default_factory=list)
+    compile_errors: List[str] = field(default_factory=list)
+    outputs: Dict[str, OutputStats] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        """Formats the per-output byte and time breakdown as a table."""
+        width = max((len(name) for name in self.outputs), default=0)
+        lines = []
+        for name, stats in self.outputs.items():
+            compressed = ""
+            if stats.compressed_size is not None:
+                sidecar_status = "written" if stats.sidecar_written else "unchanged"
+                compressed = (
+                    f"{stats.compressed_size:>10} B compressed, {sidecar_status}"
+                )
+            status = "written" if stats.written else "unchanged"
+            lines.append(
+                f"{name:<{width}}  {stats.size:>10} B  {stats.seconds * 1000:8.1f} ms"
+                f"  {status:<9}  {compressed}".rstrip()
+            )
+        lines.append(f"Total: {self.seconds * 1000:.1f} ms")
+        return "\n".join(lines)
+
+
+def _digest(content: bytes) -> str:
+    """Returns a hash of an output's content."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
 
-def get_command_definitions():
-    return COMMAND_DEFINITIONS
 
+def _render_csv(objects: list, dataclass_type: type) -> bytes:
+    """Renders objects as CSV rows with every column of their schema.
 
-def export_project(project_manager):
+    The files are the project's own data files, so they are written exactly
+    as the project manager saves them; leaving out a column would lose it.
+    """
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer)
+    writer.writerow(field_names(type(objects[0]) if objects else dataclass_type))
+    writer.writerows(encode_row(obj) for obj in objects)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _render_graphs(graphs: list, json_style: str) -> tuple:
+    """Renders logic graphs as the JSON array `json.dump` writes.
+
+    Each graph is rendered on its own, so that it can be hashed. The hash is
+    taken over the graph's data in minified form, so it does not depend on
+    the JSON style.
+
+    Returns:
+        tuple: The content of the file, and a dict mapping each graph's ID
+        to the hash of its data.
+    """
+    encoded = [encode(graph) for graph in graphs]
+    minified = [_render_json(value, "minified") for value in encoded]
+    hashes = {graph.id: _digest(data) for graph, data in zip(graphs, minified)}
+    if json_style == "minified":
+        pieces = minified
+        start, separator, end = b"[", b",", b"]"
+    elif json_style == "indented":
+        pieces = [
+            json.dumps(value, indent=2).replace("\n", "\n  ").encode("utf-8")
+            for value in encoded
+        ]
+        start, separator, end = b"[\n  ", b",\n  ", b"\n]"
+    else:
+        pieces = [_render_json(value, json_style) for value in encoded]
+        start, separator, end = b"[", b", ", b"]"
+    if not pieces:
+        return b"[]", hashes
+    return start + separator.join(pieces) + end, hashes
+
+
+def _render_json(value, json_style: str) -> bytes:
+    """Renders a value as JSON in the given style."""
+    return json.dumps(value, **JSON_STYLES[json_style]).encode("utf-8")
+
+
+def _compress(content: bytes, compression: str) -> bytes:
+    """Compresses an output for its sidecar."""
+    if compression == "gzip":
+        # A fixed timestamp keeps the sidecar identical for identical content.
+        return gzip.compress(content, compresslevel=6, mtime=0)
+    return zstandard.ZstdCompressor().compress(content)
+
+
+def _load_manifest(path: str) -> dict:
+    """Loads the export manifest, or returns an empty one."""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"outputs": {}, "graphs": {}}
+    manifest.setdefault("outputs", {})
+    manifest.setdefault("graphs", {})
+    return manifest
+
+
+def _is_current(path: str, entry: dict, digest: str) -> bool:
+    """Checks whether an output on disk is the one the manifest recorded.
+
+    The file's size and modification time are compared as well as the
+    content hash, so an output that was changed or replaced outside the
+    exporter is written again.
+    """
+    if not entry or entry.get("digest") != digest:
+        return False
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get(
+        "mtime_ns"
+    )
+
+
+def _write_atomic(path: str, content: bytes):
+    """Writes a file through a temporary file, so it is never half written."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def _write_output(path: str, content: bytes) -> dict:
+    """Writes an output and returns its manifest entry."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _write_atomic(path, content)
+    stat = os.stat(path)
+    return {
+        "digest": _digest(content),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _export_output(
+    project_path: str,
+    name: str,
+    render: callable,
+    options: ExportOptions,
+    manifest: dict,
+    force: bool,
+) -> tuple:
+    """Renders one output and writes it and its sidecar if they changed.
+
+    This runs on the export worker threads, so it only reads the manifest;
+    the caller records the returned entries.
+
+    Returns:
+        tuple: The output's OutputStats, and a dict of the manifest entries
+        of the files that were written.
+    """
+    start = time.perf_counter()
+    content = render()
+    digest = _digest(content)
+    entries = {}
+    path = os.path.join(project_path, name)
+    written = force or not _is_current(path, manifest.get(name), digest)
+    if written:
+        entries[name] = _write_output(path, content)
+
+    compressed_size = sidecar_written = None
+    if options.compression and name.endswith(".json"):
+        sidecar = name + SIDECAR_EXTENSIONS[options.compression]
+        sidecar_path = os.path.join(project_path, sidecar)
+        entry = manifest.get(sidecar)
+        if force or not (
+            entry
+            and entry.get("source_digest") == digest
+            and _is_current(sidecar_path, entry, entry.get("digest"))
+        ):
+            compressed = _compress(content, options.compression)
+            entries[sidecar] = _write_output(sidecar_path, compressed)
+            entries[sidecar]["source_digest"] = digest
+            compressed_size = len(compressed)
+            sidecar_written = True
+        else:
+            compressed_size = entry["size"]
+            sidecar_written = False
+
+    stats = OutputStats(
+        size=len(content),
+        compressed_size=compressed_size,
+        seconds=time.perf_counter() - start,
+        written=written,
+        sidecar_written=sidecar_written,
+    )
+    return stats, entries
+
+
+def export_project(
+    project_manager,
+    force: bool = False,
+    mode: str = "readable",
+    options: ExportOptions = None,
+) -> ExportReport:
     """
     Exports all data files to the specified project path using data from the project_manager.
+
+    Outputs whose content has not changed since the last export are not
+    written again, so Unreal does not reimport them. The content hash of
+    every output and every logic graph is kept in an export manifest.
+
+    Args:
+        project_manager (ProjectManager): The project to export.
+        force (bool, optional): If True, write every output even if it has
+            not changed. Defaults to False.
+        mode (str, optional): "readable" for indented JSON written one file
+            at a time, or "performance" for minified JSON with gzip sidecars
+            and a binary bundle, written in parallel. Defaults to "readable".
+        options (ExportOptions, optional): The export options, overriding
+            the mode. Defaults to None.
+
+    Returns:
+        ExportReport: The outputs that were written and skipped.
+
+    Raises:
+        ValueError: If the mode, JSON style or compression is unknown, or
+            zstd compression is requested without the zstandard package.
     """
+    if options is None:
+        if mode not in EXPORT_MODES:
+            raise ValueError(f"Unknown export mode: {mode}")
+        options = EXPORT_MODES[mode]
+    if options.json_style not in JSON_STYLES:
+        raise ValueError(f"Unknown JSON style: {options.json_style}")
+    if options.compression and options.compression not in SIDECAR_EXTENSIONS:
+        raise ValueError(f"Unknown compression: {options.compression}")
+    if options.compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package")
+
+    started = time.perf_counter()
     project_path = project_manager.project_path
     data = project_manager.data
+    style = options.json_style
+    graph_hashes = {}
 
-    # --- Create directories if they don't exist ---
-    data_dir = os.path.join(project_path, "Data")
-    logic_dir = os.path.join(project_path, "Logic")
-    dialogues_dir = os.path.join(project_path, "Dialogues")
-    ui_dir = os.path.join(project_path, "UI")
-    os.makedirs(data_dir, exist_ok=True)
-    os.makedirs(logic_dir, exist_ok=True)
-    os.makedirs(dialogues_dir, exist_ok=True)
-    os.makedirs(ui_dir, exist_ok=True)
-
-    # --- Export Items to ItemData.csv ---
-    with open(os.path.join(data_dir, "ItemData.csv"), "w", newline="") as f:
-        writer = csv.DictWriter(
-            f, fieldnames=["id", "name", "type", "buy_price", "sell_price"]
-        )
-        writer.writeheader()
-        for item in data.items:
-            writer.writerow(asdict(item))
-
-    # --- Export Characters to CharacterData.csv ---
-    with open(os.path.join(data_dir, "CharacterData.csv"), "w", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "id",
-                "display_name",
-                "dialogue_start_id",
-                "is_merchant",
-                "shop_id",
-            ],
-        )
-        writer.writeheader()
-        for char in data.characters:
-            writer.writerow(asdict(char))
-
-    # --- Export Attributes to Attributes.csv ---
-    with open(os.path.join(data_dir, "Attributes.csv"), "w", newline="") as f:
-        writer = csv.DictWriter(
-            f, fieldnames=["id", "name", "initial_value", "max_value"]
-        )
-        writer.writeheader()
-        for attr in data.attributes:
-            writer.writerow(asdict(attr))
-
-    # --- Export Logic Graphs to LogicGraphs.json ---
-    with open(os.path.join(logic_dir, "LogicGraphs.json"), "w") as f:
-        json.dump([asdict(graph) for graph in data.logic_graphs], f, indent=2)
-
-    # --- Export Interactions to Interactions.json ---
-    with open(os.path.join(logic_dir, "Interactions.json"), "w") as f:
-        json.dump(
-            [asdict(interaction) for interaction in data.interactions], f, indent=2
+    def render_graphs():
+        content, hashes = _render_graphs(data.logic_graphs, style)
+        graph_hashes.update(hashes)
+        return content
+
+    compile_errors = {}
+
+    def render_bytecode(name, graphs):
+        compiled, errors = compile_graphs(graphs)
+        compile_errors[name] = [str(error) for error in errors]
+        # Indenting would put every number of the instruction tables on its
+        # own line; the disassembler is the readable form.
+        return _render_json(compiled, "minified" if style == "minified" else "compact")
+
+    renderers = {
+        os.path.join("Data", "ItemData.csv"): lambda: _render_csv(data.items, Item),
+        os.path.join("Data", "CharacterData.csv"): lambda: _render_csv(
+            data.characters, Character
+        ),
+        os.path.join("Data", "Attributes.csv"): lambda: _render_csv(
+            data.attributes, Attribute
+        ),
+        os.path.join("Logic", "LogicGraphs.json"): render_graphs,
+        BYTECODE_PATH: lambda: render_bytecode(BYTECODE_PATH, data.logic_graphs),
+        DIALOGUE_BYTECODE_PATH: lambda: render_bytecode(
+            DIALOGUE_BYTECODE_PATH, data.dialogue_graphs
+        ),
+        os.path.join("Logic", "Interactions.json"): lambda: _render_json(
+            [encode(interaction) for interaction in data.interactions], style
+        ),
+        # Placeholder files.
+        os.path.join("Dialogues", "Graph_Placeholder.json"): lambda: _render_json(
+            {}, style
+        ),
+        os.path.join("UI", "WindowLayout.json"): lambda: _render_json({}, style),
+    }
+    if options.bundle:
+        renderers[BUNDLE_PATH] = lambda: build_bundle(data)
+
+    manifest_path = os.path.join(project_path, MANIFEST_PATH)
+    manifest = _load_manifest(manifest_path)
+    outputs = manifest["outputs"]
+
+    def run(name):
+        return _export_output(
+            project_path, name, renderers[name], options, outputs, force
         )
 
-    # --- Placeholder JSON files ---
-    with open(os.path.join(dialogues_dir, "Graph_Placeholder.json"), "w") as f:
-        json.dump({}, f, indent=2)
+    if options.workers > 1:
+        with ThreadPoolExecutor(
+            max_workers=options.workers, thread_name_prefix="advengine-export"
+        ) as executor:
+            results = list(executor.map(run, renderers))
+    else:
+        results = [run(name) for name in renderers]
 
-    with open(os.path.join(ui_dir, "WindowLayout.json"), "w") as f:
-        json.dump({}, f, indent=2)
+    report = ExportReport()
+    for name in (BYTECODE_PATH, DIALOGUE_BYTECODE_PATH):
+        for error in compile_errors.get(name, ()):
+            report.compile_errors.append(error)
+            logging.error(f"Graph left out of {name}: {error}")
+    for name, (stats, entries) in zip(renderers, results):
+        outputs.update(entries)
+        report.outputs[name] = stats
+        (report.written if stats.written else report.skipped).append(name)
+        if stats.sidecar_written is not None:
+            sidecar = name + SIDECAR_EXTENSIONS[options.compression]
+            (report.written if stats.sidecar_written else report.skipped).append(
+                sidecar
+            )
+
+    # Remove sidecars that the current options no longer produce.
+    for name in renderers:
+        for compression, extension in SIDECAR_EXTENSIONS.items():
+            if compression != options.compression and name + extension in outputs:
+                del outputs[name + extension]
+                try:
+                    os.remove(os.path.join(project_path, name + extension))
+                except FileNotFoundError:
+                    pass
+    if not options.bundle and BUNDLE_PATH in outputs:
+        del outputs[BUNDLE_PATH]
+        try:
+            os.remove(os.path.join(project_path, BUNDLE_PATH))
+        except FileNotFoundError:
+            pass
+
+    previous_graphs = manifest["graphs"]
+    report.changed_graphs = [
+        graph_id
+        for graph_id, digest in graph_hashes.items()
+        if previous_graphs.get(graph_id) != digest
+    ]
+    report.removed_graphs = [
+        graph_id for graph_id in previous_graphs if graph_id not in graph_hashes
+    ]
+    manifest["graphs"] = graph_hashes
+
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    _write_atomic(manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+    report.seconds = time.perf_counter() - started
+    logging.info(
+        f"Exported {project_path}: wrote {len(report.written)} file(s), "
+        f"skipped {len(report.skipped)} unchanged file(s)\n{report.summary()}"
+    )
+    return report
 
 
 if __name__ == "__main__":
-    from project_manager import ProjectManager
+    import argparse
+
+    from .project_manager import ProjectManager
 
-    # This is a simple test to run the exporter on the TestGame directory
-    pm = ProjectManager("TestGame")
+    # Exports a project and prints the report, for example:
+    #     python3 -m advengine.core.ue_exporter TestGame --mode performance
+    parser = argparse.ArgumentParser(description="Export a project for Unreal.")
+    parser.add_argument("project", nargs="?", default="TestGame")
+    parser.add_argument("--mode", choices=sorted(EXPORT_MODES), default="readable")
+    parser.add_argument(
+        "--force", action="store_true", help="write outputs even if unchanged"
+    )
+    args = parser.parse_args()
+    pm = ProjectManager(args.project)
     pm.load_project()
-    export_project(pm)
+    report = export_project(pm, force=args.force, mode=args.mode)
     print(f"Exported data files to {pm.project_path}/")
+    print(report.summary())
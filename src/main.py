@@ -13,14 +13,22 @@ import logging
 import importlib
 import inspect
 import argparse
+import threading
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Gtk, Adw, Gio, GObject
+from gi.repository import Gtk, Adw, Gio, GObject, GLib
 from .core.project_manager import ProjectManager
 from .core.settings_manager import SettingsManager
 
+# How long to wait after the last keystroke before starting a search.
+SEARCH_DEBOUNCE_MS = 200
+
+# The number of search results added to the results view per main loop
+# iteration.
+SEARCH_PAGE_SIZE = 100
+
 
 @Gtk.Template(filename=os.path.join(os.path.dirname(__file__), "ui/main_window.ui"))
 class EditorWindow(Adw.ApplicationWindow):
@@ -67,6 +75,8 @@ class EditorWindow(Adw.ApplicationWindow):
         self.project_manager = project_manager
         self.base_title = "AdvEngine"
         self.set_title(self.base_title)
+        self._search_timeout_id = None
+        self._search_cancel = None
 
         self.project_manager.register_dirty_state_callback(self.on_dirty_state_changed)
         self.project_manager.register_error_callback(self.on_error)
@@ -83,6 +93,7 @@ class EditorWindow(Adw.ApplicationWindow):
         )
         self.search_entry.connect("search-changed", self.on_search_changed)
         self.sidebar_list.connect("row-activated", self.on_sidebar_activated)
+        self.connect("close-request", self.on_close_request)
 
         menu = Gio.Menu.new()
         menu.append("Preferences", "app.preferences")
@@ -117,6 +128,7 @@ class EditorWindow(Adw.ApplicationWindow):
                 signal.
         """
         query = search_entry.get_text()
+        self._cancel_search()
         if not query:
             if self.content_stack.get_visible_child_name() == "search_results":
                 # Fallback to the first editor if search is cleared
@@ -124,9 +136,85 @@ class EditorWindow(Adw.ApplicationWindow):
                 if first_row:
                     self.content_stack.set_visible_child_name(first_row.get_name())
             return
-        results = self.project_manager.search(query)
-        self.search_results_view.update_results(results)
-        self.content_stack.set_visible_child_name("search_results")
+        self._search_timeout_id = GLib.timeout_add(
+            SEARCH_DEBOUNCE_MS, self._start_search, query
+        )
+
+    def _cancel_search(self):
+        """Cancels any pending or running search."""
+        if self._search_timeout_id is not None:
+            GLib.source_remove(self._search_timeout_id)
+            self._search_timeout_id = None
+        if self._search_cancel is not None:
+            self._search_cancel.set()
+            self._search_cancel = None
+
+    def _start_search(self, query: str) -> bool:
+        """Starts searching for a query on a worker thread.
+
+        Args:
+            query (str): The search terms.
+
+        Returns:
+            bool: False, so that the debounce timeout does not repeat.
+        """
+        self._search_timeout_id = None
+        cancel = threading.Event()
+        self._search_cancel = cancel
+        threading.Thread(
+            target=self._run_search,
+            args=(query, cancel),
+            name="advengine-search",
+            daemon=True,
+        ).start()
+        return GLib.SOURCE_REMOVE
+
+    def _run_search(self, query: str, cancel: threading.Event):
+        """Runs a search on a worker thread and hands the results back.
+
+        The search index is brought up to date first, re-indexing only the
+        objects that changed since the last search.
+
+        Args:
+            query (str): The search terms.
+            cancel (threading.Event): Set when a newer search supersedes
+                this one.
+        """
+        try:
+            search_index = self.project_manager.search_index
+            search_index.refresh()
+            results = search_index.query(query, cancelled=cancel.is_set)
+        except Exception as e:
+            logging.error(f"Search for '{query}' failed: {e}")
+            results = []
+        if not cancel.is_set():
+            GLib.idle_add(self._show_search_page, results, 0, cancel)
+
+    def _show_search_page(
+        self, results: list, start: int, cancel: threading.Event
+    ) -> bool:
+        """Adds one page of search results to the results view.
+
+        Each page is added from its own idle callback so that the window
+        stays responsive while a long result list is shown.
+
+        Args:
+            results (list[SearchResult]): All results of the search.
+            start (int): The index of the first result on this page.
+            cancel (threading.Event): Set if the search was superseded.
+
+        Returns:
+            bool: False, so that the idle callback does not repeat.
+        """
+        if cancel.is_set():
+            return GLib.SOURCE_REMOVE
+        end = start + SEARCH_PAGE_SIZE
+        self.search_results_view.update_results(results[start:end], append=start > 0)
+        if start == 0:
+            self.content_stack.set_visible_child_name("search_results")
+        if end < len(results):
+            GLib.idle_add(self._show_search_page, results, end, cancel)
+        return GLib.SOURCE_REMOVE
 
     def add_editor(self, name: str, view_name: str, widget: Gtk.Widget):
         """Adds an editor to the sidebar and content stack.
@@ -200,6 +288,21 @@ class EditorWindow(Adw.ApplicationWindow):
             if editor_class.VIEW_NAME == "logic_editor":
                 self.logic_editor = editor_instance
 
+    def on_close_request(self, window: Gtk.Window) -> bool:
+        """Handles the close-request signal of the window.
+
+        Waits for any background save to finish, so that closing the window
+        right after saving does not lose the save.
+
+        Args:
+            window (Gtk.Window): The window being closed.
+
+        Returns:
+            bool: Always False to let the window close.
+        """
+        self.project_manager.close()
+        return False
+
     def on_dirty_state_changed(self, is_dirty: bool):
         """Handles the dirty-state-changed signal from the project manager.
 
@@ -246,7 +349,7 @@ class EditorWindow(Adw.ApplicationWindow):
         Args:
             button (Gtk.Button): The button that was clicked.
         """
-        self.get_application().save_project()
+        self.get_application().save_project(blocking=True)
         ue_path = self.get_application().settings_manager.get("ue_path")
         if not ue_path:
             self.on_error(
@@ -291,6 +394,12 @@ class AdvEngine(Adw.Application):
         self.win = None
         self.connect("activate", self.on_activate)
 
+    def do_shutdown(self):
+        """Finishes any background save before the application exits."""
+        if self.project_manager:
+            self.project_manager.close()
+        Adw.Application.do_shutdown(self)
+
     def on_activate(self, app: Adw.Application):
         """Handles the activate signal of the application.
 
@@ -500,10 +609,22 @@ class AdvEngine(Adw.Application):
         )
         dialog.present(self.win)
 
-    def save_project(self):
-        """Saves the currently open project if it has unsaved changes."""
+    def save_project(self, blocking: bool = False):
+        """Saves the currently open project if it has unsaved changes.
+
+        By default the project is written on a background thread so the
+        editor stays responsive, and completion is reported through the
+        project manager's saved callbacks.
+
+        Args:
+            blocking (bool): If True, wait until the project has been
+                written to disk before returning. Defaults to False.
+        """
         if self.project_manager and self.project_manager.is_dirty:
-            self.project_manager.save_project()
+            if blocking:
+                self.project_manager.save_project()
+            else:
+                self.project_manager.save_project_async()
 
     def load_project(self, project_path: str, project_manager: ProjectManager = None):
         """Loads a project and displays it in a new EditorWindow.
@@ -517,6 +638,8 @@ class AdvEngine(Adw.Application):
                 manager instance. If not provided, a new one will be
                 created. Defaults to None.
         """
+        if self.project_manager and self.project_manager is not project_manager:
+            self.project_manager.close()
         if project_manager:
             self.project_manager = project_manager
         else:
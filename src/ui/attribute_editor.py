@@ -163,7 +163,9 @@ class AttributeEditor(Gtk.Box):
             GObject.BindingFlags.BIDIRECTIONAL | GObject.BindingFlags.SYNC_CREATE,
         )
         handler_id = widget.connect(
-            signal_name, lambda w: self.project_manager.set_dirty(True)
+            signal_name, lambda w: self.project_manager.set_dirty(
+                True, "attributes", attr_gobject.attribute
+            )
         )
         list_item.bindings.append(binding)
         list_item.handler_id = handler_id
@@ -221,8 +223,7 @@ class AttributeEditor(Gtk.Box):
         new_id_base = "new_attribute"
         new_id = new_id_base
         count = 1
-        existing_ids = {a.id for a in self.project_manager.data.attributes}
-        while new_id in existing_ids:
+        while self.project_manager.data.get_by_id("attributes", new_id):
             new_id = f"{new_id_base}_{count}"
             count += 1
 
@@ -161,7 +161,9 @@ class ItemEditor(Gtk.Box):
             GObject.BindingFlags.BIDIRECTIONAL | GObject.BindingFlags.SYNC_CREATE,
         )
         handler_id = widget.connect(
-            signal_name, lambda w: self.project_manager.set_dirty(True)
+            signal_name, lambda w: self.project_manager.set_dirty(
+                True, "items", item_gobject.item
+            )
         )
         list_item.bindings.append(binding)
         list_item.handler_id = handler_id
@@ -223,8 +225,7 @@ class ItemEditor(Gtk.Box):
         new_id_base = "new_item"
         new_id = new_id_base
         count = 1
-        existing_ids = {i.id for i in self.project_manager.data.items}
-        while new_id in existing_ids:
+        while self.project_manager.data.get_by_id("items", new_id):
             new_id = f"{new_id_base}_{count}"
             count += 1
 
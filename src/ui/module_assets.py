@@ -7,13 +7,18 @@ browsing assets and a detail view for previewing and editing them.
 
 import gi
 import os
-import shutil
+import threading
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
-from gi.repository import Gtk, Gio, GObject, Adw, Gdk
+from gi.repository import Gtk, Gio, GObject, Adw, Gdk, GLib
+from ..core.asset_import import AssetImporter, new_asset_id
 from ..core.schemas.asset import Asset, Animation, AssetGObject
 from ..core.schemas.gobject_factory import StringGObject
+from .shared.thumbnails import ThumbnailService
+
+# The icon shown in the asset grid until a thumbnail has been loaded.
+PLACEHOLDER_ICON = "image-x-generic-symbolic"
 
 
 @Gtk.Template(filename=os.path.join(os.path.dirname(__file__), "module_assets.ui"))
@@ -43,6 +48,7 @@ class AssetEditor(Gtk.Box):
     asset_grid_view: Gtk.GridView = Gtk.Template.Child()
     main_stack: Gtk.Stack = Gtk.Template.Child()
     import_button: Gtk.Button = Gtk.Template.Child()
+    import_progress: Gtk.ProgressBar = Gtk.Template.Child()
     preview_image: Gtk.Picture = Gtk.Template.Child()
     animation_editor: Gtk.Box = Gtk.Template.Child()
     frame_list_view: Gtk.ListView = Gtk.Template.Child()
@@ -59,6 +65,9 @@ class AssetEditor(Gtk.Box):
         self.project_manager = project_manager
         self.settings_manager = settings_manager
         self.selected_asset = None
+        self.thumbnails = ThumbnailService()
+        self.thumbnails.set_project(self.project_manager.project_path)
+        self._placeholder = None
         self.project_manager.register_project_loaded_callback(self.project_loaded)
 
         self._setup_models()
@@ -70,6 +79,7 @@ class AssetEditor(Gtk.Box):
 
     def project_loaded(self):
         """Callback executed when a project is finished loading."""
+        self.thumbnails.set_project(self.project_manager.project_path)
         self.refresh_asset_list()
 
     def _setup_models(self):
@@ -121,6 +131,10 @@ class AssetEditor(Gtk.Box):
     def _bind_grid_item(self, factory, list_item):
         """Binds data from the model to the asset grid item's widgets.
 
+        Thumbnails are loaded by the thumbnail service on worker threads. A
+        placeholder is shown until the asset's thumbnail is ready, unless
+        the thumbnail is already in memory.
+
         Args:
             factory (Gtk.SignalListItemFactory): The factory that emitted the
                 signal.
@@ -135,14 +149,38 @@ class AssetEditor(Gtk.Box):
         asset = asset_gobject.asset
 
         label.set_text(asset.name)
-        if asset.asset_type in ["sprite", "texture"] and os.path.exists(
-            os.path.join(self.project_manager.project_path, asset.file_path)
-        ):
-            picture.set_filename(
-                os.path.join(self.project_manager.project_path, asset.file_path)
+        project_path = self.project_manager.project_path
+        if asset.asset_type in ["sprite", "texture"] and project_path:
+            path = os.path.join(project_path, asset.file_path)
+            picture.thumbnail_path = path
+            texture = self.thumbnails.request(
+                path,
+                lambda texture: self._on_thumbnail_loaded(picture, path, texture),
             )
+            picture.set_paintable(texture or self._get_placeholder())
         else:
-            picture.set_filename(None)
+            picture.thumbnail_path = None
+            picture.set_paintable(None)
+
+    def _on_thumbnail_loaded(self, picture: Gtk.Picture, path: str, texture):
+        """Shows a thumbnail that has finished loading.
+
+        Args:
+            picture (Gtk.Picture): The grid item's picture.
+            path (str): The path of the image the thumbnail was loaded for.
+            texture (Gdk.Texture): The thumbnail.
+        """
+        # The grid item may have been rebound to another asset since.
+        if getattr(picture, "thumbnail_path", None) == path:
+            picture.set_paintable(texture)
+
+    def _get_placeholder(self) -> Gdk.Paintable:
+        """Gets the icon shown in the asset grid while thumbnails load."""
+        if self._placeholder is None:
+            self._placeholder = Gtk.IconTheme.get_for_display(
+                self.get_display()
+            ).lookup_icon(PLACEHOLDER_ICON, None, 64, 1, Gtk.TextDirection.NONE, 0)
+        return self._placeholder
 
     def _setup_frame_row(self, factory, list_item):
         """Constructs the widget for a single animation frame row.
@@ -257,79 +295,128 @@ class AssetEditor(Gtk.Box):
         """
         try:
             files = dialog.open_multiple_finish(result)
-            if files:
-                if len(files) > 1:
-                    self._import_animation(files)
-                else:
-                    self._import_single_asset(files[0])
-
-                self.project_manager.set_dirty()
-                self.refresh_asset_list()
+        except GLib.Error:
+            return  # The dialog was dismissed.
+        if files:
+            self._start_import([file.get_path() for file in files])
+
+    def _start_import(self, sources: list):
+        """Imports files on a worker thread, showing the progress.
+
+        Several files are imported as a single animation, one file as a
+        sprite.
+
+        Args:
+            sources (list[str]): The paths of the files to import.
+        """
+        project_path = self.project_manager.project_path
+        self.import_button.set_sensitive(False)
+        self.import_progress.set_fraction(0)
+        self.import_progress.set_text(f"Importing {len(sources)} file(s)")
+        self.import_progress.set_visible(True)
+        threading.Thread(
+            target=self._run_import,
+            args=(project_path, sources),
+            name="advengine-import",
+            daemon=True,
+        ).start()
+
+    def _run_import(self, project_path: str, sources: list):
+        """Copies files into the asset store on worker threads.
+
+        Args:
+            project_path (str): The project the files are imported into.
+            sources (list[str]): The paths of the files to import.
+        """
+        try:
+            imported, errors = AssetImporter(project_path).import_files(
+                sources,
+                progress=lambda done, total: GLib.idle_add(
+                    self._on_import_progress, done, total
+                ),
+            )
         except Exception as e:
-            self._show_error_dialog(f"Error importing asset(s): {e}")
+            imported, errors = [], [str(e)]
+        GLib.idle_add(self._on_import_finished, project_path, sources, imported, errors)
 
-    def _import_animation(self, files):
-        """Imports a sequence of files as a single animation.
+    def _on_import_progress(self, done: int, total: int) -> bool:
+        """Updates the import progress bar.
+
+        Returns:
+            bool: False, so that the idle callback does not repeat.
+        """
+        self.import_progress.set_fraction(done / total)
+        self.import_progress.set_text(f"Importing {done} of {total}")
+        return GLib.SOURCE_REMOVE
+
+    def _on_import_finished(
+        self, project_path: str, sources: list, imported: list, errors: list
+    ) -> bool:
+        """Adds the imported files to the project as an asset.
 
         Args:
-            files (list): A list of Gio.File objects to import.
+            project_path (str): The project the files were imported into.
+            sources (list[str]): The paths of the files that were imported.
+            imported (list): An ImportedFile, or None, for each source.
+            errors (list[str]): The files that could not be imported.
+
+        Returns:
+            bool: False, so that the idle callback does not repeat.
+        """
+        self.import_button.set_sensitive(True)
+        self.import_progress.set_visible(False)
+        if project_path != self.project_manager.project_path:
+            return GLib.SOURCE_REMOVE
+        stored = [result.file_path for result in imported if result is not None]
+        if stored:
+            if len(sources) > 1:
+                asset = self._create_animation(sources[0], stored)
+            else:
+                asset = self._create_single_asset(sources[0], stored[0])
+            self.project_manager.add_data_item("assets", asset)
+            self.refresh_asset_list()
+        if errors:
+            self._show_error_dialog("Error importing asset(s):\n" + "\n".join(errors))
+        return GLib.SOURCE_REMOVE
+
+    def _create_animation(self, first_source: str, frames: list) -> Animation:
+        """Creates an animation asset from imported frames.
+
+        Args:
+            first_source (str): The path the first frame was imported from,
+                which names the animation.
+            frames (list[str]): The stored paths of the frames, in order.
+
+        Returns:
+            Animation: The new animation.
         """
-        asset_name = os.path.basename(files[0].get_path()).split(".")[0]
-        new_anim = Animation(
-            id=f"anim_{len(self.project_manager.data.assets)}",
-            name=asset_name,
+        return Animation(
+            id=new_asset_id(self.project_manager.data, "anim"),
+            name=os.path.basename(first_source).split(".")[0],
             asset_type="animation",
             file_path="",
-            frame_count=len(files),
+            frame_count=len(frames),
             frame_rate=10,
-            frames=[],
+            frames=frames,
         )
 
-        anim_dir = os.path.join(self.project_manager.project_path, "Assets", asset_name)
-        os.makedirs(anim_dir, exist_ok=True)
-
-        for file in files:
-            filepath = file.get_path()
-            if not self._is_supported_image_file(filepath):
-                self._show_error_dialog(
-                    f"Unsupported file type: {os.path.basename(filepath)}"
-                )
-                continue
-            new_filepath = os.path.join(anim_dir, os.path.basename(filepath))
-            shutil.copy(filepath, new_filepath)
-            new_anim.frames.append(
-                os.path.relpath(new_filepath, self.project_manager.project_path)
-            )
-
-        self.project_manager.data.assets.append(new_anim)
-
-    def _import_single_asset(self, file):
-        """Imports a single file as a sprite asset.
+    def _create_single_asset(self, source: str, file_path: str) -> Asset:
+        """Creates a sprite asset from an imported file.
 
         Args:
-            file (Gio.File): The file to import.
+            source (str): The path the file was imported from, which names
+                the asset.
+            file_path (str): The stored path of the file.
+
+        Returns:
+            Asset: The new sprite.
         """
-        filepath = file.get_path()
-        if not self._is_supported_image_file(filepath):
-            self._show_error_dialog(
-                f"Unsupported file type: {os.path.basename(filepath)}"
-            )
-            return
-        asset_name = os.path.basename(filepath)
-        asset_type = "sprite"
-
-        assets_dir = os.path.join(self.project_manager.project_path, "Assets")
-        os.makedirs(assets_dir, exist_ok=True)
-        new_filepath = os.path.join(assets_dir, asset_name)
-        shutil.copy(filepath, new_filepath)
-
-        new_asset = Asset(
-            id=f"asset_{len(self.project_manager.data.assets)}",
-            name=asset_name,
-            asset_type=asset_type,
-            file_path=os.path.relpath(new_filepath, self.project_manager.project_path),
+        return Asset(
+            id=new_asset_id(self.project_manager.data, "asset"),
+            name=os.path.basename(source),
+            asset_type="sprite",
+            file_path=file_path,
         )
-        self.project_manager.data.assets.append(new_asset)
 
     def _on_frame_drag_prepare(self, source, x, y):
         """Prepares the content for a drag-and-drop operation.
@@ -382,23 +469,11 @@ class AssetEditor(Gtk.Box):
             target_index = self.selected_asset.frames.index(target_frame)
             self.selected_asset.frames.pop(dragged_index)
             self.selected_asset.frames.insert(target_index, dragged_frame)
-            self.project_manager.set_dirty()
+            self.project_manager.set_dirty(True, "assets", self.selected_asset)
             self.refresh_frame_list()
             return True
         return False
 
-    def _is_supported_image_file(self, filepath):
-        """Checks if a file is a supported image type based on its extension.
-
-        Args:
-            filepath (str): The path to the file.
-
-        Returns:
-            bool: True if the file is a supported image, False otherwise.
-        """
-        supported_extensions = [".png", ".jpg", ".jpeg", ".bmp", ".gif"]
-        return any(filepath.lower().endswith(ext) for ext in supported_extensions)
-
     def _show_error_dialog(self, message):
         """Shows a simple error dialog.
 
@@ -186,7 +186,10 @@ class CharacterManager(Gtk.Box):
                 GObject.BindingFlags.BIDIRECTIONAL | GObject.BindingFlags.SYNC_CREATE,
             )
             handler_id = widget.connect(
-                "notify::active", lambda w, _: self.project_manager.set_dirty(True)
+                "notify::active",
+                lambda w, _: self.project_manager.set_dirty(
+                    True, "characters", char_gobject.character
+                ),
             )
         elif cell_type == "combo":
             model = widget.get_model()
@@ -206,7 +209,10 @@ class CharacterManager(Gtk.Box):
             )
             list_item.bindings.append(binding)
             handler_id = widget.connect(
-                "changed", lambda w: self.project_manager.set_dirty(True)
+                "changed",
+                lambda w: self.project_manager.set_dirty(
+                    True, "characters", char_gobject.character
+                ),
             )
 
         list_item.handler_id = handler_id
@@ -243,7 +249,7 @@ class CharacterManager(Gtk.Box):
             else "None"
         )
         setattr(char_gobject, column_id, selected_str)
-        self.project_manager.set_dirty(True)
+        self.project_manager.set_dirty(True, "characters", char_gobject.character)
         self._update_preview()
 
     def _update_preview(self):
@@ -255,9 +261,7 @@ class CharacterManager(Gtk.Box):
 
         asset_id = selected_item.portrait_asset_id
         if asset_id and asset_id != "None":
-            asset = next(
-                (a for a in self.project_manager.data.assets if a.id == asset_id), None
-            )
+            asset = self.project_manager.data.get_by_id("assets", asset_id)
             if (
                 asset
                 and self.project_manager.project_path
@@ -315,8 +319,7 @@ class CharacterManager(Gtk.Box):
         new_id_base = "new_char"
         new_id = new_id_base
         count = 1
-        existing_ids = {c.id for c in self.project_manager.data.characters}
-        while new_id in existing_ids:
+        while self.project_manager.data.get_by_id("characters", new_id):
             new_id = f"{new_id_base}_{count}"
             count += 1
 
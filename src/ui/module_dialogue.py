@@ -96,6 +96,7 @@ class DialogueEditor(Adw.Bin):
             project_manager=self.project_manager,
             settings_manager=self.settings_manager,
             on_update_callback=self._on_node_updated,
+            collection_name="dialogue_graphs",
         )
         self.dialogue_node_editor_placeholder.append(self.dialogue_node_editor)
 
@@ -147,12 +148,8 @@ class DialogueEditor(Adw.Bin):
         node = item.node
         if isinstance(node, DialogueNode):
             children = Gio.ListStore(item_type=DialogueNodeGObject)
-            for child_id in node.outputs:
-                child_node = next(
-                    (n for n in self.active_graph.nodes if n.id == child_id), None
-                )
-                if child_node:
-                    children.append(DialogueNodeGObject(child_node))
+            for child_node in self.active_graph.successors(node):
+                children.append(DialogueNodeGObject(child_node))
             return children
         return None
 
@@ -233,16 +230,14 @@ class DialogueEditor(Adw.Bin):
         )
 
         selected_item = self.selection.get_selected_item()
+        self.active_graph.add_node(new_node)
         if selected_item:
             parent_node = selected_item.get_item().node
-            parent_node.outputs.append(new_node_id)
-            new_node.inputs.append(parent_node.id)
-
-        self.active_graph.nodes.append(new_node)
-        if not selected_item:
+            self.active_graph.connect(parent_node, new_node)
+        else:
             self.model.append(DialogueNodeGObject(new_node))
 
-        self.project_manager.set_dirty()
+        self.project_manager.set_dirty(True, "dialogue_graphs", self.active_graph)
         self.refresh_model()
 
     def _on_add_action_node(self, button):
@@ -267,11 +262,9 @@ class DialogueEditor(Adw.Bin):
             id=new_node_id, node_type="Action", action_command="SET_VARIABLE"
         )
 
-        parent_node.outputs.append(new_node_id)
-        new_node.inputs.append(parent_node.id)
-
-        self.active_graph.nodes.append(new_node)
-        self.project_manager.set_dirty()
+        self.active_graph.add_node(new_node)
+        self.active_graph.connect(parent_node, new_node)
+        self.project_manager.set_dirty(True, "dialogue_graphs", self.active_graph)
         self.refresh_model()
 
     def _on_delete_node(self, button):
@@ -285,15 +278,10 @@ class DialogueEditor(Adw.Bin):
             return
 
         node_to_delete = selected_item.get_item().node
-        self.active_graph.nodes.remove(node_to_delete)
-
-        # Also remove from parent outputs
-        for node in self.active_graph.nodes:
-            if node_to_delete.id in node.outputs:
-                node.outputs.remove(node_to_delete.id)
+        self.active_graph.remove_node(node_to_delete)
 
         self.refresh_model()
-        self.project_manager.set_dirty()
+        self.project_manager.set_dirty(True, "dialogue_graphs", self.active_graph)
 
     def _on_selection_changed(self, selection, position, n_items):
         """Handles selection changes in the dialogue tree.
@@ -307,7 +295,7 @@ class DialogueEditor(Adw.Bin):
         if selected_item:
             self.delete_button.set_sensitive(True)
             node_gobject = selected_item.get_item()
-            self.dialogue_node_editor.set_node(node_gobject.node)
+            self.dialogue_node_editor.set_node(node_gobject.node, self.active_graph)
             self.properties_stack.set_visible_child_name("editor")
         else:
             self.delete_button.set_sensitive(False)
@@ -62,6 +62,7 @@ class InteractionEditor(Gtk.Box):
         # Initialize model and selection early to prevent signal connection errors
         self.model = Gio.ListStore(item_type=InteractionGObject)
         self.selection = Gtk.SingleSelection(model=self.model)
+        self._choice_cache = {}
 
         self.project_manager.register_project_loaded_callback(self.project_loaded)
 
@@ -93,6 +94,7 @@ class InteractionEditor(Gtk.Box):
 
     def refresh_model(self):
         """Refreshes the data model from the project manager."""
+        self._choice_cache.clear()
         self.model.remove_all()
         for interaction in self.project_manager.data.interactions:
             self.model.append(InteractionGObject(interaction))
@@ -139,34 +141,11 @@ class InteractionEditor(Gtk.Box):
         interaction_gobject = list_item.get_item()
         dropdown = list_item.get_child()
 
-        if column_id == "verb_id":
-            model = Gtk.StringList.new(
-                [""] + [v.id for v in self.project_manager.data.verbs]
-            )
-        elif "item_id" in column_id:
-            model = Gtk.StringList.new(
-                [""] + [i.id for i in self.project_manager.data.items]
-            )
-        elif column_id == "target_hotspot_id":
-            model = Gtk.StringList.new(
-                [""]
-                + [h.id for s in self.project_manager.data.scenes for h in s.hotspots]
-            )
-        elif column_id == "logic_graph_id":
-            model = Gtk.StringList.new(
-                [""] + [lg.id for lg in self.project_manager.data.logic_graphs]
-            )
-
+        model, positions = self._get_choices(column_id)
         dropdown.set_model(model)
 
         current_value = getattr(interaction_gobject, column_id)
-        if current_value:
-            for i, item_str in enumerate(model):
-                if item_str == current_value:
-                    dropdown.set_selected(i)
-                    break
-        else:
-            dropdown.set_selected(0)
+        dropdown.set_selected(positions.get(current_value, 0) if current_value else 0)
 
         handler_id = dropdown.connect(
             "notify::selected",
@@ -176,6 +155,44 @@ class InteractionEditor(Gtk.Box):
         )
         list_item.handler_id = handler_id
 
+    def _get_choices(self, column_id):
+        """Gets the dropdown model and choice positions for a column.
+
+        The models are shared by every cell in a column and are only rebuilt
+        when the IDs they list change, so binding a cell does not rebuild
+        its model. The IDs themselves are compared, since renaming an item,
+        verb, graph or hotspot leaves the size of its collection the same.
+
+        Args:
+            column_id (str): The ID of the column.
+
+        Returns:
+            tuple: The Gtk.StringList model and a dictionary mapping each
+            choice to its position in the model.
+        """
+        data = self.project_manager.data
+        if column_id == "verb_id":
+            key, ids = column_id, tuple(v.id for v in data.verbs)
+        elif "item_id" in column_id:
+            key, ids = "item_id", tuple(i.id for i in data.items)
+        elif column_id == "target_hotspot_id":
+            key = column_id
+            ids = tuple(h.id for s in data.scenes for h in s.hotspots)
+        else:
+            key, ids = column_id, tuple(lg.id for lg in data.logic_graphs)
+
+        cached = self._choice_cache.get(key)
+        if cached and cached[0] == ids:
+            return cached[1], cached[2]
+
+        choices = ["", *ids]
+        positions = {}
+        for i, choice in enumerate(choices):
+            positions.setdefault(choice, i)
+        model = Gtk.StringList.new(choices)
+        self._choice_cache[key] = (ids, model, positions)
+        return model, positions
+
     def _unbind_cell(self, factory, list_item):
         """Unbinds a cell widget from the data model.
 
@@ -201,7 +218,9 @@ class InteractionEditor(Gtk.Box):
         selected_item = dropdown.get_selected_item()
         new_value = selected_item.get_string() if selected_item else ""
         setattr(interaction_gobject.interaction, column_id, new_value)
-        self.project_manager.set_dirty(True)
+        self.project_manager.set_dirty(
+            True, "interactions", interaction_gobject.interaction
+        )
 
     def _on_add_clicked(self, button):
         """Handles the 'Add' button click event.
@@ -5,6 +5,10 @@ scripting game logic. It includes the main editor canvas, a tool palette,
 a properties panel for editing nodes, and a minimap for navigation.
 """
 
+import math
+from collections import OrderedDict
+
+import cairo
 import gi
 
 gi.require_version("Gtk", "4.0")
@@ -18,7 +22,21 @@ from ..core.schemas.logic import (
     LogicNode,
 )
 from ..core.ue_exporter import get_command_definitions
-from .shared.dynamic_node_editor import DynamicNodeEditor, pascal_to_snake
+from .shared.dynamic_node_editor import DynamicNodeEditor
+from .shared.spatial_index import SpatialIndex
+
+# How far from its center a connector can be clicked.
+CONNECTOR_HIT_RADIUS = 10
+
+# The size of the resize handle's clickable area in a node's corner.
+RESIZE_HANDLE_SIZE = 15
+
+# How far a node's selection outline and connectors extend past its bounds.
+NODE_DRAW_MARGIN = 5
+
+# The maximum number of pre-rendered node surfaces to keep. Only nodes near
+# the visible area are rendered, so this only needs to cover a few screens.
+NODE_SURFACE_CACHE_SIZE = 256
 
 
 class MiniMap(Gtk.DrawingArea):
@@ -149,6 +167,12 @@ class LogicEditor(Adw.Bin):
         self.drag_offsets = {}
         self.initial_node_size = (0, 0)
 
+        self._spatial_index = SpatialIndex()
+        self._spatial_graph = None
+        self._body_texts = {}
+        self._node_surfaces = OrderedDict()
+        self._edge_geometries = {}
+
         self.canvas.set_draw_func(self.on_canvas_draw, None)
         self._setup_canvas_controllers()
         self._create_context_menus()
@@ -175,6 +199,9 @@ class LogicEditor(Adw.Bin):
         else:
             self.active_graph = LogicGraph(id="default_graph", name="Default")
             self.project_manager.data.logic_graphs.append(self.active_graph)
+        self._body_texts.clear()
+        self._node_surfaces.clear()
+        self._edge_geometries.clear()
 
         # Always show the canvas, even if the graph is empty.
         self.canvas_stack.set_visible_child_name("canvas")
@@ -241,15 +268,17 @@ class LogicEditor(Adw.Bin):
                 cr.move_to(0, h / 2 - 50)
                 PangoCairo.show_layout(cr, layout)
 
-            for node in self.active_graph.nodes:
+            # Only draw what intersects the area being repainted.
+            x1, y1, x2, y2 = cr.clip_extents()
+            self._draw_connections(cr, (x1, y1, x2, y2))
+            visible_nodes = self._get_spatial_index().query_rect(
+                x1 - NODE_DRAW_MARGIN,
+                y1 - NODE_DRAW_MARGIN,
+                x2 + NODE_DRAW_MARGIN,
+                y2 + NODE_DRAW_MARGIN,
+            )
+            for node in visible_nodes:
                 self.draw_node(cr, node)
-                for output_node_id in node.outputs:
-                    output_node = next(
-                        (n for n in self.active_graph.nodes if n.id == output_node_id),
-                        None,
-                    )
-                    if output_node:
-                        self.draw_connection(cr, node, output_node)
             if self.drag_mode == "connecting" and self.connecting_from_node:
                 start_x, start_y = self.get_connector_pos(
                     self.connecting_from_node, "out"
@@ -268,12 +297,66 @@ class LogicEditor(Adw.Bin):
     def draw_node(self, cr, node):
         """Draws a single node on the canvas.
 
+        The node's body and text are pre-rendered to a surface that is only
+        redrawn when the node's content or size changes.
+
         Args:
             cr: The Cairo context.
             node (LogicNode): The node to draw.
         """
+        cr.set_source_surface(
+            self._get_node_surface(cr, node), round(node.x), round(node.y)
+        )
+        cr.paint()
+
+        if node in self.selected_nodes:
+            cr.set_source_rgb(1.0, 1.0, 0.0)
+            cr.set_line_width(3)
+            cr.rectangle(node.x - 2, node.y - 2, node.width + 4, node.height + 4)
+            cr.stroke()
+
+        self.draw_connectors_and_resize_handle(cr, node)
+
+    def _get_node_surface(self, cr, node: LogicNode) -> cairo.Surface:
+        """Gets the pre-rendered surface for a node, rendering it if needed.
+
+        Args:
+            cr: The Cairo context of the canvas.
+            node (LogicNode): The node.
+
+        Returns:
+            cairo.Surface: A surface holding the node's body and text.
+        """
+        body_text = self._body_texts.get(id(node))
+        if body_text is None:
+            body_text = self.update_node_body_text(node)
+        key = (type(node), node.node_type, node.id, body_text, node.width, node.height)
+
+        cached = self._node_surfaces.get(id(node))
+        if cached is not None and cached[0] == key:
+            self._node_surfaces.move_to_end(id(node))
+            return cached[1]
+
+        surface = cr.get_target().create_similar(
+            cairo.CONTENT_COLOR_ALPHA, math.ceil(node.width), math.ceil(node.height)
+        )
+        self._render_node(cairo.Context(surface), node, body_text)
+        self._node_surfaces[id(node)] = (key, surface)
+        self._node_surfaces.move_to_end(id(node))
+        while len(self._node_surfaces) > NODE_SURFACE_CACHE_SIZE:
+            self._node_surfaces.popitem(last=False)
+        return surface
+
+    def _render_node(self, cr, node: LogicNode, body_text: str):
+        """Renders a node's body and text with its top-left corner at 0, 0.
+
+        Args:
+            cr: The Cairo context to render to.
+            node (LogicNode): The node to render.
+            body_text (str): The markup for the node's body.
+        """
         cr.set_source_rgb(0.2, 0.2, 0.2)
-        cr.rectangle(node.x, node.y, node.width, node.height)
+        cr.rectangle(0, 0, node.width, node.height)
         cr.fill()
 
         if isinstance(node, DialogueNode):
@@ -284,37 +367,30 @@ class LogicEditor(Adw.Bin):
             cr.set_source_rgb(0.4, 0.4, 0.6)
         else:
             cr.set_source_rgb(0.5, 0.5, 0.5)
-        cr.rectangle(node.x, node.y, node.width, 25)
+        cr.rectangle(0, 0, node.width, 25)
         cr.fill()
 
-        if node in self.selected_nodes:
-            cr.set_source_rgb(1.0, 1.0, 0.0)
-            cr.set_line_width(3)
-            cr.rectangle(node.x - 2, node.y - 2, node.width + 4, node.height + 4)
-            cr.stroke()
-
         layout = PangoCairo.create_layout(cr)
-        layout.set_width((node.width - 20) * Pango.SCALE)
+        layout.set_width(int((node.width - 20) * Pango.SCALE))
         layout.set_wrap(Pango.WrapMode.WORD_CHAR)
         cr.set_source_rgb(1, 1, 1)
         layout.set_markup(f"<b>{node.node_type}</b>: {node.id}", -1)
-        cr.move_to(node.x + 10, node.y + 5)
+        cr.move_to(10, 5)
         PangoCairo.show_layout(cr, layout)
 
         cr.set_source_rgb(0.9, 0.9, 0.9)
-        cr.move_to(node.x + 10, node.y + 35)
-        if not hasattr(node, "body_text") or node.body_text is None:
-            self.update_node_body_text(node)
-        layout.set_markup(node.body_text or "", -1)
+        cr.move_to(10, 35)
+        layout.set_markup(body_text, -1)
         PangoCairo.show_layout(cr, layout)
 
-        self.draw_connectors_and_resize_handle(cr, node)
-
-    def update_node_body_text(self, node: LogicNode):
+    def update_node_body_text(self, node: LogicNode) -> str:
         """Updates the cached body text for a node.
 
         Args:
             node (LogicNode): The node to update.
+
+        Returns:
+            str: The node's new body text markup.
         """
         body_text = ""
         if isinstance(node, DialogueNode):
@@ -339,17 +415,19 @@ class LogicEditor(Adw.Bin):
                 params = defs[node.action_command]["params"]
                 param_strings = []
                 for param, p_type in params.items():
-                    param_snake_case = pascal_to_snake(param)
-                    value = getattr(node, param_snake_case, "")
+                    value = node.get_parameter(param, "")
                     param_strings.append(f"{param}: {value}")
                 body_text += f"  ({', '.join(param_strings)})"
-        node.body_text = body_text
+        self._body_texts[id(node)] = body_text
+        return body_text
 
     def update_node_and_redraw(self):
         """Callback to update the selected nodes and redraw the canvas."""
         if self.selected_nodes:
             for node in self.selected_nodes:
                 self.update_node_body_text(node)
+                self._update_spatial_index(node)
+                self._invalidate_edge_geometry(node)
             self.canvas.queue_draw()
 
     def draw_connectors_and_resize_handle(self, cr, node: LogicNode):
@@ -368,6 +446,21 @@ class LogicEditor(Adw.Bin):
         cr.rectangle(node.x + node.width - 10, node.y + node.height - 10, 10, 10)
         cr.fill()
 
+    def _draw_connections(self, cr, clip: tuple):
+        """Draws the connections that pass through the repainted area.
+
+        Args:
+            cr: The Cairo context.
+            clip (tuple): The left, top, right and bottom of the repainted
+                area.
+        """
+        left, top, right, bottom = clip
+        for from_node, to_node in self.active_graph.edges():
+            geometry = self._get_edge_geometry(from_node, to_node)
+            min_x, min_y, max_x, max_y = geometry[1]
+            if min_x <= right and left <= max_x and min_y <= bottom and top <= max_y:
+                self.draw_connection(cr, from_node, to_node)
+
     def draw_connection(self, cr, from_node: LogicNode, to_node: LogicNode):
         """Draws a Bezier curve connection between two nodes.
 
@@ -376,13 +469,55 @@ class LogicEditor(Adw.Bin):
             from_node (LogicNode): The node the connection starts from.
             to_node (LogicNode): The node the connection ends at.
         """
-        start_x, start_y = self.get_connector_pos(from_node, "out")
-        end_x, end_y = self.get_connector_pos(to_node, "in")
+        points = self._get_edge_geometry(from_node, to_node)[0]
         cr.set_source_rgb(0.8, 0.8, 0.2)
-        cr.move_to(start_x, start_y)
-        cr.curve_to(start_x + 50, start_y, end_x - 50, end_y, end_x, end_y)
+        cr.move_to(*points[0])
+        cr.curve_to(*points[1], *points[2], *points[3])
         cr.stroke()
 
+    def _get_edge_geometry(self, from_node: LogicNode, to_node: LogicNode) -> tuple:
+        """Gets the cached Bezier geometry of a connection.
+
+        Args:
+            from_node (LogicNode): The node the connection starts from.
+            to_node (LogicNode): The node the connection ends at.
+
+        Returns:
+            tuple: The four control points of the curve and its bounding box
+            as (min_x, min_y, max_x, max_y).
+        """
+        key = (id(from_node), id(to_node))
+        geometry = self._edge_geometries.get(key)
+        if geometry is None:
+            start_x, start_y = self.get_connector_pos(from_node, "out")
+            end_x, end_y = self.get_connector_pos(to_node, "in")
+            points = (
+                (start_x, start_y),
+                (start_x + 50, start_y),
+                (end_x - 50, end_y),
+                (end_x, end_y),
+            )
+            # A Bezier curve lies within the bounds of its control points.
+            bounds = (
+                min(start_x, end_x - 50),
+                min(start_y, end_y),
+                max(start_x + 50, end_x),
+                max(start_y, end_y),
+            )
+            geometry = self._edge_geometries[key] = (points, bounds)
+        return geometry
+
+    def _invalidate_edge_geometry(self, node: LogicNode):
+        """Discards the cached geometry of a node's connections.
+
+        Args:
+            node (LogicNode): A node that was moved, resized or removed.
+        """
+        for target in self.active_graph.successors(node):
+            self._edge_geometries.pop((id(node), id(target)), None)
+        for source in self.active_graph.predecessors(node):
+            self._edge_geometries.pop((id(source), id(node)), None)
+
     def on_add_node(self, node_class: type, node_type: str):
         """Handles adding a new node to the canvas.
 
@@ -392,9 +527,8 @@ class LogicEditor(Adw.Bin):
         """
         if self.active_graph:
             new_id = f"node_{len(self.active_graph.nodes)}"
-            existing_ids = {node.id for node in self.active_graph.nodes}
             count = 0
-            while new_id in existing_ids:
+            while self.active_graph.get_node(new_id):
                 new_id = f"node_{len(self.active_graph.nodes)}_{count}"
                 count += 1
 
@@ -408,11 +542,12 @@ class LogicEditor(Adw.Bin):
                 width=node_width,
                 height=node_height,
             )
-            self.active_graph.nodes.append(new_node)
+            self.active_graph.add_node(new_node)
+            self._update_spatial_index(new_node)
             self.canvas.queue_draw()
             if hasattr(self, "minimap"):
                 self.minimap.queue_draw()
-            self.project_manager.set_dirty(True)
+            self.project_manager.set_dirty(True, "logic_graphs", self.active_graph)
 
     def get_connector_pos(self, node: LogicNode, connector_type: str) -> tuple[int, int]:
         """Gets the position of a connector on a node.
@@ -438,11 +573,13 @@ class LogicEditor(Adw.Bin):
             y (float): The y-coordinate of the drag start.
         """
         self.drag_mode = None
-        for node in reversed(self.active_graph.nodes if self.active_graph else []):
+        for node in self._nodes_near(x, y):
             # Check for resize handle
+            right = node.x + node.width
+            bottom = node.y + node.height
             if (
-                x >= node.x + node.width - 15
-                and y >= node.y + node.height - 15
+                right - RESIZE_HANDLE_SIZE <= x <= right
+                and bottom - RESIZE_HANDLE_SIZE <= y <= bottom
             ):
                 self.drag_mode = "resizing"
                 self.resizing_node = node
@@ -452,7 +589,10 @@ class LogicEditor(Adw.Bin):
 
             # Check for output connector
             out_x, out_y = self.get_connector_pos(node, "out")
-            if abs(x - out_x) < 10 and abs(y - out_y) < 10:
+            if (
+                abs(x - out_x) < CONNECTOR_HIT_RADIUS
+                and abs(y - out_y) < CONNECTOR_HIT_RADIUS
+            ):
                 self.drag_mode = "connecting"
                 self.connecting_from_node = node
                 self.connecting_line_pos = (x, y)
@@ -471,7 +611,8 @@ class LogicEditor(Adw.Bin):
                     self.selected_nodes.append(node_clicked)
 
             self.props_panel.set_node(
-                self.selected_nodes[0] if len(self.selected_nodes) == 1 else None
+                self.selected_nodes[0] if len(self.selected_nodes) == 1 else None,
+                self.active_graph,
             )
 
             self.drag_offsets = {n.id: (x - n.x, y - n.y) for n in self.selected_nodes}
@@ -508,6 +649,8 @@ class LogicEditor(Adw.Bin):
 
                 node.x = new_x
                 node.y = new_y
+                self._update_spatial_index(node)
+                self._invalidate_edge_geometry(node)
             self.canvas.queue_draw()
         elif self.drag_mode == "selecting":
             if self.drag_selection_rect:
@@ -521,6 +664,8 @@ class LogicEditor(Adw.Bin):
             initial_width, initial_height = self.initial_node_size
             self.resizing_node.width = max(150, initial_width + x)
             self.resizing_node.height = max(100, initial_height + y)
+            self._update_spatial_index(self.resizing_node)
+            self._invalidate_edge_geometry(self.resizing_node)
             self.canvas.queue_draw()
 
     def on_drag_end(self, gesture: Gtk.GestureDrag, x: float, y: float):
@@ -532,25 +677,21 @@ class LogicEditor(Adw.Bin):
             y (float): The y-offset of the drag end.
         """
         if self.drag_mode == "dragging":
-            self.project_manager.set_dirty(True)
+            self.project_manager.set_dirty(True, "logic_graphs", self.active_graph)
         elif self.drag_mode == "selecting" and self.drag_selection_rect:
             self.selected_nodes.clear()
             x1, y1, x2, y2 = self.drag_selection_rect
-            rect = Gdk.Rectangle()
-            rect.x = min(x1, x2)
-            rect.y = min(y1, y2)
-            rect.width = abs(x1 - x2)
-            rect.height = abs(y1 - y2)
+            left, right = min(x1, x2), max(x1, x2)
+            top, bottom = min(y1, y2), max(y1, y2)
             if self.active_graph:
-                for node in self.active_graph.nodes:
-                    node_rect = Gdk.Rectangle()
-                    node_rect.x, node_rect.y, node_rect.width, node_rect.height = (
-                        node.x,
-                        node.y,
-                        node.width,
-                        node.height,
-                    )
-                    if rect.intersect(node_rect)[0]:
+                candidates = self._get_spatial_index().query_rect(x1, y1, x2, y2)
+                for node in candidates:
+                    if (
+                        node.x < right
+                        and left < node.x + node.width
+                        and node.y < bottom
+                        and top < node.y + node.height
+                    ):
                         self.selected_nodes.append(node)
             self.canvas.queue_draw()
         elif self.drag_mode == "connecting" and self.connecting_from_node:
@@ -558,13 +699,19 @@ class LogicEditor(Adw.Bin):
             target_node = self.get_node_at(end_x, end_y)
             if target_node and target_node != self.connecting_from_node:
                 in_x, in_y = self.get_connector_pos(target_node, "in")
-                if abs(end_x - in_x) < 10 and abs(end_y - in_y) < 10:
-                    self.connecting_from_node.outputs.append(target_node.id)
-                    target_node.inputs.append(self.connecting_from_node.id)
-                    self.project_manager.set_dirty(True)
+                if (
+                    abs(end_x - in_x) < CONNECTOR_HIT_RADIUS
+                    and abs(end_y - in_y) < CONNECTOR_HIT_RADIUS
+                ):
+                    if self.active_graph.connect(
+                        self.connecting_from_node, target_node
+                    ):
+                        self.project_manager.set_dirty(
+                            True, "logic_graphs", self.active_graph
+                        )
             self.canvas.queue_draw()
         elif self.drag_mode == "resizing":
-            self.project_manager.set_dirty(True)
+            self.project_manager.set_dirty(True, "logic_graphs", self.active_graph)
 
         # Reset state
         self.drag_mode = None
@@ -594,7 +741,8 @@ class LogicEditor(Adw.Bin):
         else:
             self.selected_nodes = []
         self.props_panel.set_node(
-            self.selected_nodes[0] if len(self.selected_nodes) == 1 else None
+            self.selected_nodes[0] if len(self.selected_nodes) == 1 else None,
+            self.active_graph,
         )
         self.canvas.queue_draw()
 
@@ -611,15 +759,15 @@ class LogicEditor(Adw.Bin):
             if not self.active_graph:
                 return
             for node_to_delete in self.selected_nodes:
-                self.active_graph.nodes.remove(node_to_delete)
-                # Also remove any connections pointing to the deleted node
-                for node in self.active_graph.nodes:
-                    if node_to_delete.id in node.outputs:
-                        node.outputs.remove(node_to_delete.id)
+                self._invalidate_edge_geometry(node_to_delete)
+                self.active_graph.remove_node(node_to_delete)
+                self._spatial_index.remove(node_to_delete)
+                self._body_texts.pop(id(node_to_delete), None)
+                self._node_surfaces.pop(id(node_to_delete), None)
             self.selected_nodes.clear()
             self.props_panel.set_node(None)
             self.canvas.queue_draw()
-            self.project_manager.set_dirty(True)
+            self.project_manager.set_dirty(True, "logic_graphs", self.active_graph)
 
     def get_node_at(self, x: float, y: float) -> LogicNode | None:
         """Gets the topmost node at the given coordinates.
@@ -632,17 +780,74 @@ class LogicEditor(Adw.Bin):
             LogicNode or None: The node at the given coordinates, or None if
             no node is found.
         """
-        if self.active_graph:
-            for node in reversed(self.active_graph.nodes):
-                if (
-                    x >= node.x
-                    and x <= node.x + node.width
-                    and y >= node.y
-                    and y <= node.y + node.height
-                ):
-                    return node
+        for node in self._nodes_near(x, y):
+            if (
+                x >= node.x
+                and x <= node.x + node.width
+                and y >= node.y
+                and y <= node.y + node.height
+            ):
+                return node
         return None
 
+    def _nodes_near(self, x: float, y: float) -> list[LogicNode]:
+        """Gets the nodes whose body or connectors may be at a point.
+
+        Args:
+            x (float): The x-coordinate.
+            y (float): The y-coordinate.
+
+        Returns:
+            list[LogicNode]: The candidate nodes, topmost first.
+        """
+        if not self.active_graph:
+            return []
+        return self._get_spatial_index().query_point(x, y)
+
+    def _get_spatial_index(self) -> SpatialIndex:
+        """Gets the spatial index of the active graph.
+
+        The index is rebuilt if the active graph changed or its nodes were
+        added or removed without going through this editor.
+
+        Returns:
+            SpatialIndex: The spatial index of the active graph's nodes.
+        """
+        graph = self.active_graph
+        if self._spatial_graph is not graph or len(self._spatial_index) != len(
+            graph.nodes
+        ):
+            self._spatial_index.clear()
+            for node in graph.nodes:
+                self._spatial_index.insert(node, *self._node_hit_bounds(node))
+            self._spatial_graph = graph
+        return self._spatial_index
+
+    def _update_spatial_index(self, node: LogicNode):
+        """Updates a node's entry in the spatial index after it changed.
+
+        Args:
+            node (LogicNode): The node that was added, moved or resized.
+        """
+        if self._spatial_graph is self.active_graph:
+            self._spatial_index.update(node, *self._node_hit_bounds(node))
+
+    def _node_hit_bounds(self, node: LogicNode) -> tuple:
+        """Gets the area in which a node, or its connectors, can be clicked.
+
+        Args:
+            node (LogicNode): The node.
+
+        Returns:
+            tuple: The x, y, width and height of the clickable area.
+        """
+        return (
+            node.x - CONNECTOR_HIT_RADIUS,
+            node.y,
+            node.width + 2 * CONNECTOR_HIT_RADIUS,
+            node.height,
+        )
+
     def on_right_click(self, gesture: Gtk.GestureClick, n_press: int, x: float, y: float):
         """Handles a right-click on the canvas to show a context menu.
 
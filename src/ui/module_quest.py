@@ -238,7 +238,7 @@ class QuestEditor(Adw.Bin):
             GObject.BindingFlags.BIDIRECTIONAL | GObject.BindingFlags.SYNC_CREATE,
         )
         list_item.handler_id = widget.connect(
-            "changed", lambda w: self.project_manager.set_dirty(True)
+            "changed", lambda w: self.project_manager.set_dirty(True, "quests")
         )
 
     def _unbind_objective_cell(self, factory, list_item):
@@ -267,7 +267,7 @@ class QuestEditor(Adw.Bin):
         original_id = quest.id
 
         setattr(quest, property_name, new_value)
-        self.project_manager.set_dirty(True)
+        self.project_manager.set_dirty(True, "quests", quest)
 
         for i, item in enumerate(self.model):
             if item.quest.id == original_id:
@@ -335,7 +335,7 @@ class QuestEditor(Adw.Bin):
         new_id = f"objective_{len(quest.objectives)}"
         new_objective = Objective(id=new_id, name="New Objective")
         quest.objectives.append(new_objective)
-        self.project_manager.set_dirty(True)
+        self.project_manager.set_dirty(True, "quests", quest)
         self.objective_model.append(ObjectiveGObject(new_objective))
 
     def _on_delete_objective(self, button, quest):
@@ -376,7 +376,7 @@ class QuestEditor(Adw.Bin):
         if response == "delete":
             objective_data = objective_gobject.objective
             quest.objectives.remove(objective_data)
-            self.project_manager.set_dirty(True)
+            self.project_manager.set_dirty(True, "quests", quest)
             is_found, pos = self.objective_model.find(objective_gobject)
             if is_found:
                 self.objective_model.remove(pos)
@@ -5,14 +5,17 @@ managing game scenes. It includes a canvas for placing and manipulating
 hotspots, a properties panel, and a layer list.
 """
 
+import cairo
 import gi
 import os
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
-from gi.repository import Gtk, Gio, GObject, Gdk, Adw, GdkPixbuf
+from gi.repository import Gtk, Gio, GObject, Gdk, Adw
 from ..core.schemas.scene import Scene, SceneGObject, Hotspot, HotspotGObject
 from ..core.project_manager import ProjectManager
+from .shared.image_cache import ImageCache
+from .shared.tile_pyramid import TileCache
 
 
 @Gtk.Template(filename=os.path.join(os.path.dirname(__file__), "module_scene.ui"))
@@ -72,6 +75,11 @@ class SceneEditor(Gtk.Box):
         self.pan_y = 0
         self.pan_start_x = 0
         self.pan_start_y = 0
+        self._background_cache = ImageCache()
+        self._background_tiles = TileCache(
+            self.project_manager.project_path,
+            on_ready=lambda path: self.canvas.queue_draw(),
+        )
 
         self._setup_models()
         self._connect_signals()
@@ -329,7 +337,7 @@ class SceneEditor(Gtk.Box):
             )
             scene = self.selected_scene_gobject.scene
             scene.background_image = relative_path
-            self.project_manager.set_dirty(True)
+            self.project_manager.set_dirty(True, "scenes", scene)
             self._update_background_preview()
             self.canvas.queue_draw()
         except Exception as e:
@@ -375,7 +383,7 @@ class SceneEditor(Gtk.Box):
         self.selected_hotspot.y = int(self.prop_y.get_value())
         self.selected_hotspot.width = int(self.prop_w.get_value())
         self.selected_hotspot.height = int(self.prop_h.get_value())
-        self.project_manager.set_dirty(True)
+        self.project_manager.set_dirty(True, "scenes")
         self.canvas.queue_draw()
         self._update_layer_list()  # To refresh the name in the list
 
@@ -396,17 +404,7 @@ class SceneEditor(Gtk.Box):
         )
         if not scene:
             return
-        if scene.background_image and self.project_manager.project_path:
-            full_path = os.path.join(
-                self.project_manager.project_path, scene.background_image
-            )
-            if os.path.exists(full_path):
-                try:
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_file(full_path)
-                    Gdk.cairo_set_source_pixbuf(cr, pixbuf, 0, 0)
-                    cr.paint()
-                except Exception as e:
-                    print(f"Error loading background image: {e}")
+        self._draw_background(cr, scene, w, h)
         cr.save()
         cr.translate(self.pan_x, self.pan_y)
         cr.scale(self.zoom_level, self.zoom_level)
@@ -432,6 +430,82 @@ class SceneEditor(Gtk.Box):
             cr.fill()
         cr.restore()
 
+    def _draw_background(self, cr, scene: Scene, w: int, h: int):
+        """Draws a scene's background image at the current pan and zoom.
+
+        Large backgrounds are drawn from their tile pyramid, which is
+        generated in the background the first time they are shown. Smaller
+        ones are drawn whole: the decoded image, and a copy of it scaled to
+        the zoom level, come from the background cache, so redrawing the
+        canvas while panning only copies pixels that are already in memory.
+
+        Args:
+            cr: The Cairo context.
+            scene (Scene): The scene whose background to draw.
+            w (int): The width of the drawing area.
+            h (int): The height of the drawing area.
+        """
+        if not scene.background_image or not self.project_manager.project_path:
+            return
+        full_path = os.path.join(
+            self.project_manager.project_path, scene.background_image
+        )
+        stamp = self._background_cache.get_stamp(full_path)
+        if stamp is None:
+            return
+        if self._background_tiles.is_tiled(full_path, stamp):
+            pyramid = self._background_tiles.get_pyramid(full_path, stamp)
+            if pyramid is not None:
+                self._draw_background_tiles(cr, pyramid, w, h)
+            return
+        surface, scale = self._background_cache.get_scaled(full_path, self.zoom_level)
+        if surface is None:
+            return
+        cr.save()
+        # Whole-pixel offsets let Cairo copy the scaled image without
+        # resampling it.
+        cr.translate(round(self.pan_x), round(self.pan_y))
+        cr.scale(scale, scale)
+        cr.set_source_surface(surface, 0, 0)
+        cr.paint()
+        cr.restore()
+
+    def _draw_background_tiles(self, cr, pyramid, w: int, h: int):
+        """Draws the tiles of a background that are inside the viewport.
+
+        Args:
+            cr: The Cairo context.
+            pyramid (TilePyramid): The tile pyramid of the background.
+            w (int): The width of the drawing area.
+            h (int): The height of the drawing area.
+        """
+        zoom = self.zoom_level
+        level = pyramid.level_for_scale(zoom)
+        scale_x, scale_y = pyramid.level_scale(level)
+        tiles = pyramid.visible_tiles(
+            level,
+            -self.pan_x / zoom,
+            -self.pan_y / zoom,
+            (w - self.pan_x) / zoom,
+            (h - self.pan_y) / zoom,
+        )
+        size = pyramid.tile_size
+        cr.save()
+        cr.translate(round(self.pan_x), round(self.pan_y))
+        cr.scale(zoom / scale_x, zoom / scale_y)
+        for column, row in tiles:
+            tile = self._background_cache.get_image(
+                pyramid.tile_path(level, column, row)
+            )
+            if tile is None:
+                continue
+            cr.set_source_surface(tile, column * size, row * size)
+            # Padding the edges keeps seams from showing between tiles.
+            cr.get_source().set_extend(cairo.EXTEND_PAD)
+            cr.rectangle(column * size, row * size, tile.get_width(), tile.get_height())
+            cr.fill()
+        cr.restore()
+
     def _on_canvas_click(self, gesture, n_press, x, y):
         """Handles a click event on the canvas.
 
@@ -461,7 +535,7 @@ class SceneEditor(Gtk.Box):
                 height=50,
             )
             scene.hotspots.append(new_hotspot)
-            self.project_manager.set_dirty(True)
+            self.project_manager.set_dirty(True, "scenes", scene)
             self._update_layer_list()
             self.canvas.queue_draw()
         else:
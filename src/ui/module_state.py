@@ -232,7 +232,9 @@ class GlobalStateEditor(Gtk.Box):
             var_gobject (GlobalVariableGObject): The GObject wrapper for the
                 variable.
         """
-        self.project_manager.set_dirty(True)
+        self.project_manager.set_dirty(
+            True, "global_variables", var_gobject.globalvariable
+        )
 
     def _on_type_changed(self, dropdown, pspec, var_gobject: GlobalVariableGObject):
         """Handles the 'selected' signal from the type dropdown.
@@ -245,7 +247,9 @@ class GlobalStateEditor(Gtk.Box):
         """
         selected_str = dropdown.get_selected_item().get_string()
         var_gobject.set_property("type", selected_str)
-        self.project_manager.set_dirty(True)
+        self.project_manager.set_dirty(
+            True, "global_variables", var_gobject.globalvariable
+        )
 
     def _on_search_changed(self, search_entry):
         """Handles the search-changed signal from the search entry.
@@ -290,8 +294,7 @@ class GlobalStateEditor(Gtk.Box):
         new_id_base = "new_variable"
         new_id = new_id_base
         count = 1
-        existing_ids = {v.id for v in self.project_manager.data.global_variables}
-        while new_id in existing_ids:
+        while self.project_manager.data.get_by_id("global_variables", new_id):
             new_id = f"{new_id_base}_{count}"
             count += 1
 
@@ -197,14 +197,16 @@ class UIBuilder(Adw.Bin):
                 height=30,
             )
             self.active_layout.uilayout.elements.append(new_element)
-            self.project_manager.set_dirty(True)
+            self.project_manager.set_dirty(
+                True, "ui_layouts", self.active_layout.uilayout
+            )
             self.canvas.queue_draw()
 
     def _on_delete_element(self, button):
         print("DEBUG: UIBuilder._on_delete_element")
         if self.active_layout and self.active_element:
             self.active_layout.uilayout.elements.remove(self.active_element)
-            self.project_manager.set_dirty(True)
+            self.project_manager.set_dirty(True, "ui_layouts")
             self.active_element = None
             self.canvas.queue_draw()
             self._clear_properties_editor()
@@ -279,5 +281,5 @@ class UIBuilder(Adw.Bin):
             return
 
         setattr(element, property_name, new_value)
-        self.project_manager.set_dirty(True)
+        self.project_manager.set_dirty(True, "ui_layouts")
         self.canvas.queue_draw()
@@ -13,7 +13,7 @@ class SearchResultsView(Adw.Bin):
     """A widget to display search results in a Gtk.ColumnView.
 
     This widget takes a list of SearchResult objects and displays them in a
-    three-column layout: Type, Name, and ID.
+    four-column layout: Type, Name, ID, and the fields that matched.
     """
 
     def __init__(self, **kwargs):
@@ -34,14 +34,22 @@ class SearchResultsView(Adw.Bin):
         factory_id.connect("setup", self._on_setup_label)
         factory_id.connect("bind", lambda f, i: self._on_bind_label(f, i, "id"))
 
+        factory_field = Gtk.SignalListItemFactory()
+        factory_field.connect("setup", self._on_setup_label)
+        factory_field.connect(
+            "bind", lambda f, i: self._on_bind_label(f, i, "field")
+        )
+
         col_type = Gtk.ColumnViewColumn(title="Type", factory=factory_type)
         col_name = Gtk.ColumnViewColumn(title="Name", factory=factory_name)
         col_id = Gtk.ColumnViewColumn(title="ID", factory=factory_id)
+        col_field = Gtk.ColumnViewColumn(title="Matched In", factory=factory_field)
 
         self.column_view = Gtk.ColumnView(model=Gtk.NoSelection(model=self.model))
         self.column_view.append_column(col_type)
         self.column_view.append_column(col_name)
         self.column_view.append_column(col_id)
+        self.column_view.append_column(col_field)
 
         scrolled_window = Gtk.ScrolledWindow(
             child=self.column_view, vexpand=True, hexpand=True
@@ -60,14 +68,19 @@ class SearchResultsView(Adw.Bin):
         label.set_text(str(item.get_property(property_name)))
         label.set_halign(Gtk.Align.START)
 
-    def update_results(self, results: list[SearchResult]):
-        """Clears the current results and adds the new ones.
+    def update_results(self, results: list[SearchResult], append: bool = False):
+        """Replaces the current results, or appends a page of new ones.
+
+        The model is updated in a single splice so that the view only has to
+        process one change per page.
 
         Args:
             results: A list of SearchResult objects.
+            append (bool): If True, the results are added after the existing
+                ones instead of replacing them. Defaults to False.
         """
-        self.model.remove_all()
-        for result in results:
-            self.model.append(
-                SearchResultGObject(id=result.id, name=result.name, type=result.type)
-            )
+        position = self.model.get_n_items() if append else 0
+        removed = 0 if append else self.model.get_n_items()
+        self.model.splice(
+            position, removed, [SearchResultGObject(result) for result in results]
+        )
@@ -1,7 +1,6 @@
 """A dynamic property editor for different types of logic nodes."""
 
 import gi
-import re
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
@@ -11,19 +10,6 @@ from ...core.schemas.logic import ActionNode, ConditionNode, DialogueNode, Logic
 from ...core.ue_exporter import get_command_definitions
 
 
-def pascal_to_snake(name):
-    """Converts a PascalCase string to snake_case.
-
-    Args:
-        name (str): The PascalCase string to convert.
-
-    Returns:
-        str: The converted snake_case string.
-    """
-    name = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
-    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", name).lower()
-
-
 class DynamicNodeEditor(Adw.Bin):
     """A dynamic property editor for different types of logic nodes.
 
@@ -33,10 +19,13 @@ class DynamicNodeEditor(Adw.Bin):
 
     Attributes:
         node (LogicNode): The currently selected node to be edited.
+        owner (LogicGraph): The graph that contains the node, if known.
         project_manager: The main project manager instance.
         settings_manager: The main settings manager instance.
         on_update_callback (callable): A function to call when a node's data
             is updated.
+        collection_name (str): The project data collection that owns the
+            edited nodes, used to mark it as modified.
     """
 
     __gtype_name__ = "DynamicNodeEditor"
@@ -53,13 +42,16 @@ class DynamicNodeEditor(Adw.Bin):
         project_manager = kwargs.pop('project_manager', None)
         settings_manager = kwargs.pop('settings_manager', None)
         on_update_callback = kwargs.pop('on_update_callback', None)
+        collection_name = kwargs.pop('collection_name', "logic_graphs")
 
         super().__init__(**kwargs)
 
         self.node = None
+        self.owner = None
         self.project_manager = project_manager
         self.settings_manager = settings_manager
         self.on_update_callback = on_update_callback
+        self.collection_name = collection_name
         self.main_widgets = {}
         self.param_widgets = {}
 
@@ -87,13 +79,17 @@ class DynamicNodeEditor(Adw.Bin):
         """
         self.on_update_callback = on_update_callback
 
-    def set_node(self, node: LogicNode):
+    def set_node(self, node: LogicNode, owner=None):
         """Sets the node to be edited and rebuilds the UI.
 
         Args:
             node (LogicNode): The node to edit.
+            owner (LogicGraph, optional): The graph that contains the node,
+                which is marked as modified when the node is edited.
+                Defaults to None.
         """
         self.node = node
+        self.owner = owner
         GLib.idle_add(self.build_ui)
 
     def build_ui(self) -> bool:
@@ -216,18 +212,17 @@ class DynamicNodeEditor(Adw.Bin):
             self.params_group.set_title(f"Parameters for {selected_command}")
             for param, p_type in defs["params"].items():
                 self.add_param_widget(
-                    param, p_type, getattr(self.node, pascal_to_snake(param), "")
+                    param, p_type, self.node.get_parameter(param, "")
                 )
 
     def add_param_widget(self, key, param_type, default_value):
         """Adds a widget for a command parameter.
 
         Args:
-            key (str): The parameter key.
+            key (str): The PascalCase parameter name.
             param_type (str or list): The type of the parameter.
             default_value: The initial value for the parameter.
         """
-        snake_key = pascal_to_snake(key)
         title = key.replace("_", " ").title()
 
         if isinstance(param_type, list):
@@ -250,7 +245,7 @@ class DynamicNodeEditor(Adw.Bin):
             widget.set_text(str(default_value))
             widget.connect("notify::text", self.on_value_changed)
 
-        self.param_widgets[snake_key] = widget
+        self.param_widgets[key] = widget
         if not isinstance(widget, Gtk.CheckButton):
             self.params_group.add(widget)
         else:
@@ -280,7 +275,11 @@ class DynamicNodeEditor(Adw.Bin):
 
         values = self.get_values()
         for key, value in values.items():
-            if hasattr(self.node, key):
+            if key in self.param_widgets:
+                # Parameters are stored sparsely on the node; the widgets
+                # already produce values of the parameter's type.
+                self.node.set_parameter(key, value)
+            elif hasattr(self.node, key):
                 field_type = getattr(self.node.__class__, "__annotations__", {}).get(
                     key, "any"
                 )
@@ -299,7 +298,7 @@ class DynamicNodeEditor(Adw.Bin):
                 setattr(self.node, key, coerced_value)
 
         if self.project_manager:
-            self.project_manager.set_dirty(True)
+            self.project_manager.set_dirty(True, self.collection_name, self.owner)
         if self.on_update_callback:
             self.on_update_callback()
 
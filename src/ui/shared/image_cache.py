@@ -0,0 +1,184 @@
+"""A cache of decoded and pre-scaled images for canvas drawing.
+
+This module provides the ImageCache class, which keeps decoded images as
+Cairo surfaces so that a canvas does not have to read and decode an image
+file every time it is redrawn. Scaled copies of each image are cached as
+well, so painting at the current zoom level is a plain copy instead of a
+resampling of the full-resolution image.
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+
+import cairo
+import gi
+
+gi.require_version("Gdk", "4.0")
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import Gdk, GdkPixbuf, GLib
+
+# The default memory budget of a cache, in bytes.
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Scaled copies larger than this many pixels are not cached; the full-size
+# image is scaled as it is painted instead.
+MAX_SCALED_PIXELS = 4096 * 4096
+
+# How often the modification time of a cached file is checked, in seconds.
+STAT_INTERVAL = 1.0
+
+
+class ImageCache:
+    """A least-recently-used cache of image surfaces, keyed by file.
+
+    Entries are keyed by the file's path, modification time and size, so an
+    image that is replaced on disk is decoded again the next time it is
+    drawn. When the cached surfaces use more than the memory budget, the
+    least recently drawn ones are dropped, whichever image they belong to.
+
+    Attributes:
+        max_bytes (int): The memory budget of the cache, in bytes.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """Initializes a new, empty ImageCache instance.
+
+        Args:
+            max_bytes (int, optional): The memory budget of the cache, in
+                bytes. Defaults to DEFAULT_CACHE_BYTES.
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._stamps = {}
+        self._failed = set()
+
+    def clear(self):
+        """Drops every cached surface."""
+        self._entries.clear()
+        self._bytes = 0
+        self._stamps.clear()
+        self._failed.clear()
+
+    def get_image(self, path: str) -> cairo.ImageSurface:
+        """Gets the full-size surface of an image file.
+
+        Args:
+            path (str): The path of the image file.
+
+        Returns:
+            cairo.ImageSurface: The decoded image, or None if the file does
+            not exist or cannot be decoded.
+        """
+        stamp = self.get_stamp(path)
+        if stamp is None:
+            return None
+        key = (path, stamp, 1.0)
+        surface = self._lookup(key)
+        if surface is None and (path, stamp) not in self._failed:
+            surface = self._decode(path)
+            if surface is None:
+                self._failed.add((path, stamp))
+            else:
+                self._store(key, surface)
+        return surface
+
+    def get_scaled(self, path: str, scale: float) -> tuple:
+        """Gets the surface of an image file for painting at a given scale.
+
+        Args:
+            path (str): The path of the image file.
+            scale (float): The scale the image will be painted at.
+
+        Returns:
+            tuple: A (surface, scale) tuple, where the surface is a scaled
+            copy of the image, or the full-size image if the copy would be
+            too large, and the scale is what is left to apply when painting
+            it. The surface is None if the image cannot be loaded.
+        """
+        scale = round(scale, 3)
+        stamp = self.get_stamp(path)
+        if stamp is None:
+            return None, scale
+        key = (path, stamp, scale)
+        surface = self._lookup(key)
+        if surface is not None:
+            return surface, 1.0
+
+        image = self.get_image(path)
+        if image is None or scale == 1.0:
+            return image, scale
+        width = max(1, round(image.get_width() * scale))
+        height = max(1, round(image.get_height() * scale))
+        if width * height > MAX_SCALED_PIXELS:
+            return image, scale
+
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        cr = cairo.Context(surface)
+        cr.scale(width / image.get_width(), height / image.get_height())
+        cr.set_source_surface(image, 0, 0)
+        cr.get_source().set_filter(cairo.FILTER_GOOD)
+        cr.paint()
+        self._store(key, surface)
+        return surface, 1.0
+
+    def get_stamp(self, path: str) -> tuple:
+        """Gets the modification time and size of a file.
+
+        The result is remembered for STAT_INTERVAL seconds, so redrawing a
+        canvas many times a second does not query the file system each time.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            tuple: A (modification time, size) tuple, or None if the file
+            does not exist.
+        """
+        now = time.monotonic()
+        cached = self._stamps.get(path)
+        if cached is not None and now - cached[1] < STAT_INTERVAL:
+            return cached[0]
+        try:
+            stat = os.stat(path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        self._stamps[path] = (stamp, now)
+        return stamp
+
+    def _lookup(self, key: tuple) -> cairo.ImageSurface:
+        """Gets a cached surface and marks it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _store(self, key: tuple, surface: cairo.ImageSurface):
+        """Caches a surface, dropping the least recently used ones if needed."""
+        size = surface.get_stride() * surface.get_height()
+        self._entries[key] = (surface, size)
+        self._bytes += size
+        # Always keep the newest entry, even if it is over the budget alone.
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, dropped) = self._entries.popitem(last=False)
+            self._bytes -= dropped
+
+    @staticmethod
+    def _decode(path: str) -> cairo.ImageSurface:
+        """Decodes an image file to a new surface."""
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file(path)
+        except GLib.Error as e:
+            logging.error(f"Error loading image {path}: {e}")
+            return None
+        surface = cairo.ImageSurface(
+            cairo.FORMAT_ARGB32, pixbuf.get_width(), pixbuf.get_height()
+        )
+        cr = cairo.Context(surface)
+        Gdk.cairo_set_source_pixbuf(cr, pixbuf, 0, 0)
+        cr.paint()
+        return surface
@@ -0,0 +1,204 @@
+"""A spatial index for hit-testing items on a canvas.
+
+This module provides the SpatialIndex class, which buckets rectangles into a
+uniform grid of square cells so that point and rectangle queries only look
+at the items near the query instead of every item on the canvas.
+"""
+
+import math
+
+
+class SpatialIndex:
+    """A uniform grid index over the bounding rectangles of canvas items.
+
+    Items are tracked by identity, so unhashable objects such as dataclass
+    nodes can be indexed. Every item also has a stacking order, which is the
+    order in which it was first inserted; point queries return the topmost
+    item first, matching the order in which the items are drawn.
+
+    Attributes:
+        cell_size (int): The width and height of a grid cell, in canvas
+            units.
+    """
+
+    def __init__(self, cell_size: int = 256):
+        """Initializes a new, empty SpatialIndex instance.
+
+        Args:
+            cell_size (int, optional): The size of a grid cell. It should be
+                around the size of a typical item. Defaults to 256.
+        """
+        self.cell_size = cell_size
+        self._cells = {}
+        self._entries = {}
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        """Returns the number of indexed items."""
+        return len(self._entries)
+
+    def clear(self):
+        """Removes every item from the index."""
+        self._cells.clear()
+        self._entries.clear()
+        self._next_order = 0
+
+    def insert(self, item, x: float, y: float, width: float, height: float):
+        """Adds an item on top of every other item.
+
+        If the item is already indexed, it is moved to the top.
+
+        Args:
+            item: The item to add.
+            x (float): The left edge of the item's bounds.
+            y (float): The top edge of the item's bounds.
+            width (float): The width of the item's bounds.
+            height (float): The height of the item's bounds.
+        """
+        if id(item) in self._entries:
+            self.remove(item)
+        bounds = (x, y, x + width, y + height)
+        cells = self._cell_range(*bounds)
+        self._entries[id(item)] = [item, bounds, cells, self._next_order]
+        self._next_order += 1
+        self._add_to_cells(item, cells)
+
+    def update(self, item, x: float, y: float, width: float, height: float):
+        """Updates the bounds of an item after it was moved or resized.
+
+        The item keeps its stacking order. Items that are not yet indexed
+        are inserted.
+
+        Args:
+            item: The item to update.
+            x (float): The new left edge of the item's bounds.
+            y (float): The new top edge of the item's bounds.
+            width (float): The new width of the item's bounds.
+            height (float): The new height of the item's bounds.
+        """
+        entry = self._entries.get(id(item))
+        if entry is None:
+            self.insert(item, x, y, width, height)
+            return
+        entry[1] = (x, y, x + width, y + height)
+        cells = self._cell_range(*entry[1])
+        if cells != entry[2]:
+            self._remove_from_cells(item, entry[2])
+            self._add_to_cells(item, cells)
+            entry[2] = cells
+
+    def remove(self, item):
+        """Removes an item from the index, if it is indexed.
+
+        Args:
+            item: The item to remove.
+        """
+        entry = self._entries.pop(id(item), None)
+        if entry is not None:
+            self._remove_from_cells(item, entry[2])
+
+    def query_point(self, x: float, y: float) -> list:
+        """Finds the items whose bounds contain a point.
+
+        Args:
+            x (float): The x-coordinate of the point.
+            y (float): The y-coordinate of the point.
+
+        Returns:
+            list: The matching items, topmost first.
+        """
+        cell = self._cells.get(
+            (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+        )
+        if not cell:
+            return []
+        entries = []
+        for key in cell:
+            entry = self._entries[key]
+            left, top, right, bottom = entry[1]
+            if left <= x <= right and top <= y <= bottom:
+                entries.append(entry)
+        entries.sort(key=lambda entry: entry[3], reverse=True)
+        return [entry[0] for entry in entries]
+
+    def query_rect(self, x1: float, y1: float, x2: float, y2: float) -> list:
+        """Finds the items whose bounds overlap a rectangle.
+
+        Args:
+            x1 (float): The x-coordinate of one corner of the rectangle.
+            y1 (float): The y-coordinate of one corner of the rectangle.
+            x2 (float): The x-coordinate of the opposite corner.
+            y2 (float): The y-coordinate of the opposite corner.
+
+        Returns:
+            list: The matching items, bottommost first.
+        """
+        left, right = min(x1, x2), max(x1, x2)
+        top, bottom = min(y1, y2), max(y1, y2)
+        col_min, row_min, col_max, row_max = self._cell_range(left, top, right, bottom)
+
+        # A large rectangle over a sparse canvas spans more cells than are
+        # occupied, in which case it is cheaper to visit the occupied cells.
+        span = (col_max - col_min + 1) * (row_max - row_min + 1)
+        if span > len(self._cells):
+            cells = [
+                cell
+                for (col, row), cell in self._cells.items()
+                if col_min <= col <= col_max and row_min <= row <= row_max
+            ]
+        else:
+            cells = [
+                self._cells[(col, row)]
+                for col in range(col_min, col_max + 1)
+                for row in range(row_min, row_max + 1)
+                if (col, row) in self._cells
+            ]
+
+        found = {}
+        for cell in cells:
+            for key in cell:
+                if key in found:
+                    continue
+                entry = self._entries[key]
+                item_left, item_top, item_right, item_bottom = entry[1]
+                if (
+                    item_left <= right
+                    and left <= item_right
+                    and item_top <= bottom
+                    and top <= item_bottom
+                ):
+                    found[key] = entry
+        entries = sorted(found.values(), key=lambda entry: entry[3])
+        return [entry[0] for entry in entries]
+
+    def _cell_range(self, left, top, right, bottom) -> tuple:
+        """Returns the range of grid cells covered by a rectangle.
+
+        Returns:
+            tuple: The first column, first row, last column and last row.
+        """
+        size = self.cell_size
+        return (
+            math.floor(left / size),
+            math.floor(top / size),
+            math.floor(right / size),
+            math.floor(bottom / size),
+        )
+
+    def _add_to_cells(self, item, cells: tuple):
+        """Adds an item to every cell in a range."""
+        col_min, row_min, col_max, row_max = cells
+        for col in range(col_min, col_max + 1):
+            for row in range(row_min, row_max + 1):
+                self._cells.setdefault((col, row), {})[id(item)] = item
+
+    def _remove_from_cells(self, item, cells: tuple):
+        """Removes an item from every cell in a range."""
+        col_min, row_min, col_max, row_max = cells
+        for col in range(col_min, col_max + 1):
+            for row in range(row_min, row_max + 1):
+                cell = self._cells.get((col, row))
+                if cell is not None:
+                    cell.pop(id(item), None)
+                    if not cell:
+                        del self._cells[(col, row)]
@@ -0,0 +1,217 @@
+"""Asynchronous image thumbnails with a persistent disk cache.
+
+This module provides the ThumbnailService class, which decodes and
+downsizes images on a pool of worker threads so that views such as the
+asset grid never decode a full-size image on the main thread. Thumbnails
+are saved in a cache directory inside the project, named after a hash of
+the source file's contents, so they survive restarts and are shared by
+identical files.
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+import gi
+
+gi.require_version("Gdk", "4.0")
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import Gdk, GdkPixbuf, GLib
+
+# The largest width or height of a thumbnail, in pixels.
+THUMBNAIL_SIZE = 128
+
+# The cache directory, relative to the project directory.
+THUMBNAIL_CACHE_DIR = os.path.join(".cache", "thumbnails")
+
+# The number of thumbnails kept in memory.
+MEMORY_CACHE_SIZE = 1024
+
+
+class ThumbnailService:
+    """Loads thumbnails on worker threads and caches them.
+
+    `request` is called from the main thread. It returns the thumbnail
+    straight away if it is in memory, and otherwise queues the image and
+    calls back on the main thread once the thumbnail is ready. The most
+    recent requests are served first, so the images that were just
+    scrolled into view appear before those that were scrolled past.
+
+    Attributes:
+        size (int): The largest width or height of a thumbnail.
+        cache_dir (str): The directory thumbnails are saved in, or None to
+            keep them in memory only.
+    """
+
+    def __init__(self, size: int = THUMBNAIL_SIZE, workers: int = None):
+        """Initializes a new ThumbnailService instance.
+
+        Args:
+            size (int, optional): The largest width or height of a
+                thumbnail. Defaults to THUMBNAIL_SIZE.
+            workers (int, optional): The number of worker threads. Defaults
+                to the number of CPUs, up to four.
+        """
+        self.size = size
+        self.cache_dir = None
+        self._worker_count = workers or min(4, os.cpu_count() or 1)
+        self._workers = []
+        self._queue = queue.LifoQueue()
+        self._generation = 0
+        self._textures = OrderedDict()
+        self._waiting = {}
+        self._failed = set()
+        self._digests = {}
+        self._digests_lock = threading.Lock()
+
+    def set_project(self, project_path: str):
+        """Switches to the thumbnail cache of a project.
+
+        Thumbnails in memory are dropped, and requests that are still
+        queued for the previous project are never called back.
+
+        Args:
+            project_path (str): The path of the project directory, or None.
+        """
+        self.cache_dir = (
+            os.path.join(project_path, THUMBNAIL_CACHE_DIR) if project_path else None
+        )
+        self._generation += 1
+        self._textures.clear()
+        self._waiting.clear()
+        self._failed.clear()
+
+    def request(self, path: str, callback: callable) -> Gdk.Texture:
+        """Gets the thumbnail of an image, loading it if needed.
+
+        Args:
+            path (str): The path of the image file.
+            callback (callable): Called on the main thread with the
+                thumbnail when it has been loaded. It is not called if the
+                thumbnail is returned straight away, or if it cannot be
+                loaded.
+
+        Returns:
+            Gdk.Texture: The thumbnail if it is in memory, otherwise None.
+        """
+        texture = self._textures.get(path)
+        if texture is not None:
+            self._textures.move_to_end(path)
+            return texture
+        if path in self._failed:
+            return None
+        callbacks = self._waiting.get(path)
+        if callbacks is not None:
+            callbacks.append(callback)
+            return None
+        self._waiting[path] = [callback]
+        self._queue.put((path, self.cache_dir, self._generation))
+        self._start_workers()
+        return None
+
+    def invalidate(self, path: str):
+        """Forgets the thumbnail of an image whose file has been replaced.
+
+        Args:
+            path (str): The path of the image file.
+        """
+        self._textures.pop(path, None)
+        self._failed.discard(path)
+
+    def _start_workers(self):
+        """Starts the worker threads the first time they are needed."""
+        while len(self._workers) < self._worker_count:
+            worker = threading.Thread(
+                target=self._run_worker, name="advengine-thumbnails", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _run_worker(self):
+        """Loads queued thumbnails and hands them to the main thread."""
+        while True:
+            path, cache_dir, generation = self._queue.get()
+            if generation != self._generation:
+                continue
+            try:
+                texture = self._load(path, cache_dir)
+            except (GLib.Error, OSError) as e:
+                logging.error(f"Error creating thumbnail for {path}: {e}")
+                texture = None
+            GLib.idle_add(self._on_loaded, path, generation, texture)
+
+    def _on_loaded(self, path: str, generation: int, texture: Gdk.Texture) -> bool:
+        """Stores a loaded thumbnail and calls back its requesters.
+
+        Returns:
+            bool: False, so that the idle callback does not repeat.
+        """
+        if generation != self._generation:
+            return GLib.SOURCE_REMOVE
+        callbacks = self._waiting.pop(path, [])
+        if texture is None:
+            self._failed.add(path)
+            return GLib.SOURCE_REMOVE
+        self._textures[path] = texture
+        while len(self._textures) > MEMORY_CACHE_SIZE:
+            self._textures.popitem(last=False)
+        for callback in callbacks:
+            callback(texture)
+        return GLib.SOURCE_REMOVE
+
+    def _load(self, path: str, cache_dir: str) -> Gdk.Texture:
+        """Loads a thumbnail from the disk cache, or creates it.
+
+        Args:
+            path (str): The path of the image file.
+            cache_dir (str): The thumbnail cache directory, or None.
+
+        Returns:
+            Gdk.Texture: The thumbnail.
+        """
+        thumbnail_path = None
+        if cache_dir:
+            digest = self._get_digest(path)
+            thumbnail_path = os.path.join(cache_dir, f"{digest}-{self.size}.png")
+            if os.path.exists(thumbnail_path):
+                try:
+                    return Gdk.Texture.new_from_filename(thumbnail_path)
+                except GLib.Error:
+                    pass  # A damaged cache file is simply created again.
+
+        _, width, height = GdkPixbuf.Pixbuf.get_file_info(path)
+        if width <= self.size and height <= self.size:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file(path)
+        else:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(
+                path, self.size, self.size, True
+            )
+        if thumbnail_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_path = f"{thumbnail_path}.{threading.get_ident()}.tmp"
+            pixbuf.savev(temp_path, "png", [], [])
+            os.replace(temp_path, thumbnail_path)
+        return Gdk.Texture.new_for_pixbuf(pixbuf)
+
+    def _get_digest(self, path: str) -> str:
+        """Gets a hash of a file's contents.
+
+        Hashes are remembered by modification time and size, so a file is
+        only read again after it changes.
+        """
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._digests_lock:
+            cached = self._digests.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        with self._digests_lock:
+            self._digests[path] = (stamp, digest.hexdigest())
+        return digest.hexdigest()
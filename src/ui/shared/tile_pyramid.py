@@ -0,0 +1,363 @@
+"""Tiled, mipmapped versions of large images for canvas drawing.
+
+This module provides the TileCache class, which turns large images into
+pyramids of tiles: the full-resolution image and successively halved copies
+of it, each cut into square tiles and saved to the project's cache directory,
+next to its thumbnails. A canvas can then draw only the tiles that intersect
+its viewport, from the level that matches its zoom, instead of the whole
+image.
+
+Pyramids are generated on a worker thread the first time an image is drawn
+and reused from the disk cache afterwards, until the image file changes.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+
+import gi
+
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GdkPixbuf, GLib
+
+# The width and height of a tile, in pixels.
+TILE_SIZE = 256
+
+# Images whose width and height are both at most this many pixels are not
+# tiled; they are small enough to draw whole.
+MIN_TILED_SIZE = 2048
+
+# Where pyramids are cached, relative to the project directory.
+TILE_CACHE_DIR = os.path.join(".cache", "tiles")
+
+MANIFEST_FILENAME = "pyramid.json"
+
+
+class TilePyramid:
+    """The mipmap levels of an image, cut into tiles stored on disk.
+
+    Level 0 is the full-resolution image, and each following level is half
+    the width and height of the one before it, down to a level that fits in
+    a single tile.
+
+    Attributes:
+        directory (str): The directory holding the tiles.
+        width (int): The width of the full-resolution image.
+        height (int): The height of the full-resolution image.
+        tile_size (int): The width and height of a tile.
+        levels (list[tuple[int, int]]): The width and height of each level.
+    """
+
+    def __init__(
+        self, directory: str, width: int, height: int, tile_size: int, levels: list
+    ):
+        """Initializes a new TilePyramid instance.
+
+        Args:
+            directory (str): The directory holding the tiles.
+            width (int): The width of the full-resolution image.
+            height (int): The height of the full-resolution image.
+            tile_size (int): The width and height of a tile.
+            levels (list): The width and height of each level.
+        """
+        self.directory = directory
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.levels = [tuple(level) for level in levels]
+
+    @classmethod
+    def load(cls, directory: str) -> "TilePyramid":
+        """Loads the pyramid in a cache directory.
+
+        Args:
+            directory (str): The directory holding the tiles.
+
+        Returns:
+            TilePyramid: The pyramid, or None if the directory does not hold
+            a complete one.
+        """
+        try:
+            with open(os.path.join(directory, MANIFEST_FILENAME)) as f:
+                manifest = json.load(f)
+            return cls(
+                directory,
+                manifest["width"],
+                manifest["height"],
+                manifest["tile_size"],
+                manifest["levels"],
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def level_for_scale(self, scale: float) -> int:
+        """Gets the level to draw the image from at a given scale.
+
+        This is the smallest level that is still at least as detailed as
+        the screen, so tiles are never enlarged by more than the zoom level
+        itself requires.
+
+        Args:
+            scale (float): The scale of the full-resolution image on screen.
+
+        Returns:
+            int: The index of the level.
+        """
+        if scale >= 1.0:
+            return 0
+        level = math.floor(math.log2(1.0 / scale))
+        return min(level, len(self.levels) - 1)
+
+    def level_scale(self, level: int) -> tuple:
+        """Gets the size of a level relative to the full-resolution image.
+
+        Args:
+            level (int): The index of the level.
+
+        Returns:
+            tuple[float, float]: The horizontal and vertical scale.
+        """
+        width, height = self.levels[level]
+        return width / self.width, height / self.height
+
+    def tile_path(self, level: int, column: int, row: int) -> str:
+        """Gets the path of a tile.
+
+        Args:
+            level (int): The index of the level.
+            column (int): The column of the tile.
+            row (int): The row of the tile.
+
+        Returns:
+            str: The path of the tile's image file.
+        """
+        return os.path.join(self.directory, str(level), f"{column}_{row}.png")
+
+    def visible_tiles(
+        self, level: int, x0: float, y0: float, x1: float, y1: float
+    ) -> list:
+        """Gets the tiles of a level that intersect a rectangle.
+
+        Args:
+            level (int): The index of the level.
+            x0 (float): The left edge of the rectangle, in full-resolution
+                image pixels.
+            y0 (float): The top edge of the rectangle.
+            x1 (float): The right edge of the rectangle.
+            y1 (float): The bottom edge of the rectangle.
+
+        Returns:
+            list[tuple[int, int]]: The (column, row) of each tile.
+        """
+        width, height = self.levels[level]
+        scale_x, scale_y = self.level_scale(level)
+        size = self.tile_size
+        first_column = max(0, math.floor(x0 * scale_x / size))
+        first_row = max(0, math.floor(y0 * scale_y / size))
+        last_column = min(math.ceil(width / size), math.ceil(x1 * scale_x / size))
+        last_row = min(math.ceil(height / size), math.ceil(y1 * scale_y / size))
+        return [
+            (column, row)
+            for row in range(first_row, last_row)
+            for column in range(first_column, last_column)
+        ]
+
+
+class TileCache:
+    """Generates and caches the tile pyramids of large images.
+
+    The cache is used from the main thread. Pyramids are generated on
+    worker threads, and `on_ready` is called on the main thread once one is
+    available.
+
+    Attributes:
+        cache_dir (str): The directory pyramids are stored in.
+        on_ready (callable): Called with the path of the source image when
+            its pyramid has been generated.
+    """
+
+    def __init__(self, project_path: str, on_ready: callable = None):
+        """Initializes a new TileCache instance.
+
+        Args:
+            project_path (str): The path of the project directory. Pyramids
+                are stored in its TILE_CACHE_DIR.
+            on_ready (callable, optional): Called with the path of the
+                source image when its pyramid has been generated. Defaults
+                to None.
+        """
+        self.cache_dir = os.path.join(project_path, TILE_CACHE_DIR)
+        self.on_ready = on_ready
+        self._sizes = {}
+        self._pyramids = {}
+        self._pending = set()
+        self._failed = set()
+
+    def is_tiled(self, path: str, stamp: tuple) -> bool:
+        """Checks whether an image is large enough to be drawn from tiles.
+
+        Only the header of the image file is read.
+
+        Args:
+            path (str): The path of the image file.
+            stamp (tuple): The modification time and size of the file.
+
+        Returns:
+            bool: True if the image should be drawn from its pyramid.
+        """
+        key = (path, stamp)
+        size = self._sizes.get(key)
+        if size is None:
+            _, width, height = GdkPixbuf.Pixbuf.get_file_info(path)
+            size = (width, height)
+            self._sizes[key] = size
+        return max(size) > MIN_TILED_SIZE
+
+    def get_pyramid(self, path: str, stamp: tuple) -> TilePyramid:
+        """Gets the pyramid of an image, generating it if needed.
+
+        Args:
+            path (str): The path of the image file.
+            stamp (tuple): The modification time and size of the file.
+
+        Returns:
+            TilePyramid: The pyramid, or None if it is still being
+            generated or could not be generated.
+        """
+        key = (path, stamp)
+        pyramid = self._pyramids.get(key)
+        if pyramid is not None or key in self._pending or key in self._failed:
+            return pyramid
+        directory = self._get_directory(path, stamp)
+        pyramid = TilePyramid.load(directory)
+        if pyramid is not None:
+            self._pyramids[key] = pyramid
+            return pyramid
+        self._pending.add(key)
+        threading.Thread(
+            target=self._run_generate,
+            args=(key, directory),
+            name="advengine-tiles",
+            daemon=True,
+        ).start()
+        return None
+
+    def _get_directory(self, path: str, stamp: tuple) -> str:
+        """Gets the cache directory for one version of an image file."""
+        path_digest = hashlib.sha1(os.path.abspath(path).encode("utf-8"))
+        stamp_digest = hashlib.sha1(repr(stamp).encode("utf-8"))
+        return os.path.join(
+            self.cache_dir,
+            f"{path_digest.hexdigest()[:16]}-{stamp_digest.hexdigest()[:8]}",
+        )
+
+    def _run_generate(self, key: tuple, directory: str):
+        """Generates a pyramid on a worker thread and hands it back.
+
+        Args:
+            key (tuple): The (path, stamp) of the source image.
+            directory (str): The cache directory for the pyramid.
+        """
+        try:
+            pyramid = self._generate(key[0], directory)
+        except (GLib.Error, OSError) as e:
+            logging.error(f"Error generating tiles for {key[0]}: {e}")
+            pyramid = None
+        GLib.idle_add(self._on_generated, key, pyramid)
+
+    def _on_generated(self, key: tuple, pyramid: TilePyramid) -> bool:
+        """Records a generated pyramid on the main thread.
+
+        Returns:
+            bool: False, so that the idle callback does not repeat.
+        """
+        self._pending.discard(key)
+        if pyramid is None:
+            self._failed.add(key)
+        else:
+            self._pyramids[key] = pyramid
+            if self.on_ready:
+                self.on_ready(key[0])
+        return GLib.SOURCE_REMOVE
+
+    @staticmethod
+    def _generate(path: str, directory: str) -> TilePyramid:
+        """Decodes an image and writes its pyramid to a cache directory.
+
+        The tiles are written to a temporary directory that is renamed into
+        place once it is complete, and older pyramids of the same file are
+        removed.
+
+        Args:
+            path (str): The path of the image file.
+            directory (str): The cache directory for the pyramid.
+
+        Returns:
+            TilePyramid: The new pyramid.
+        """
+        pixbuf = GdkPixbuf.Pixbuf.new_from_file(path)
+        width, height = pixbuf.get_width(), pixbuf.get_height()
+        temp_directory = f"{directory}.tmp{threading.get_ident()}"
+        shutil.rmtree(temp_directory, ignore_errors=True)
+
+        levels = []
+        while True:
+            level = len(levels)
+            level_width, level_height = pixbuf.get_width(), pixbuf.get_height()
+            levels.append((level_width, level_height))
+            level_directory = os.path.join(temp_directory, str(level))
+            os.makedirs(level_directory)
+            for y in range(0, level_height, TILE_SIZE):
+                for x in range(0, level_width, TILE_SIZE):
+                    tile = pixbuf.new_subpixbuf(
+                        x,
+                        y,
+                        min(TILE_SIZE, level_width - x),
+                        min(TILE_SIZE, level_height - y),
+                    )
+                    # Fast compression: tiles are a cache, not an asset.
+                    tile.savev(
+                        os.path.join(
+                            level_directory,
+                            f"{x // TILE_SIZE}_{y // TILE_SIZE}.png",
+                        ),
+                        "png",
+                        ["compression"],
+                        ["1"],
+                    )
+            if level_width <= TILE_SIZE and level_height <= TILE_SIZE:
+                break
+            pixbuf = pixbuf.scale_simple(
+                max(1, (level_width + 1) // 2),
+                max(1, (level_height + 1) // 2),
+                GdkPixbuf.InterpType.BILINEAR,
+            )
+
+        with open(os.path.join(temp_directory, MANIFEST_FILENAME), "w") as f:
+            json.dump(
+                {
+                    "width": width,
+                    "height": height,
+                    "tile_size": TILE_SIZE,
+                    "levels": levels,
+                },
+                f,
+            )
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(temp_directory, directory)
+
+        prefix = os.path.basename(directory).split("-")[0] + "-"
+        for name in os.listdir(os.path.dirname(directory)):
+            if (
+                name.startswith(prefix)
+                and name != os.path.basename(directory)
+                and ".tmp" not in name
+            ):
+                shutil.rmtree(
+                    os.path.join(os.path.dirname(directory), name), ignore_errors=True
+                )
+        return TilePyramid(directory, width, height, TILE_SIZE, levels)
@@ -104,7 +104,9 @@ class VerbEditor(Gtk.Box):
             GObject.BindingFlags.BIDIRECTIONAL | GObject.BindingFlags.SYNC_CREATE,
         )
         list_item.handler_id = widget.connect(
-            "changed", lambda w: self.project_manager.set_dirty(True)
+            "changed", lambda w: self.project_manager.set_dirty(
+                True, "verbs", verb_gobject.verb
+            )
         )
 
     def _unbind_cell(self, factory, list_item):
@@ -139,8 +141,7 @@ class VerbEditor(Gtk.Box):
         new_id_base = "new_verb"
         new_id = new_id_base
         count = 1
-        existing_ids = {v.id for v in self.project_manager.data.verbs}
-        while new_id in existing_ids:
+        while self.project_manager.data.get_by_id("verbs", new_id):
             new_id = f"{new_id_base}_{count}"
             count += 1
 
@@ -0,0 +1,225 @@
+"""Round-trip tests for packed binary game data bundles.
+
+The tests import the installed advengine package. Run them from this
+directory with the directory that contains the package on the path, or
+through `meson test` after installing:
+
+    PYTHONPATH=/usr/share/advengine python3 -m unittest -v test_bundle
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from advengine.core.bundle_reader import (
+    FORMAT_VERSION,
+    HEADER,
+    BundleError,
+    BundleReader,
+)
+from advengine.core.bundle_writer import build_bundle
+from advengine.core.schema_codec import encode
+from advengine.core.schemas import (
+    ActionNode,
+    Attribute,
+    Character,
+    ConditionNode,
+    DialogueNode,
+    Interaction,
+    Item,
+    LogicGraph,
+    LogicNode,
+    ProjectData,
+)
+
+
+def make_graph(graph_id: str, node_count: int) -> LogicGraph:
+    """Returns a graph of connected dialogue, condition and action nodes."""
+    graph = LogicGraph(id=graph_id, name=graph_id.title())
+    previous = None
+    for n in range(node_count):
+        node_id = f"{graph_id}_n{n}"
+        if n % 3 == 0:
+            node = DialogueNode(
+                id=node_id,
+                node_type="Dialogue",
+                character_id="narrator",
+                dialogue_text=f"Line {n}.",
+            )
+        elif n % 3 == 1:
+            node = ConditionNode(
+                id=node_id,
+                node_type="Condition",
+                condition_type="HAS_ITEM",
+                parameters={"ItemID": f"item_{n}", "Amount": 1},
+            )
+        else:
+            node = ActionNode(
+                id=node_id,
+                node_type="Action",
+                action_command="INVENTORY_ADD",
+                parameters={"ItemID": f"item_{n}"},
+            )
+        graph.add_node(node)
+        if previous is not None:
+            graph.connect(previous, node)
+        previous = node
+    return graph
+
+
+def make_edge_case_graph() -> LogicGraph:
+    """Returns a graph of nodes with the values that are easy to get wrong.
+
+    It has missing strings, non-ASCII text, fractional positions, a node
+    without a command, and parameters of every type, including an integer
+    too large for 64 bits.
+    """
+    graph = LogicGraph(id="graph_edge_cases", name="Édge cases")
+    dialogue = DialogueNode(
+        id="edge_dialogue",
+        node_type="Dialogue",
+        x=12.5,
+        y=-40.25,
+        character_id="merchant",
+        dialogue_text="«Bonjour» — 你好\nSecond line",
+        action_node=ActionNode(
+            id="edge_inline",
+            node_type="Action",
+            action_command="INVENTORY_ADD",
+            parameters={"ItemID": "item_1"},
+        ),
+    )
+    condition = ConditionNode(
+        id="edge_condition",
+        node_type="Condition",
+        condition_type="VARIABLE_EQUALS",
+        parameters={"VarName": "", "Value": 2.75, "Strict": True, "Count": -3},
+    )
+    action = ActionNode(
+        id="edge_action",
+        node_type="Action",
+        action_command="SET_VARIABLE",
+        parameters={"VarName": "flags", "Value": {"a": [1, None]}, "Big": 2**70},
+    )
+    for node in (dialogue, condition, action, LogicNode("edge_base", "Start")):
+        graph.add_node(node)
+    graph.connect(dialogue, condition)
+    graph.connect(condition, action)
+    return graph
+
+
+def make_data() -> ProjectData:
+    """Returns project data with every kind of record a bundle holds."""
+    data = ProjectData(
+        logic_graphs=[make_graph(f"graph_{g}", 20) for g in range(3)]
+        + [make_edge_case_graph()]
+    )
+    for i in range(20):
+        data.items.append(Item(f"item_{i}", f"Item {i}", "consumable", i, i // 2))
+        data.attributes.append(Attribute(f"attr_{i}", f"Attribute {i}", i, i * 2))
+        data.interactions.append(
+            Interaction(
+                f"interaction_{i}",
+                "verb_use",
+                f"graph_{i % 3}",
+                primary_item_id=f"item_{i}",
+            )
+        )
+    # Values that do not fit in 32 bits.
+    data.items.append(Item("item_rare", "Rare", "key", 2**40, -(2**35)))
+    data.attributes.append(Attribute("attr_big", "Big", 2**33, 2**62))
+    data.characters.append(Character("narrator", "Narrator", "", False, None))
+    data.characters.append(
+        Character(
+            "merchant",
+            "Zoë the Merchant",
+            "graph_0_n0",
+            True,
+            "shop_1",
+            portrait_asset_id="portrait_zoe",
+            animations={"idle": {"frames": [0, 1, 2], "fps": 8}},
+        )
+    )
+    return data
+
+
+class BundleRoundTripTest(unittest.TestCase):
+    """Checks that every record read back from a bundle matches its source."""
+
+    def setUp(self):
+        """Builds project data with every kind of record a bundle holds."""
+        self.data = make_data()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, content: bytes) -> str:
+        """Writes a bundle to a temporary file and returns its path."""
+        path = os.path.join(self.directory.name, "GameData.aebundle")
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def open_bundle(self) -> BundleReader:
+        """Builds, writes and opens the bundle of the test data."""
+        bundle = BundleReader(self.write(build_bundle(self.data)))
+        self.addCleanup(bundle.close)
+        return bundle
+
+    def test_records_match_the_data(self):
+        bundle = self.open_bundle()
+        for tag, objects in (
+            ("ITEM", self.data.items),
+            ("CHAR", self.data.characters),
+            ("ATTR", self.data.attributes),
+        ):
+            with self.subTest(tag=tag):
+                self.assertEqual(
+                    list(bundle.table(tag)), [encode(obj) for obj in objects]
+                )
+        self.assertEqual(
+            list(bundle.table("INTR")),
+            [encode(interaction) for interaction in self.data.interactions],
+        )
+
+    def test_graphs_match_the_json_export(self):
+        bundle = self.open_bundle()
+        for index, graph in enumerate(self.data.logic_graphs):
+            with self.subTest(graph=graph.id):
+                expected = json.loads(json.dumps(encode(graph)))
+                self.assertEqual(bundle.graph_data(index), expected)
+
+    def test_id_indexes_find_every_record(self):
+        bundle = self.open_bundle()
+        for tag, objects in (
+            ("ITEM", self.data.items),
+            ("CHAR", self.data.characters),
+            ("ATTR", self.data.attributes),
+            ("INTR", self.data.interactions),
+            ("GRPH", self.data.logic_graphs),
+        ):
+            table = bundle.table(tag)
+            with self.subTest(tag=tag):
+                for index, obj in enumerate(objects):
+                    self.assertEqual(table.find(obj.id), index)
+                self.assertEqual(table.find("missing"), -1)
+
+    def test_values_beyond_64_bits_are_rejected(self):
+        self.data.items.append(Item("item_huge", "Huge", "key", 2**63, 0))
+        with self.assertRaisesRegex(ValueError, "item_huge"):
+            build_bundle(self.data)
+
+    def test_empty_file_is_rejected(self):
+        with self.assertRaises(BundleError):
+            BundleReader(self.write(b""))
+
+    def test_other_format_versions_are_rejected(self):
+        content = bytearray(build_bundle(self.data))
+        magic, _, reserved, count, offset = HEADER.unpack_from(content, 0)
+        HEADER.pack_into(content, 0, magic, FORMAT_VERSION + 1, reserved, count, offset)
+        with self.assertRaisesRegex(BundleError, "format version"):
+            BundleReader(self.write(bytes(content)))
+
+
+if __name__ == "__main__":
+    unittest.main()
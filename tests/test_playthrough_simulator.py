@@ -0,0 +1,104 @@
+"""Tests for randomized playthroughs of small hand-built worlds.
+
+The tests import the installed advengine package. Run them from this
+directory with the directory that contains the package on the path, or
+through `meson test` after installing:
+
+    PYTHONPATH=/usr/share/advengine python3 -m unittest -v test_playthrough_simulator
+"""
+
+import unittest
+
+from advengine.core.logic_compiler import compile_graphs
+from advengine.core.logic_interpreter import GameState
+from advengine.core.playthrough_simulator import (
+    OUTCOME_COMPLETED,
+    OUTCOME_NOTHING_TO_PLAY,
+    OUTCOME_SOFT_LOCK,
+    PlaythroughSimulator,
+    World,
+)
+from advengine.core.schemas.logic import ActionNode, LogicGraph
+
+
+def action_graph(graph_id: str, command: str, **parameters) -> LogicGraph:
+    """Returns a graph with a single action node."""
+    node = ActionNode(
+        id="action",
+        node_type="Action",
+        action_command=command,
+        parameters=parameters,
+    )
+    return LogicGraph(graph_id, graph_id, [node])
+
+
+def interaction(interaction_id: str, graph_id: str, hotspot_id: str) -> dict:
+    """Returns the data of an interaction on a hotspot."""
+    return {
+        "id": interaction_id,
+        "logic_graph_id": graph_id,
+        "target_hotspot_id": hotspot_id,
+    }
+
+
+class LockedDoorTest(unittest.TestCase):
+    """Plays a scene whose door must be unlocked to complete the quest."""
+
+    def make_world(self, interactions: list) -> World:
+        """Builds a world whose door starts locked."""
+        bytecode, errors = compile_graphs(
+            [
+                action_graph(
+                    "open_door",
+                    "COMPLETE_OBJECTIVE",
+                    QuestID="escape",
+                    ObjectiveID="open_door",
+                ),
+                action_graph("pull_lever", "UNLOCK_HOTSPOT", HotspotID="door"),
+            ]
+        )
+        self.assertEqual(errors, [])
+        state = GameState(locked_hotspots={"door"})
+        scenes = [
+            {"id": "cell", "hotspots": [{"id": "door"}, {"id": "lever"}]}
+        ]
+        quests = [{"id": "escape", "objectives": [{"id": "open_door"}]}]
+        return World.from_data(bytecode, state, scenes, interactions, quests)
+
+    def test_locked_door_cannot_be_opened(self):
+        world = self.make_world([interaction("open", "open_door", "door")])
+        report = PlaythroughSimulator(world).run(20, workers=1)
+        self.assertEqual(report.outcomes[OUTCOME_SOFT_LOCK], 20)
+        self.assertEqual(report.quest_completion["escape"], 0)
+        self.assertEqual(report.unavailable_interactions, ["open"])
+
+    def test_unlocking_the_door_completes_the_quest(self):
+        world = self.make_world(
+            [
+                interaction("open", "open_door", "door"),
+                interaction("pull", "pull_lever", "lever"),
+            ]
+        )
+        simulator = PlaythroughSimulator(world)
+        report = simulator.run(20, workers=1)
+        self.assertEqual(report.outcomes[OUTCOME_COMPLETED], 20)
+        self.assertEqual(report.quest_completion["escape"], 1)
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                result = simulator.play(seed)
+                self.assertEqual(result.trail[-2:], ["pull", "open"])
+
+
+class EmptyWorldTest(unittest.TestCase):
+    """Plays a world with no interactions and no quests."""
+
+    def test_nothing_to_play(self):
+        bytecode, _ = compile_graphs([])
+        world = World.from_data(bytecode, GameState(), [{"id": "start"}], [], [])
+        report = PlaythroughSimulator(world).run(5, workers=1)
+        self.assertEqual(report.outcomes, {OUTCOME_NOTHING_TO_PLAY: 5})
+        self.assertEqual(report.soft_locks, [])
+
+
+if __name__ == "__main__":
+    unittest.main()